@@ -0,0 +1,39 @@
+"""
+Compares the throughput of calibrating recorded stick samples one Python call at a time against the vectorized
+NumPy pipeline. Requires NumPy.
+
+Run with:
+    python benchmarks/bench_array_calibration.py
+"""
+from time import perf_counter
+import numpy as np
+from input_devices.utils.functions import map, range_adjust, calibrate_array
+
+sample_count = 10_000_000
+value_range = (-32768, 32767)
+blindspot_range = (-3000, 3000)
+zero = 0
+new_range = (-1, 1)
+
+
+def bench_per_sample(samples) -> float:
+    values = samples.tolist()
+    start = perf_counter()
+    for value in values:
+        map(range_adjust(value, blindspot_range, value_range, zero), *value_range, *new_range)
+    return len(values) / (perf_counter() - start)
+
+
+def bench_vectorized(samples) -> float:
+    start = perf_counter()
+    calibrate_array(samples, value_range, blindspot_range, zero, *new_range)
+    return len(samples) / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    samples = np.random.default_rng(0).integers(value_range[0], value_range[1] + 1, sample_count, dtype=np.int16)
+    per_sample = bench_per_sample(samples)
+    vectorized = bench_vectorized(samples)
+    print(f"per-sample:  {per_sample:14,.0f} samples/sec")
+    print(f"vectorized:  {vectorized:14,.0f} samples/sec")
+    print(f"speedup:     {vectorized / per_sample:14.1f}x")
@@ -0,0 +1,38 @@
+"""
+Measures how the cost of matching button presses against combos grows with the number of registered combos.
+Sequences are compiled into a trie and chords are indexed by button, so the cost per press should stay nearly flat.
+
+Run with:
+    python benchmarks/bench_combo_engine.py
+"""
+import random
+from time import perf_counter
+from input_devices.gestures import ComboEngine
+from input_devices.shared import Button
+
+button_names = ["A", "B", "X", "Y", "left_bumper", "right_bumper", "directional_pad_up", "directional_pad_down"]
+combo_counts = (10, 100, 1000)
+press_count = 200_000
+
+
+def bench(combo_count: int) -> float:
+    buttons = {name: Button(debounce_time=0) for name in button_names}
+    engine = ComboEngine(buttons)
+    generator = random.Random(0)
+    for index in range(combo_count):
+        length = generator.randint(2, 6)
+        engine.on_sequence([generator.choice(button_names) for _ in range(length)], lambda: None, max_gap=0.5)
+        if index % 10 == 0:
+            engine.on_chord(generator.sample(button_names, 3), lambda: None)
+    presses = [buttons[generator.choice(button_names)] for _ in range(press_count)]
+    start = perf_counter()
+    for index, button in enumerate(presses):
+        timestamp = index * 0.1
+        button._set_state(True, timestamp)
+        button._set_state(False, timestamp + 0.05)
+    return (perf_counter() - start) / press_count * 1e9
+
+
+if __name__ == "__main__":
+    for combo_count in combo_counts:
+        print(f"{combo_count:5d} combos: {bench(combo_count):8.0f} ns per press and release")
@@ -0,0 +1,50 @@
+"""
+Measures how a ControllerHub scales with the number of devices. Each device is simulated with a pipe; every round
+writes a short burst of stick events to all pipes and the hub is polled until every controller has processed it.
+Reports the latency of a round and the CPU time spent per device and round.
+
+Run with:
+    python benchmarks/bench_controller_hub.py
+"""
+import os
+import struct
+from time import perf_counter, process_time
+from input_devices import ControllerHub
+
+device_counts = [1, 2, 4, 8, 16, 32, 64]
+round_count = 2000
+burst = b"".join(struct.pack('llHHi', 0, 0, 3, code, value) for code, value in [(0, 1000), (1, -1000), (3, 500), (4, -500)]) \
+      + struct.pack('llHHi', 0, 0, 0, 0, 0)  # ABS_X, ABS_Y, ABS_RX, ABS_RY and SYN_REPORT
+
+
+def bench(device_count: int):
+    pipes = [os.pipe() for _ in range(device_count)]
+    hub = ControllerHub()
+    for read_fd, _ in pipes:
+        hub.connect(f"/proc/self/fd/{read_fd}")
+
+    latencies = []
+    cpu_start = process_time()
+    for _ in range(round_count):
+        start = perf_counter()
+        for _, write_fd in pipes:
+            os.write(write_fd, burst)
+        pending = device_count
+        while pending:
+            pending -= hub.poll()
+        latencies.append(perf_counter() - start)
+    cpu_time = process_time() - cpu_start
+
+    hub.close()
+    for read_fd, write_fd in pipes:
+        os.close(read_fd)
+        os.close(write_fd)
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)], cpu_time / (device_count * round_count)
+
+
+if __name__ == "__main__":
+    print(f"{'devices':>8} {'p50 round (us)':>15} {'p99 round (us)':>15} {'cpu/device/round (us)':>22}")
+    for device_count in device_counts:
+        p50, p99, cpu = bench(device_count)
+        print(f"{device_count:>8} {p50 * 1e6:>15.1f} {p99 * 1e6:>15.1f} {cpu * 1e6:>22.1f}")
@@ -0,0 +1,98 @@
+"""
+Measures how many input events per second XboxControllerGen4.update processes on a synthetic event stream,
+comparing the per-event dispatch table against the previous approach of touching every control for every event.
+
+Run with:
+    python benchmarks/bench_event_dispatch.py
+"""
+from collections import namedtuple
+from itertools import cycle, islice
+from time import perf_counter
+from input_devices import XboxControllerGen4
+
+Event = namedtuple("Event", ["code", "state", "timestamp"], defaults=[None])
+
+event_count = 200_000
+batch_size = 64
+
+# A stream dominated by stick motion, as produced by a real controller, with occasional button and hat events.
+stream_pattern = [Event("ABS_X", value) for value in range(-3000, 3000, 500)] \
+               + [Event("ABS_Y", value) for value in range(-3000, 3000, 500)] \
+               + [Event("ABS_RX", 1200), Event("ABS_RY", -1200), Event("ABS_Z", 512), Event("ABS_RZ", 256)] \
+               + [Event("BTN_SOUTH", 1), Event("BTN_SOUTH", 0), Event("ABS_HAT0Y", -1), Event("ABS_HAT0Y", 0)] \
+               + [Event("SYN_REPORT", 0)]
+
+
+class SyntheticGamepad:
+    """A gamepad stand-in that replays a fixed list of events in batches."""
+
+    def __init__(self, events) -> None:
+        self.__batches = [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
+        self.__index = 0
+
+    def read(self):
+        batch = self.__batches[self.__index]
+        self.__index += 1
+        return batch
+
+    def batch_count(self) -> int:
+        return len(self.__batches)
+
+
+def legacy_update(controller: XboxControllerGen4, events) -> None:
+    """The previous update strategy: every event sets the state of all buttons and walks the axis if/elif chain."""
+    buttons = [
+        (controller.A, "BTN_SOUTH"), (controller.B, "BTN_EAST"), (controller.X, "BTN_NORTH"), (controller.Y, "BTN_WEST"),
+        (controller.select_button, "BTN_SELECT"), (controller.key_record_button, "KEY_RECORD"),
+        (controller.start_button, "BTN_START"), (controller.left_bumper, "BTN_TL"), (controller.right_bumper, "BTN_TR"),
+    ]
+    pad = controller.directional_pad
+    for event in events:
+        code, state = event.code, event.state
+        for button, button_code in buttons:
+            button._set_state(code == button_code)
+        pad.up._set_state(code == "ABS_HAT0Y" and state == -1)
+        pad.down._set_state(code == "ABS_HAT0Y" and state == 1)
+        pad.left._set_state(code == "ABS_HAT0X" and state == -1)
+        pad.right._set_state(code == "ABS_HAT0X" and state == 1)
+        controller.left_stick._set_state(code == "BTN_THUMBL" and state == 1)
+        controller.right_stick._set_state(code == "BTN_THUMBR" and state == 1)
+        if code == 'ABS_X':
+            controller.left_stick._set_x(state)
+        if code == 'ABS_Y':
+            controller.left_stick._set_y(state)
+        elif code == 'ABS_RX':
+            controller.right_stick._set_x(state)
+        elif code == 'ABS_RY':
+            controller.right_stick._set_y(state)
+        elif code == 'ABS_Z':
+            controller.left_trigger._set_y(state)
+        elif code == 'ABS_RZ':
+            controller.right_trigger._set_y(state)
+
+
+def bench_legacy(events) -> float:
+    controller = XboxControllerGen4()
+    gamepad = SyntheticGamepad(events)
+    start = perf_counter()
+    for _ in range(gamepad.batch_count()):
+        legacy_update(controller, gamepad.read())
+    return len(events) / (perf_counter() - start)
+
+
+def bench_dispatch(events) -> float:
+    gamepad = SyntheticGamepad(events)
+    controller = XboxControllerGen4(gamepad)
+    start = perf_counter()
+    for _ in range(gamepad.batch_count()):
+        controller.update()
+    return len(events) / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    events = list(islice(cycle(stream_pattern), event_count))
+    legacy = bench_legacy(events)
+    dispatch = bench_dispatch(events)
+    print(f"legacy update:   {legacy:12,.0f} events/sec")
+    print(f"dispatch table:  {dispatch:12,.0f} events/sec")
+    print(f"speedup:         {dispatch / legacy:12.1f}x")
@@ -0,0 +1,48 @@
+"""
+Measures the time of a cold `import input_devices` in fresh interpreters, and checks that importing the package does
+not load the device libraries and heavy optional dependencies, which are only loaded when a controller connects or
+a feature needing them is used.
+
+Run with:
+    python benchmarks/bench_import.py [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+deferred_modules = ("inputs", "numpy", "asyncio", "json")  # Modules that must not be loaded by importing the package
+source_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+probe = f"""
+import sys
+from time import perf_counter
+start = perf_counter()
+import input_devices
+elapsed = perf_counter() - start
+loaded = [name for name in {deferred_modules!r} if name in sys.modules]
+print(elapsed, ','.join(loaded))
+"""
+
+
+def measure_import() -> tuple:
+    environment = dict(os.environ, PYTHONPATH=source_directory, PYTHONDONTWRITEBYTECODE="1")
+    output = subprocess.run([sys.executable, "-c", probe], env=environment, capture_output=True, text=True, check=True).stdout
+    elapsed, loaded = output.split(" ")
+    return float(elapsed), [name for name in loaded.strip().split(",") if name]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="number of fresh interpreters to import the package in")
+    arguments = parser.parse_args()
+
+    timings = []
+    for _ in range(arguments.runs):
+        elapsed, loaded = measure_import()
+        timings.append(elapsed * 1000)
+        if loaded:
+            sys.exit(f"importing input_devices loaded {', '.join(loaded)}")
+    print(f"import input_devices:  median {statistics.median(timings):7.1f} ms, min {min(timings):7.1f} ms")
+    print(f"deferred modules:      {', '.join(deferred_modules)} not loaded")
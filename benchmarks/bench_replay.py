@@ -0,0 +1,47 @@
+"""
+Measures the replay throughput of a long recording fed through XboxControllerGen4.update at maximum speed.
+The recording is memory-mapped, so replay issues no file system calls per event.
+
+Run with:
+    python benchmarks/bench_replay.py
+"""
+import os
+import tempfile
+from time import perf_counter
+from input_devices import XboxControllerGen4
+from input_devices.recording import EventRecorder, EventReplayer
+
+event_count = 5_000_000  # Roughly an hour and a half of continuous stick motion at 1000 events per second
+batch_size = 256
+
+
+def write_recording(path: str) -> None:
+    with EventRecorder(path) as recorder:
+        chunk = []
+        for index in range(event_count):
+            milliseconds = index  # One event per millisecond
+            chunk.append((milliseconds // 1000, milliseconds % 1000 * 1000, 3, index % 2, index % 65536 - 32768))
+            if len(chunk) == 100_000:
+                recorder.write_raw(chunk)
+                chunk = []
+        recorder.write_raw(chunk)
+
+
+def bench_replay(path: str) -> float:
+    with EventReplayer(path, batch_size=batch_size) as replayer:
+        controller = XboxControllerGen4(replayer)
+        start = perf_counter()
+        try:
+            while True:
+                controller.update()
+        except EOFError:
+            pass
+        return event_count / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.rec")
+        write_recording(path)
+        print(f"recording size:  {os.path.getsize(path) / 2 ** 20:10.1f} MiB")
+        print(f"replay:          {bench_replay(path):10,.0f} events/sec")
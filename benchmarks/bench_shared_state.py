@@ -0,0 +1,57 @@
+"""
+Measures how many consistent snapshots per second each of several consumer processes reads from a
+SharedStatePublisher while the publisher keeps writing new snapshots as fast as it can.
+
+Run with:
+    python benchmarks/bench_shared_state.py
+"""
+from multiprocessing import get_context
+from time import perf_counter
+from input_devices import XboxControllerGen4Snapshot
+from input_devices.state_sharing import SharedStatePublisher, SharedStateReader
+
+consumer_counts = (1, 2, 4)
+duration = 2.0  # Seconds each consumer reads for
+
+
+def consume(name: str, start, results) -> None:
+    with SharedStateReader(name) as reader:
+        start.wait()
+        reads = 0
+        end = perf_counter() + duration
+        while perf_counter() < end:
+            for _ in range(1000):
+                reader.read()
+            reads += 1000
+        results.put(reads / duration)
+
+
+def bench_consumers(consumer_count: int) -> tuple:
+    context = get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    snapshot = XboxControllerGen4Snapshot(0.0, *([False] * 14), 0.0, 0.0, False, 0.0, 0.0, 0.0, 0.0)
+    with SharedStatePublisher() as publisher:
+        publisher.publish(snapshot)
+        consumers = [context.Process(target=consume, args=(publisher.get_name(), start, results))
+                     for _ in range(consumer_count)]
+        for consumer in consumers:
+            consumer.start()
+        start.set()
+        publishes = 0
+        end = perf_counter() + duration
+        while perf_counter() < end:
+            for _ in range(1000):
+                publisher.publish(snapshot)
+            publishes += 1000
+        rates = [results.get() for _ in consumers]
+        for consumer in consumers:
+            consumer.join()
+    return publishes / duration, rates
+
+
+if __name__ == "__main__":
+    for consumer_count in consumer_counts:
+        publish_rate, rates = bench_consumers(consumer_count)
+        print(f"{consumer_count} consumers: publisher {publish_rate:12,.0f} snapshots/sec, "
+              f"per consumer {min(rates):12,.0f} - {max(rates):12,.0f} reads/sec")
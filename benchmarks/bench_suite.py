@@ -0,0 +1,161 @@
+"""
+Benchmark suite for the event path. Each case reports throughput, per-event latency percentiles and the number of
+memory blocks allocated while it ran, measured with tracemalloc in a separate pass so tracing does not skew timings.
+Events come from VirtualGamepad scenarios, so the numbers are reproducible across releases.
+
+Run with:
+    python benchmarks/bench_suite.py [--json results.json] [--events 200000]
+"""
+import argparse
+import json
+import platform
+import tracemalloc
+from time import perf_counter_ns
+from typing import Callable, Dict, List
+from input_devices import XboxControllerGen4
+from input_devices.instrumentation import PipelineMetrics
+from input_devices.shared import Button, Calibration, StickCalibration
+from input_devices.simulation import VirtualGamepad, scenarios
+from input_devices.utils.functions import map, range_adjust
+
+stick_value_range = (-32768, 32767)
+
+
+def measure(step: Callable[[], int], event_count: int) -> Dict[str, float]:
+    """
+    Calls step until event_count events were processed, timing each call.
+
+    Args:
+        step (Callable[[], int]): A function processing some events and returning how many it processed.
+        event_count (int): The number of events to process.
+
+    Returns:
+        Dict[str, float]: The throughput, per-event latency percentiles and allocation count of the case.
+    """
+    latencies: List[float] = []
+    processed = 0
+    total_ns = 0
+    while processed < event_count:
+        start = perf_counter_ns()
+        count = step()
+        elapsed = perf_counter_ns() - start
+        total_ns += elapsed
+        processed += count
+        latencies.extend([elapsed / count] * count)
+
+    tracemalloc.start()
+    before = _traced_blocks()
+    traced = 0
+    while traced < event_count:
+        traced += step()
+    allocated_blocks = _traced_blocks() - before
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "events_per_sec": processed / (total_ns / 1e9),
+        "latency_ns_p50": latencies[len(latencies) // 2],
+        "latency_ns_p90": latencies[int(len(latencies) * 0.9)],
+        "latency_ns_p99": latencies[int(len(latencies) * 0.99)],
+        "latency_ns_max": latencies[-1],
+        "allocated_blocks": allocated_blocks,
+    }
+
+
+def _traced_blocks() -> int:
+    """Counts the memory blocks currently traced by tracemalloc."""
+    return sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+
+
+def update_case(scenario: str, raw: bool, coalesce_axes: bool = False, metrics: bool = False) -> Callable[[], int]:
+    gamepad = VirtualGamepad(scenario)
+    controller = XboxControllerGen4(gamepad if raw else _DecodedGamepad(gamepad), coalesce_axes=coalesce_axes)
+    if metrics:
+        controller.set_metrics(PipelineMetrics())
+    batch_size = VirtualGamepad.default_batch_size
+
+    def step() -> int:
+        controller.update()
+        return batch_size
+    return step
+
+
+class _DecodedGamepad:
+    """Exposes only read(), so the controller takes the decoded event path used with the 'inputs' library."""
+
+    def __init__(self, gamepad: VirtualGamepad) -> None:
+        self.read = gamepad.read
+
+
+def set_state_case() -> Callable[[], int]:
+    button = Button(debounce_time=0)
+    state = [False]
+
+    def step() -> int:
+        state[0] = not state[0]
+        button._set_state(state[0])
+        return 1
+    return step
+
+
+def calibration_case(kind: str) -> Callable[[], int]:
+    values = [event[4] for event in VirtualGamepad("stick_sweep").events() if event[2] == 3]
+    blindspot_range = (-3000, 3000)
+    if kind == "functions":
+        def calibrate(value):
+            return map(range_adjust(value, blindspot_range, stick_value_range, 0), *stick_value_range, -1, 1)
+    else:
+        calibrate = Calibration(stick_value_range, blindspot_range, 0, -1, 1, lookup_table=kind == "table").calibrate
+    batch = values[:1000]
+
+    def step() -> int:
+        for value in batch:
+            calibrate(value)
+        return len(batch)
+    return step
+
+
+def stick_calibration_case() -> Callable[[], int]:
+    values = [event[4] for event in VirtualGamepad("stick_sweep").events() if event[2] == 3]
+    calibrate = StickCalibration(stick_value_range, stick_value_range, deadzone=0.1).calibrate
+    positions = list(zip(values[:1000], values[1:1001]))
+
+    def step() -> int:
+        for x, y in positions:
+            calibrate(x, y)
+        return len(positions)
+    return step
+
+
+def cases() -> Dict[str, Callable[[], Callable[[], int]]]:
+    suite = {}
+    for scenario in scenarios:
+        suite[f"update[{scenario}]"] = lambda scenario=scenario: update_case(scenario, raw=True)
+    suite["update[mixed, decoded]"] = lambda: update_case("mixed", raw=False)
+    suite["update[stick_sweep, coalesced]"] = lambda: update_case("stick_sweep", raw=True, coalesce_axes=True)
+    suite["update[mixed, metrics]"] = lambda: update_case("mixed", raw=True, metrics=True)
+    suite["Button._set_state"] = set_state_case
+    suite["calibration[functions]"] = lambda: calibration_case("functions")
+    suite["calibration[coefficients]"] = lambda: calibration_case("coefficients")
+    suite["calibration[table]"] = lambda: calibration_case("table")
+    suite["stick_calibration[scaled_radial]"] = stick_calibration_case
+    return suite
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", help="write the results to this file as JSON")
+    parser.add_argument("--events", type=int, default=200_000, help="number of events processed per case")
+    arguments = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<32} {'events/sec':>14} {'p50 ns':>9} {'p99 ns':>9} {'blocks':>8}")
+    for name, make_step in cases().items():
+        result = measure(make_step(), arguments.events)
+        results[name] = result
+        print(f"{name:<32} {result['events_per_sec']:>14,.0f} {result['latency_ns_p50']:>9.0f} "
+              f"{result['latency_ns_p99']:>9.0f} {result['allocated_blocks']:>8}")
+
+    if arguments.json:
+        with open(arguments.json, "w") as file:
+            json.dump({"python": platform.python_version(), "events": arguments.events, "results": results}, file, indent=2)
@@ -0,0 +1,17 @@
+from src.evdev import EvdevDevice
+from src.scheduling import FixedRateLoop
+from src.xbox_controller import XboxControllerGen4
+
+# the loop reads the gamepad every frame, so it is opened without blocking
+controller = XboxControllerGen4(EvdevDevice("/dev/input/event5", blocking=False))
+controller.A.on_press(lambda: print("A pressed"))
+
+def drive(now, delta_time):
+     # called 250 times per second, right after the controller was updated
+     print(controller.left_stick.get_mapped_x(new_minimum=-1, new_maximum=1), controller.left_trigger.get_y())
+
+loop = FixedRateLoop(250).add_controller(controller).on_tick(drive)
+loop.on_overrun(lambda missed, lateness: print(f"overrun by {lateness * 1000:.2f} ms, {missed} frames skipped"))
+controller.B.on_press(loop.stop)
+loop.run()
+print(loop.get_statistics())
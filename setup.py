@@ -11,8 +11,9 @@ setup(
     author_email='mtik.philosopher@gmail.com',
     license='MIT',
     package_dir={'': 'src'},  # Set 'src' as the root directory for packages
-    packages=['input_devices'],  # Find all packages in 'src'
+    packages=find_packages('src'),  # Find all packages in 'src'
     install_requires=['inputs'],
+    extras_require={'numpy': ['numpy']},
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
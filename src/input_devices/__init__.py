@@ -1 +1,2 @@
-from .xbox_controller import *
\ No newline at end of file
+from .xbox_controller import *
+from .controller_hub import *
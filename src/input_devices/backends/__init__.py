@@ -0,0 +1,2 @@
+from .backend_registry import *
+from .builtin_backends import find_inputs_gamepad, find_evdev_gamepad, find_simulated_gamepad
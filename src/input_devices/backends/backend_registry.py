@@ -0,0 +1,59 @@
+from typing import Callable, Dict, List, Optional
+
+__all__ = ['gamepad_finder_t', 'register_backend', 'get_backend', 'backend_names', 'find_gamepad']
+
+gamepad_finder_t = Callable[[], Optional[object]]  # Type alias for functions returning a connected gamepad, or None.
+
+_backends: Dict[str, gamepad_finder_t] = {}  # Registered backends by name, in registration order.
+
+
+def register_backend(name: str, find: gamepad_finder_t) -> None:
+    """
+    Registers a backend that connects controllers to gamepads. Backends should import their device libraries inside
+    find, so that importing input_devices never pays for libraries that are not used.
+
+    Args:
+        name (str): The name of the backend, replacing any backend registered under the same name.
+        find (gamepad_finder_t): Returns a gamepad that a controller can read events from, or None if none is connected.
+    """
+    _backends[name] = find
+
+
+def get_backend(name: str) -> gamepad_finder_t:
+    """
+    Gets a registered backend.
+
+    Args:
+        name (str): The name of the backend.
+
+    Returns:
+        gamepad_finder_t: The function finding a gamepad with the backend.
+
+    Raises:
+        KeyError: If no backend is registered under the name.
+    """
+    try:
+        return _backends[name]
+    except KeyError:
+        raise KeyError(f"No input backend named {name!r} is registered, available backends: {', '.join(_backends)}.") from None
+
+
+def backend_names() -> List[str]:
+    """
+    Returns:
+        List[str]: The names of all registered backends.
+    """
+    return list(_backends)
+
+
+def find_gamepad(name: str):
+    """
+    Finds a connected gamepad with a registered backend.
+
+    Args:
+        name (str): The name of the backend.
+
+    Returns:
+        The gamepad, or None if none is connected.
+    """
+    return get_backend(name)()
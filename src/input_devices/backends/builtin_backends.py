@@ -0,0 +1,45 @@
+from .backend_registry import register_backend
+
+
+def find_inputs_gamepad():
+    """
+    Finds the first gamepad with the 'inputs' library, which is imported on first use since importing it scans all devices.
+
+    Returns:
+        The 'inputs' gamepad device, or None if none is connected.
+    """
+    from inputs import DeviceManager
+    gamepads = DeviceManager().gamepads
+    return gamepads[0] if gamepads else None
+
+
+def find_evdev_gamepad():
+    """
+    Finds the first gamepad among the evdev character devices and opens it for raw event reading.
+
+    Returns:
+        EvdevDevice: The opened gamepad, or None if none is connected.
+    """
+    from ..evdev import EvdevDevice, list_gamepad_paths
+    for path in list_gamepad_paths():
+        try:
+            return EvdevDevice(path)
+        except OSError:  # Unplugged since it was listed, or not readable by this user
+            continue
+    return None
+
+
+def find_simulated_gamepad():
+    """
+    Creates a simulated gamepad generating the default scenario, e.g. for headless tests and benchmarks.
+
+    Returns:
+        VirtualGamepad: The simulated gamepad.
+    """
+    from ..simulation import VirtualGamepad
+    return VirtualGamepad()
+
+
+register_backend("inputs", find_inputs_gamepad)
+register_backend("evdev", find_evdev_gamepad)
+register_backend("simulated", find_simulated_gamepad)
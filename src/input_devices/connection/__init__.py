@@ -0,0 +1,2 @@
+from .device_watcher import DeviceWatcher
+from .connection_manager import ConnectionManager
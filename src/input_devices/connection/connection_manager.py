@@ -0,0 +1,199 @@
+from time import perf_counter
+from typing import Callable, Optional
+from ..backends import gamepad_finder_t, get_backend
+from .device_watcher import DeviceWatcher
+
+connection_callback_t = Callable[[], None]  # Type alias for connection callbacks that take no parameters and return nothing.
+
+
+class ConnectionManager:
+    """
+    Keeps a controller connected to a gamepad. Waiting for a gamepad blocks on changes of the device directory
+    instead of polling, with rescans at an exponentially growing interval as a fallback. A gamepad that fails while
+    the controller is updated is treated as disconnected and replaced as soon as one is available again; the
+    controls, and the callbacks registered on them, are kept.
+    """
+
+    disconnect_errors = (OSError, EOFError)  # Errors raised by reading from a gamepad that was unplugged.
+    min_backoff = 0.05  # Time in seconds before the first rescan after a failed one.
+    max_backoff = 2.0  # Maximum time in seconds between rescans.
+
+    def __init__(self,
+                 controller,
+                 find_gamepad: Optional[gamepad_finder_t] = None,
+                 directory: str = DeviceWatcher.default_directory) -> None:
+        """
+        Initializes a ConnectionManager for a controller.
+
+        Args:
+            controller: The controller to keep connected, e.g. an XboxControllerGen4.
+            find_gamepad (Optional[gamepad_finder_t]): Returns a connected gamepad or None, or None to use the
+                                                       backend of the controller.
+            directory (str): The directory whose changes trigger a rescan for gamepads.
+        """
+        self.__controller = controller
+        self.__find_gamepad = find_gamepad if find_gamepad is not None else get_backend(controller.get_backend())
+        self.__watcher = DeviceWatcher(directory)
+        self.__backoff = self.min_backoff  # Time to wait before the next rescan.
+        self.__next_scan_time = 0.0  # perf_counter time after which update() rescans without a directory change.
+        self.__connect_callbacks = ()  # Functions to call when a gamepad was connected.
+        self.__disconnect_callbacks = ()  # Functions to call when the gamepad was disconnected.
+
+    def on_connect(self, *callbacks: connection_callback_t) -> 'ConnectionManager':
+        """
+        Registers callbacks to be called when a gamepad is connected.
+
+        Args:
+            callbacks (connection_callback_t): A variadic number of callback functions to register.
+
+        Returns:
+            ConnectionManager: The instance of this class to allow method chaining.
+        """
+        self.__connect_callbacks += callbacks
+        return self
+
+    def on_disconnect(self, *callbacks: connection_callback_t) -> 'ConnectionManager':
+        """
+        Registers callbacks to be called when the gamepad is disconnected.
+
+        Args:
+            callbacks (connection_callback_t): A variadic number of callback functions to register.
+
+        Returns:
+            ConnectionManager: The instance of this class to allow method chaining.
+        """
+        self.__disconnect_callbacks += callbacks
+        return self
+
+    def is_connected(self) -> bool:
+        """
+        Returns:
+            bool: True if the controller has a gamepad.
+        """
+        return self.__controller.get_gamepad() is not None
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the controller has a gamepad.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            bool: True if the controller is connected, False if the timeout expired.
+        """
+        deadline = None if timeout is None else perf_counter() + timeout
+        while not self.__connect():
+            wait_time = self.__backoff
+            if deadline is not None:
+                remaining = deadline - perf_counter()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+            if self.__watcher.wait(wait_time):
+                self.__backoff = self.min_backoff  # Device nodes can take a moment to become readable after they appear
+            else:
+                self.__backoff = min(self.__backoff * 2, self.max_backoff)
+        return True
+
+    async def wait_connected_async(self) -> None:
+        """
+        Suspends the calling coroutine until the controller has a gamepad, without blocking the event loop. The inotify
+        descriptor of the device directory is registered with the loop, so the backend is only rescanned when the
+        directory changed. Where inotify is not available, it is rescanned at an exponentially growing interval.
+        """
+        import asyncio  # Already loaded by the running loop, imported here to keep importing the package fast
+        watcher = self.__watcher
+        fd = watcher.fileno()
+        if fd is None:
+            while not self.__connect():
+                await asyncio.sleep(self.__backoff)
+                self.__backoff = min(self.__backoff * 2, self.max_backoff)
+            return
+        loop = asyncio.get_running_loop()
+        while not self.__connect():
+            changed = loop.create_future()
+            loop.add_reader(fd, lambda: changed.done() or changed.set_result(None))
+            try:
+                await changed
+            finally:
+                loop.remove_reader(fd)
+            watcher.wait(0)  # Discards the notifications that woke the coroutine
+
+    def update(self) -> bool:
+        """
+        Updates the controller if it is connected, and otherwise checks without blocking whether a gamepad can be
+        connected. A gamepad failing during the update is disconnected.
+
+        Returns:
+            bool: True if the controller was updated, False if it is not connected.
+        """
+        controller = self.__controller
+        if controller.get_gamepad() is None:
+            changed = self.__watcher.wait(0)
+            if not changed and perf_counter() < self.__next_scan_time:
+                return False
+            if not self.__connect():
+                if changed:
+                    self.__backoff = self.min_backoff
+                self.__next_scan_time = perf_counter() + self.__backoff
+                self.__backoff = min(self.__backoff * 2, self.max_backoff)
+                return False
+        try:
+            controller.update()
+        except self.disconnect_errors:
+            self.disconnect()
+            return False
+        return True
+
+    def disconnect(self) -> None:
+        """
+        Closes the gamepad of the controller and resets its controls to rest, which releases pressed buttons.
+        """
+        controller = self.__controller
+        gamepad = controller.get_gamepad()
+        if gamepad is None:
+            return
+        controller.set_gamepad(None)
+        close = getattr(gamepad, "close", None)
+        if close is not None:
+            try:
+                close()
+            except OSError:
+                pass
+        controller.reset_state()
+        self.__backoff = self.min_backoff
+        self.__next_scan_time = 0.0
+        for callback in self.__disconnect_callbacks:
+            callback()
+
+    def close(self) -> None:
+        """
+        Stops watching the device directory. The gamepad of the controller is left open.
+        """
+        self.__watcher.close()
+
+    def __enter__(self) -> 'ConnectionManager':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __connect(self) -> bool:
+        """
+        Private method to connect the controller to a gamepad, if it has none and one is available.
+
+        Returns:
+            bool: True if the controller is connected.
+        """
+        controller = self.__controller
+        if controller.get_gamepad() is not None:
+            return True
+        gamepad = self.__find_gamepad()
+        if gamepad is None:
+            return False
+        controller.set_gamepad(gamepad)
+        self.__backoff = self.min_backoff
+        for callback in self.__connect_callbacks:
+            callback()
+        return True
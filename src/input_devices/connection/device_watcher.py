@@ -0,0 +1,109 @@
+import ctypes
+import os
+import select
+from time import sleep
+from typing import Optional
+
+# inotify events signalling that a device node appeared, disappeared or became accessible
+_in_create = 0x00000100
+_in_delete = 0x00000200
+_in_attrib = 0x00000004
+_in_moved_to = 0x00000080
+_watch_mask = _in_create | _in_delete | _in_attrib | _in_moved_to
+
+
+class DeviceWatcher:
+    """
+    Waits for changes of a device directory, e.g. /dev/input when a gamepad is plugged in. On Linux the directory is
+    watched with inotify, so waiting costs no CPU time. Where inotify is not available, waiting simply sleeps for the
+    timeout and the caller rescans, so callers should always wait with a finite timeout.
+    """
+
+    default_directory = "/dev/input"  # Directory holding the evdev device nodes.
+
+    def __init__(self, directory: str = default_directory) -> None:
+        """
+        Starts watching a directory.
+
+        Args:
+            directory (str): The directory to watch.
+        """
+        self.__fd: Optional[int] = _inotify_watch(directory)
+
+    def is_watching(self) -> bool:
+        """
+        Returns:
+            bool: True if changes are detected with inotify, False if waiting falls back to sleeping.
+        """
+        return self.__fd is not None
+
+    def fileno(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: The inotify file descriptor, readable when the directory changed, or None without inotify.
+        """
+        return self.__fd
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Waits until the directory changes or the timeout expires, and discards the pending change notifications.
+
+        Args:
+            timeout (float): The maximum time in seconds to wait, 0 to only check for pending changes.
+
+        Returns:
+            bool: True if the directory changed, False if the timeout expired or changes cannot be detected.
+        """
+        if self.__fd is None:
+            if timeout > 0:
+                sleep(timeout)
+            return False
+        if not select.select([self.__fd], [], [], timeout)[0]:
+            return False
+        try:
+            while os.read(self.__fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        """
+        Stops watching the directory.
+        """
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def __enter__(self) -> 'DeviceWatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _inotify_watch(directory: str) -> Optional[int]:
+    """
+    Creates a non-blocking inotify instance watching a directory.
+
+    Args:
+        directory (str): The directory to watch.
+
+    Returns:
+        Optional[int]: The inotify file descriptor, or None if inotify or the directory is not available.
+    """
+    if not os.path.isdir(directory):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)  # Symbols already loaded into the process, libc included, without an ldconfig scan
+    except (OSError, TypeError):
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), _watch_mask) < 0:
+        os.close(fd)
+        return None
+    return fd
@@ -0,0 +1 @@
+from .controller_hub import ControllerHub
@@ -0,0 +1,117 @@
+import selectors
+from typing import Callable, Dict, List, Optional
+from ..evdev import EvdevDevice
+from ..xbox_controller import XboxControllerGen4
+
+disconnect_callback_t = Callable[[XboxControllerGen4], None]  # Type alias for callbacks receiving a disconnected controller.
+
+class ControllerHub:
+    """
+    Serves many controllers from a single thread. The file descriptors of all controller devices are waited on with
+    a single selector call (epoll on Linux), and only the controllers whose devices have events ready are updated.
+    Controllers must read from non-blocking devices, such as EvdevDevice instances opened with blocking=False.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new ControllerHub without any controllers.
+        """
+        self.__selector = selectors.DefaultSelector()
+        self.__controllers: Dict[str, XboxControllerGen4] = {}  # Controllers keyed by the path of their device.
+        self.__disconnect_callbacks = set()  # Set of functions to call when a controller device is removed.
+
+    def add(self, controller: XboxControllerGen4) -> XboxControllerGen4:
+        """
+        Adds a controller to the hub. The controller device must provide fileno() and get_char_device_path().
+
+        Args:
+            controller (XboxControllerGen4): The controller to serve.
+
+        Returns:
+            XboxControllerGen4: The added controller.
+        """
+        gamepad = controller.get_gamepad()
+        path = gamepad.get_char_device_path()
+        if path in self.__controllers:
+            raise ValueError(f"A controller for {path} was already added.")
+        self.__selector.register(gamepad, selectors.EVENT_READ, controller)
+        self.__controllers[path] = controller
+        return controller
+
+    def connect(self, path: str) -> XboxControllerGen4:
+        """
+        Opens a device in non-blocking mode and adds a new controller reading from it.
+
+        Args:
+            path (str): The path of the evdev device.
+
+        Returns:
+            XboxControllerGen4: The new controller.
+        """
+        return self.add(XboxControllerGen4(EvdevDevice(path, blocking=False)))
+
+    def remove(self, controller: XboxControllerGen4) -> None:
+        """
+        Removes a controller from the hub. Its device is not closed.
+
+        Args:
+            controller (XboxControllerGen4): The controller to remove.
+        """
+        gamepad = controller.get_gamepad()
+        self.__selector.unregister(gamepad)
+        del self.__controllers[gamepad.get_char_device_path()]
+
+    def on_disconnect(self, *callbacks: disconnect_callback_t) -> 'ControllerHub':
+        """
+        Registers one or more callbacks to be called with a controller that was removed because reading its device failed.
+
+        Args:
+            callbacks (disconnect_callback_t): A variadic number of callback functions to register.
+
+        Returns:
+            ControllerHub: The instance of this class to allow method chaining.
+        """
+        self.__disconnect_callbacks.update(callbacks)
+        return self
+
+    def controllers(self) -> List[XboxControllerGen4]:
+        """
+        Returns:
+            List[XboxControllerGen4]: The controllers currently served by the hub.
+        """
+        return list(self.__controllers.values())
+
+    def poll(self, timeout: Optional[float] = None) -> int:
+        """
+        Waits until at least one controller device has events ready, and updates the controllers that do.
+        Controllers whose device fails to read or reaches its end (e.g. because it was unplugged) are removed and reported to
+        the disconnect callbacks.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            int: The number of controllers that were updated.
+        """
+        if not self.__controllers:
+            return 0
+        ready = self.__selector.select(timeout)
+        for key, _ in ready:
+            controller = key.data
+            try:
+                controller.update()
+            except (OSError, EOFError):
+                self.remove(controller)
+                controller.get_gamepad().close()
+                for callback in self.__disconnect_callbacks:
+                    callback(controller)
+        return len(ready)
+
+    def close(self) -> None:
+        """
+        Closes the selector and the devices of all controllers.
+        """
+        for controller in self.controllers():
+            self.remove(controller)
+            controller.get_gamepad().close()
+        self.__selector.close()
@@ -0,0 +1,2 @@
+from .event_codes import *
+from .evdev_device import EvdevDevice, EvdevEvent, event_format, list_gamepad_paths
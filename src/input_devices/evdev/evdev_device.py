@@ -0,0 +1,119 @@
+import os
+from glob import glob
+from struct import Struct
+from typing import Iterator, List, NamedTuple, Tuple
+from .event_codes import code_names, event_key
+
+event_format = 'llHHi'  # struct input_event: timeval seconds, timeval microseconds, type, code, value
+_event_struct = Struct(event_format)
+raw_event_t = Tuple[int, int, int, int, int]  # Type alias for an undecoded (seconds, microseconds, type, code, value) event.
+
+class EvdevEvent(NamedTuple):
+    """A decoded input event, exposing the same code and state attributes as the events of the 'inputs' library."""
+    timestamp: float
+    ev_type: int
+    code: str
+    state: int
+
+
+class EvdevDevice:
+    """
+    Reads input events directly from a Linux evdev character device (/dev/input/event*), bypassing the 'inputs' library.
+    Events are read in bulk into a preallocated buffer and decoded in place, so no event objects are created on the
+    read_raw() path. Any file carrying struct input_event records, such as a pipe or a regular file, can be read as well.
+    """
+
+    default_batch_size = 64  # Maximum number of events read at once.
+    event_size = _event_struct.size  # Size in bytes of a single struct input_event.
+
+    def __init__(self, path: str, batch_size: int = default_batch_size, blocking: bool = True) -> None:
+        """
+        Opens an evdev device.
+
+        Args:
+            path (str): The path of the character device, pipe or file to read events from.
+            batch_size (int): The maximum number of events returned by a single read.
+            blocking (bool): If False, reads return no events instead of waiting when none are available.
+        """
+        self.__path = path
+        self.__fd = os.open(path, os.O_RDONLY | (0 if blocking else os.O_NONBLOCK))
+        self.__file = os.fdopen(self.__fd, 'rb', buffering=0)
+        self.__buffer = bytearray(self.event_size * batch_size)
+        self.__view = memoryview(self.__buffer)
+        self.__pending = 0  # Bytes of an incomplete event kept at the start of the buffer from the previous read.
+
+    def fileno(self) -> int:
+        """
+        Returns:
+            int: The file descriptor of the device, for use with selectors or event loops.
+        """
+        return self.__fd
+
+    def get_char_device_path(self) -> str:
+        """
+        Returns:
+            str: The path the device was opened from.
+        """
+        return self.__path
+
+    def read_raw(self) -> Iterator[raw_event_t]:
+        """
+        Reads the available events, waiting for at least one in blocking mode, without decoding their codes.
+
+        Returns:
+            Iterator[raw_event_t]: An iterator over (seconds, microseconds, type, code, value) tuples unpacked from the buffer.
+                                   It must be consumed before the next read, which reuses the buffer.
+
+        Raises:
+            EOFError: If the end of the file was reached or all writers of a pipe closed it.
+        """
+        pending = self.__pending
+        count = self.__file.readinto(self.__view[pending:])
+        if count is None:
+            return iter(())  # No events available in non-blocking mode
+        if not count:
+            raise EOFError(f"The end of {self.__path} was reached.")
+        size = pending + count
+        complete = size - size % self.event_size
+        events = _event_struct.iter_unpack(self.__view[:complete])
+        self.__pending = size - complete
+        if self.__pending:
+            # A partial event was read, decode the complete ones now and move the partial one to the buffer start
+            events = iter(list(events))
+            self.__buffer[:self.__pending] = self.__buffer[complete:size]
+        return events
+
+    def read(self) -> List[EvdevEvent]:
+        """
+        Reads and decodes the available events, waiting for at least one in blocking mode.
+
+        Returns:
+            List[EvdevEvent]: The decoded events.
+
+        Raises:
+            EOFError: If the end of the file was reached or all writers of a pipe closed it.
+        """
+        return [EvdevEvent(seconds + microseconds / 1000000, ev_type, code_names.get(event_key(ev_type, code), "UNKNOWN"), value)
+                for seconds, microseconds, ev_type, code, value in self.read_raw()]
+
+    def close(self) -> None:
+        """
+        Closes the device.
+        """
+        self.__file.close()
+
+    def __enter__(self) -> 'EvdevDevice':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def list_gamepad_paths() -> List[str]:
+    """
+    Lists the evdev character devices of the connected gamepads and joysticks.
+
+    Returns:
+        List[str]: The paths of the gamepad devices.
+    """
+    return sorted(os.path.realpath(path) for path in glob("/dev/input/by-id/*-event-joystick"))
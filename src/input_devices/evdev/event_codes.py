@@ -0,0 +1,185 @@
+from typing import Dict
+
+__all__ = ['EV_SYN', 'EV_KEY', 'EV_ABS', 'event_key', 'code_names', 'event_keys']
+
+# Event types, from linux/input-event-codes.h
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+
+# Names of the event codes used by the supported controllers and device profiles, keyed by (type, code) packed with event_key.
+# The names follow the 'inputs' library, so name based dispatch tables work with either backend.
+_codes = {
+    EV_SYN: {0x00: "SYN_REPORT", 0x02: "SYN_MT_REPORT", 0x03: "SYN_DROPPED"},
+    EV_KEY: {
+        1: "KEY_ESC",
+        2: "KEY_1",
+        3: "KEY_2",
+        4: "KEY_3",
+        5: "KEY_4",
+        6: "KEY_5",
+        7: "KEY_6",
+        8: "KEY_7",
+        9: "KEY_8",
+        10: "KEY_9",
+        11: "KEY_0",
+        12: "KEY_MINUS",
+        13: "KEY_EQUAL",
+        14: "KEY_BACKSPACE",
+        15: "KEY_TAB",
+        16: "KEY_Q",
+        17: "KEY_W",
+        18: "KEY_E",
+        19: "KEY_R",
+        20: "KEY_T",
+        21: "KEY_Y",
+        22: "KEY_U",
+        23: "KEY_I",
+        24: "KEY_O",
+        25: "KEY_P",
+        26: "KEY_LEFTBRACE",
+        27: "KEY_RIGHTBRACE",
+        28: "KEY_ENTER",
+        29: "KEY_LEFTCTRL",
+        30: "KEY_A",
+        31: "KEY_S",
+        32: "KEY_D",
+        33: "KEY_F",
+        34: "KEY_G",
+        35: "KEY_H",
+        36: "KEY_J",
+        37: "KEY_K",
+        38: "KEY_L",
+        39: "KEY_SEMICOLON",
+        40: "KEY_APOSTROPHE",
+        41: "KEY_GRAVE",
+        42: "KEY_LEFTSHIFT",
+        43: "KEY_BACKSLASH",
+        44: "KEY_Z",
+        45: "KEY_X",
+        46: "KEY_C",
+        47: "KEY_V",
+        48: "KEY_B",
+        49: "KEY_N",
+        50: "KEY_M",
+        51: "KEY_COMMA",
+        52: "KEY_DOT",
+        53: "KEY_SLASH",
+        54: "KEY_RIGHTSHIFT",
+        55: "KEY_KPASTERISK",
+        56: "KEY_LEFTALT",
+        57: "KEY_SPACE",
+        58: "KEY_CAPSLOCK",
+        59: "KEY_F1",
+        60: "KEY_F2",
+        61: "KEY_F3",
+        62: "KEY_F4",
+        63: "KEY_F5",
+        64: "KEY_F6",
+        65: "KEY_F7",
+        66: "KEY_F8",
+        67: "KEY_F9",
+        68: "KEY_F10",
+        69: "KEY_NUMLOCK",
+        70: "KEY_SCROLLLOCK",
+        71: "KEY_KP7",
+        72: "KEY_KP8",
+        73: "KEY_KP9",
+        74: "KEY_KPMINUS",
+        75: "KEY_KP4",
+        76: "KEY_KP5",
+        77: "KEY_KP6",
+        78: "KEY_KPPLUS",
+        79: "KEY_KP1",
+        80: "KEY_KP2",
+        81: "KEY_KP3",
+        82: "KEY_KP0",
+        83: "KEY_KPDOT",
+        87: "KEY_F11",
+        88: "KEY_F12",
+        96: "KEY_KPENTER",
+        97: "KEY_RIGHTCTRL",
+        98: "KEY_KPSLASH",
+        99: "KEY_SYSRQ",
+        100: "KEY_RIGHTALT",
+        101: "KEY_LINEFEED",
+        102: "KEY_HOME",
+        103: "KEY_UP",
+        104: "KEY_PAGEUP",
+        105: "KEY_LEFT",
+        106: "KEY_RIGHT",
+        107: "KEY_END",
+        108: "KEY_DOWN",
+        109: "KEY_PAGEDOWN",
+        110: "KEY_INSERT",
+        111: "KEY_DELETE",
+        119: "KEY_PAUSE",
+        125: "KEY_LEFTMETA",
+        126: "KEY_RIGHTMETA",
+        127: "KEY_COMPOSE",
+        167: "KEY_RECORD",
+        0x120: "BTN_TRIGGER",
+        0x121: "BTN_THUMB",
+        0x122: "BTN_THUMB2",
+        0x123: "BTN_TOP",
+        0x124: "BTN_TOP2",
+        0x125: "BTN_PINKIE",
+        0x126: "BTN_BASE",
+        0x127: "BTN_BASE2",
+        0x128: "BTN_BASE3",
+        0x129: "BTN_BASE4",
+        0x12a: "BTN_BASE5",
+        0x12b: "BTN_BASE6",
+        0x12f: "BTN_DEAD",
+        0x130: "BTN_SOUTH",
+        0x131: "BTN_EAST",
+        0x132: "BTN_C",
+        0x133: "BTN_NORTH",
+        0x134: "BTN_WEST",
+        0x135: "BTN_Z",
+        0x136: "BTN_TL",
+        0x137: "BTN_TR",
+        0x138: "BTN_TL2",
+        0x139: "BTN_TR2",
+        0x13a: "BTN_SELECT",
+        0x13b: "BTN_START",
+        0x13c: "BTN_MODE",
+        0x13d: "BTN_THUMBL",
+        0x13e: "BTN_THUMBR",
+    },
+    EV_ABS: {
+        0x00: "ABS_X",
+        0x01: "ABS_Y",
+        0x02: "ABS_Z",
+        0x03: "ABS_RX",
+        0x04: "ABS_RY",
+        0x05: "ABS_RZ",
+        0x06: "ABS_THROTTLE",
+        0x07: "ABS_RUDDER",
+        0x08: "ABS_WHEEL",
+        0x09: "ABS_GAS",
+        0x0a: "ABS_BRAKE",
+        0x10: "ABS_HAT0X",
+        0x11: "ABS_HAT0Y",
+        0x12: "ABS_HAT1X",
+        0x13: "ABS_HAT1Y",
+    },
+}
+
+
+def event_key(ev_type: int, code: int) -> int:
+    """
+    Packs an event type and code into a single integer, usable as a dictionary key without allocating a tuple.
+
+    Args:
+        ev_type (int): The event type.
+        code (int): The event code.
+
+    Returns:
+        int: The packed event key.
+    """
+    return ev_type << 16 | code
+
+
+code_names: Dict[int, str] = {event_key(ev_type, code): name for ev_type, codes in _codes.items() for code, name in codes.items()}
+event_keys: Dict[str, int] = {name: key for key, name in code_names.items()}
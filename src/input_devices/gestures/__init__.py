@@ -0,0 +1 @@
+from .combo_engine import ComboEngine
@@ -0,0 +1,240 @@
+import heapq
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from ..shared import Button
+
+gesture_callback_t = Callable[[], None]  # Type alias for gesture callbacks that take no parameters and return nothing.
+
+
+class _SequenceNode:
+    """A node of the sequence trie: the presses matched so far and the callbacks of sequences ending here."""
+
+    __slots__ = ('children', 'callbacks', 'max_gap')
+
+    def __init__(self) -> None:
+        self.children: Dict[int, '_SequenceNode'] = {}  # Next node by the index of the next pressed button.
+        self.callbacks: List[Tuple[float, gesture_callback_t]] = []  # Maximum gap and callback of the sequences ending here.
+        self.max_gap = 0.0  # Largest time in seconds allowed before the next press, over all sequences through here.
+
+
+class _Chord:
+    """A set of buttons that are held together."""
+
+    __slots__ = ('mask', 'window', 'callbacks')
+
+    def __init__(self, mask: int, window: Optional[float]) -> None:
+        self.mask = mask  # Bit mask of the buttons of the chord.
+        self.window = window  # Largest time in seconds between the first and last press, or None for any.
+        self.callbacks: List[gesture_callback_t] = []
+
+
+class ComboEngine:
+    """
+    Recognizes chords, timed press sequences, double taps and long presses. The engine listens to the state changes
+    of the buttons directly, and all registered patterns are compiled into shared lookup structures: sequences into a
+    trie that is advanced by each press, chords into bit masks indexed by button. Matching therefore costs time per
+    event, not per registered pattern. Gesture callbacks run synchronously on the thread processing events.
+    """
+
+    def __init__(self, buttons: Dict[str, Button]) -> None:
+        """
+        Initializes a ComboEngine listening to a set of buttons.
+
+        Args:
+            buttons (Dict[str, Button]): The buttons by name, e.g. XboxControllerGen4.get_buttons().
+        """
+        self.__indices = {name: index for index, name in enumerate(buttons)}  # Bit index of every button by name.
+        self.__pressed_mask = 0  # Bit mask of the buttons currently held.
+        self.__press_timestamps = [0.0] * len(buttons)  # Event time of the last press of every button.
+        self.__press_generations = [0] * len(buttons)  # Number of presses of every button, to expire holds on release.
+        self.__sequence_root = _SequenceNode()
+        self.__active_nodes: List[Tuple[_SequenceNode, float, float]] = []  # Partial matches: node, last press time, largest gap.
+        self.__chords_by_button: List[List[_Chord]] = [[] for _ in buttons]  # Chords containing each button.
+        self.__chords: Dict[Tuple[int, Optional[float]], _Chord] = {}
+        self.__holds_by_button: List[List[Tuple[float, gesture_callback_t]]] = [[] for _ in buttons]
+        self.__pending_holds: List[Tuple[float, int, int, int, gesture_callback_t]] = []  # Heap of due long presses.
+        self.__hold_counter = 0  # Tie breaker keeping heap entries comparable.
+        for name, button in buttons.items():
+            button._add_transition_listener(self.__listener(self.__indices[name]))
+
+    def on_chord(self, buttons: Iterable[str], *callbacks: gesture_callback_t, window: Optional[float] = None) -> 'ComboEngine':
+        """
+        Registers callbacks called when all buttons of a chord are held at the same time, once per completion.
+
+        Args:
+            buttons (Iterable[str]): The names of the buttons of the chord.
+            callbacks (gesture_callback_t): A variadic number of callback functions to register.
+            window (Optional[float]): The largest time in seconds between the first and the last press of the chord,
+                                      or None to allow the buttons to be pressed at any time.
+
+        Returns:
+            ComboEngine: The instance of this class to allow method chaining.
+        """
+        mask = 0
+        for name in buttons:
+            mask |= 1 << self.__index(name)
+        chord = self.__chords.get((mask, window))
+        if chord is None:
+            chord = self.__chords[(mask, window)] = _Chord(mask, window)
+            for index in range(len(self.__chords_by_button)):
+                if mask >> index & 1:
+                    self.__chords_by_button[index].append(chord)
+        chord.callbacks.extend(callbacks)
+        return self
+
+    def on_sequence(self, buttons: Iterable[str], *callbacks: gesture_callback_t, max_gap: float = 0.4) -> 'ComboEngine':
+        """
+        Registers callbacks called when buttons are pressed in a given order, e.g. up, up, down, down. Any other press
+        in between breaks the sequence.
+
+        Args:
+            buttons (Iterable[str]): The names of the buttons in the order they are pressed.
+            callbacks (gesture_callback_t): A variadic number of callback functions to register.
+            max_gap (float): The largest time in seconds between two consecutive presses of the sequence.
+
+        Returns:
+            ComboEngine: The instance of this class to allow method chaining.
+        """
+        node = self.__sequence_root
+        for name in buttons:
+            node.max_gap = max(node.max_gap, max_gap)
+            node = node.children.setdefault(self.__index(name), _SequenceNode())
+        if node is self.__sequence_root:
+            raise ValueError("A sequence needs at least one button.")
+        node.callbacks.extend((max_gap, callback) for callback in callbacks)
+        return self
+
+    def on_double_tap(self, button: str, *callbacks: gesture_callback_t, max_gap: float = 0.3) -> 'ComboEngine':
+        """
+        Registers callbacks called when a button is pressed twice in quick succession.
+
+        Args:
+            button (str): The name of the button.
+            callbacks (gesture_callback_t): A variadic number of callback functions to register.
+            max_gap (float): The largest time in seconds between the two presses.
+
+        Returns:
+            ComboEngine: The instance of this class to allow method chaining.
+        """
+        return self.on_sequence((button, button), *callbacks, max_gap=max_gap)
+
+    def on_hold(self, button: str, duration: float, *callbacks: gesture_callback_t) -> 'ComboEngine':
+        """
+        Registers callbacks called when a button has been held for a given time. Holds are detected by poll(),
+        which should be called regularly, e.g. after every update of the controller.
+
+        Args:
+            button (str): The name of the button.
+            duration (float): The time in seconds the button has to be held.
+            callbacks (gesture_callback_t): A variadic number of callback functions to register.
+
+        Returns:
+            ComboEngine: The instance of this class to allow method chaining.
+        """
+        holds = self.__holds_by_button[self.__index(button)]
+        holds.extend((duration, callback) for callback in callbacks)
+        return self
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """
+        Calls the callbacks of the long presses that are due.
+
+        Args:
+            now (Optional[float]): The current perf_counter time, or None to read it.
+
+        Returns:
+            int: The number of callbacks that were called.
+        """
+        pending = self.__pending_holds
+        if not pending:
+            return 0
+        if now is None:
+            now = perf_counter()
+        called = 0
+        while pending and pending[0][0] <= now:
+            _, _, index, generation, callback = heapq.heappop(pending)
+            if self.__press_generations[index] == generation and self.__pressed_mask >> index & 1:
+                callback()
+                called += 1
+        return called
+
+    def __index(self, name: str) -> int:
+        """
+        Private method to get the bit index of a button.
+
+        Args:
+            name (str): The name of the button.
+
+        Returns:
+            int: The bit index of the button.
+        """
+        try:
+            return self.__indices[name]
+        except KeyError:
+            raise KeyError(f"Unknown button {name!r}, known buttons: {', '.join(self.__indices)}.") from None
+
+    def __listener(self, index: int) -> Callable[[bool, float], None]:
+        """
+        Private method to create the transition listener of a button.
+
+        Args:
+            index (int): The bit index of the button.
+
+        Returns:
+            Callable[[bool, float], None]: The listener, taking the new state and the event time.
+        """
+        def listener(state: bool, timestamp: float) -> None:
+            if state:
+                self.__on_press(index, timestamp)
+            else:
+                self.__pressed_mask &= ~(1 << index)
+                self.__press_generations[index] += 1
+        return listener
+
+    def __on_press(self, index: int, timestamp: float) -> None:
+        """
+        Private method to match all patterns against a button press.
+
+        Args:
+            index (int): The bit index of the pressed button.
+            timestamp (float): The event time of the press.
+        """
+        self.__pressed_mask |= 1 << index
+        self.__press_timestamps[index] = timestamp
+        self.__press_generations[index] += 1
+
+        # Long presses are scheduled on the local clock, since event times may come from another clock
+        holds = self.__holds_by_button[index]
+        if holds:
+            now = perf_counter()
+            generation = self.__press_generations[index]
+            for duration, callback in holds:
+                self.__hold_counter += 1
+                heapq.heappush(self.__pending_holds, (now + duration, self.__hold_counter, index, generation, callback))
+
+        # Chords containing the button complete when all of their buttons are held
+        for chord in self.__chords_by_button[index]:
+            if self.__pressed_mask & chord.mask == chord.mask:
+                if chord.window is not None:
+                    first_press = min(self.__press_timestamps[bit] for bit in range(len(self.__press_timestamps))
+                                      if chord.mask >> bit & 1)
+                    if timestamp - first_press > chord.window:
+                        continue
+                for callback in chord.callbacks:
+                    callback()
+
+        # Every partially matched sequence, and the root, advances along the pressed button or is dropped
+        advanced: List[Tuple[_SequenceNode, float, float]] = []
+        child = self.__sequence_root.children.get(index)
+        if child is not None:
+            advanced.append((child, timestamp, 0.0))
+        for node, last_timestamp, largest_gap in self.__active_nodes:
+            child = node.children.get(index)
+            gap = timestamp - last_timestamp
+            if child is not None and gap <= node.max_gap:
+                advanced.append((child, timestamp, max(largest_gap, gap)))
+        self.__active_nodes = [state for state in advanced if state[0].children]
+        for node, _, largest_gap in advanced:
+            for max_gap, callback in node.callbacks:
+                if largest_gap <= max_gap:
+                    callback()
@@ -0,0 +1,2 @@
+from .latency_histogram import LatencyHistogram
+from .pipeline_metrics import PipelineMetrics
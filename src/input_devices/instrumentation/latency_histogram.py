@@ -0,0 +1,141 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence
+
+__all__ = ['LatencyHistogram']
+
+
+class LatencyHistogram:
+    """
+    A histogram of durations in nanoseconds over fixed bucket bounds. Recording is a binary search and an increment
+    in preallocated counters, so it allocates nothing and its cost does not grow with the number of samples.
+    """
+
+    # Upper bounds of the buckets in nanoseconds, from 250 ns to 100 ms; slower samples fall into an overflow bucket.
+    default_bounds = (250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000,
+                      1000000, 2500000, 5000000, 10000000, 25000000, 50000000, 100000000)
+
+    def __init__(self, bounds: Sequence[int] = default_bounds) -> None:
+        """
+        Initializes an empty LatencyHistogram.
+
+        Args:
+            bounds (Sequence[int]): The increasing upper bounds of the buckets in nanoseconds, each bound inclusive.
+        """
+        if not bounds or any(lower >= upper for lower, upper in zip(bounds, bounds[1:])):
+            raise ValueError("bounds must be a non-empty increasing sequence.")
+        self.__bounds = tuple(bounds)
+        self.__counts = array('Q', bytes(8 * (len(bounds) + 1)))  # The last counter is the overflow bucket.
+        self.__count = 0  # Number of recorded samples.
+        self.__sum = 0  # Sum of the recorded durations in nanoseconds.
+        self.__max = 0  # Largest recorded duration in nanoseconds.
+
+    def record(self, duration: int) -> None:
+        """
+        Records a duration.
+
+        Args:
+            duration (int): The duration in nanoseconds.
+        """
+        self.__counts[bisect_left(self.__bounds, duration)] += 1
+        self.__count += 1
+        self.__sum += duration
+        if duration > self.__max:
+            self.__max = duration
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """
+        Adds the samples of another histogram with the same bucket bounds.
+
+        Args:
+            other (LatencyHistogram): The histogram to add.
+        """
+        if other.get_bounds() != self.__bounds:
+            raise ValueError("Only histograms with the same bucket bounds can be merged.")
+        for index, count in enumerate(other.get_counts()):
+            self.__counts[index] += count
+        self.__count += other.get_count()
+        self.__sum += other.get_sum()
+        self.__max = max(self.__max, other.get_max())
+
+    def reset(self) -> None:
+        """
+        Discards all samples.
+        """
+        for index in range(len(self.__counts)):
+            self.__counts[index] = 0
+        self.__count = 0
+        self.__sum = 0
+        self.__max = 0
+
+    def get_bounds(self) -> tuple:
+        """
+        Returns:
+            tuple: The upper bounds of the buckets in nanoseconds.
+        """
+        return self.__bounds
+
+    def get_counts(self) -> list:
+        """
+        Returns:
+            list: The number of samples in each bucket, followed by the number of samples above the last bound.
+        """
+        return self.__counts.tolist()
+
+    def get_count(self) -> int:
+        """
+        Returns:
+            int: The number of recorded samples.
+        """
+        return self.__count
+
+    def get_sum(self) -> int:
+        """
+        Returns:
+            int: The sum of the recorded durations in nanoseconds.
+        """
+        return self.__sum
+
+    def get_max(self) -> int:
+        """
+        Returns:
+            int: The largest recorded duration in nanoseconds, 0 without samples.
+        """
+        return self.__max
+
+    def get_percentile(self, percentile: float) -> Optional[int]:
+        """
+        Estimates a percentile of the recorded durations as the upper bound of the bucket it falls into.
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            Optional[int]: The estimated duration in nanoseconds, the largest recorded duration if it falls into the
+                           overflow bucket, or None without samples.
+        """
+        if not self.__count:
+            return None
+        rank = percentile / 100 * self.__count
+        cumulative = 0
+        for index, count in enumerate(self.__counts):
+            cumulative += count
+            if count and cumulative >= rank:
+                return self.__bounds[index] if index < len(self.__bounds) else self.__max
+        return self.__max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: A copy of the histogram: bucket bounds and counts, count, sum, maximum and the estimated
+                            median and 99th percentile, all durations in nanoseconds.
+        """
+        return {
+            "bounds_ns": list(self.__bounds),
+            "counts": self.get_counts(),
+            "count": self.__count,
+            "sum_ns": self.__sum,
+            "max_ns": self.__max,
+            "p50_ns": self.get_percentile(50),
+            "p99_ns": self.get_percentile(99),
+        }
@@ -0,0 +1,256 @@
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence
+from .latency_histogram import LatencyHistogram
+
+__all__ = ['PipelineMetrics']
+
+
+class PipelineMetrics:
+    """
+    Latency histograms and counters of the input pipeline of one or more controllers, attached with their set_metrics
+    method. The stages are measured per call:
+
+        read      one read of the backend, returning a batch of events
+        decode    routing a batch of events to their controls, excluding the time spent in the controls
+        apply     applying one event to its control, excluding the callbacks it triggers
+        callback  running one callback, or handing it to the callback dispatcher if one is set
+
+    Controllers without metrics take the uninstrumented path, so instrumentation costs nothing while it is off.
+    Metrics are updated by the thread processing events; snapshots taken from other threads may be slightly stale.
+    """
+
+    stages = ("read", "decode", "apply", "callback")  # Names of the measured pipeline stages.
+
+    def __init__(self, bounds: Sequence[int] = LatencyHistogram.default_bounds) -> None:
+        """
+        Initializes empty metrics.
+
+        Args:
+            bounds (Sequence[int]): The upper bounds of the histogram buckets in nanoseconds.
+        """
+        self.__bounds = bounds
+        self.__stage_histograms = {stage: LatencyHistogram(bounds) for stage in self.stages}
+        self.__read = self.__stage_histograms["read"]
+        self.__decode = self.__stage_histograms["decode"]
+        self.__apply = self.__stage_histograms["apply"]
+        self.__callback = self.__stage_histograms["callback"]
+        self.__callback_histograms: Dict[Callable, LatencyHistogram] = {}  # Durations of each callback.
+        self.__event_counts: Dict[str, int] = {}  # Number of applied events by event code.
+        self.__debounce_rejections: Dict[Any, int] = {}  # Number of state changes ignored by debounce, by button.
+        self.__button_names: Dict[Any, str] = {}  # Names of the buttons, used to label debounce rejections.
+        self.__handler_time = 0  # Total time spent in instrumented event handlers, in nanoseconds.
+        self.__callback_time = 0  # Total time spent in callbacks, in nanoseconds.
+
+    def get_histogram(self, stage: str) -> LatencyHistogram:
+        """
+        Gets the histogram of a pipeline stage.
+
+        Args:
+            stage (str): The name of the stage, one of PipelineMetrics.stages.
+
+        Returns:
+            LatencyHistogram: The durations of the stage.
+        """
+        return self.__stage_histograms[stage]
+
+    def get_callback_histograms(self) -> Dict[str, LatencyHistogram]:
+        """
+        Returns:
+            Dict[str, LatencyHistogram]: The durations of each callback keyed by its qualified name. Callbacks sharing
+                                         a name, e.g. lambdas of the same function, are merged.
+        """
+        histograms: Dict[str, LatencyHistogram] = {}
+        for callback, histogram in list(self.__callback_histograms.items()):
+            name = _callback_name(callback)
+            if name not in histograms:
+                histograms[name] = LatencyHistogram(self.__bounds)
+            histograms[name].merge(histogram)
+        return histograms
+
+    def get_event_counts(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: The number of events applied to a control, keyed by event code.
+        """
+        return dict(self.__event_counts)
+
+    def get_debounce_rejections(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: The number of state changes ignored by the debounce filter, keyed by button name.
+        """
+        rejections: Dict[str, int] = {}
+        for button, count in list(self.__debounce_rejections.items()):
+            name = self.__button_names.get(button, "unnamed")
+            rejections[name] = rejections.get(name, 0) + count
+        return rejections
+
+    def reset(self) -> None:
+        """
+        Discards all samples, counts and accumulated handler and callback times. The button names are kept.
+        """
+        for histogram in self.__stage_histograms.values():
+            histogram.reset()
+        self.__callback_histograms.clear()
+        self.__event_counts.clear()
+        self.__debounce_rejections.clear()
+        self.__handler_time = 0
+        self.__callback_time = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: A copy of all metrics: the histogram snapshots of the stages and callbacks, the event counts
+                            and the debounce rejections.
+        """
+        return {
+            "stages": {stage: histogram.snapshot() for stage, histogram in self.__stage_histograms.items()},
+            "callbacks": {name: histogram.snapshot() for name, histogram in self.get_callback_histograms().items()},
+            "events": self.get_event_counts(),
+            "debounce_rejections": self.get_debounce_rejections(),
+        }
+
+    def to_json(self) -> str:
+        """
+        Returns:
+            str: The snapshot of the metrics as a JSON document.
+        """
+        import json  # Only the JSON dump needs the json module
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self, prefix: str = "input_devices") -> str:
+        """
+        Formats the metrics in the Prometheus text exposition format, with durations in seconds.
+
+        Args:
+            prefix (str): The prefix of the metric names.
+
+        Returns:
+            str: The metrics, ready to be served on a /metrics endpoint.
+        """
+        lines = []
+        name = prefix + "_stage_duration_seconds"
+        lines += ["# HELP " + name + " Duration of the stages of the input pipeline.", "# TYPE " + name + " histogram"]
+        for stage, histogram in self.__stage_histograms.items():
+            lines += _prometheus_histogram(name, "stage", stage, histogram)
+        name = prefix + "_callback_duration_seconds"
+        lines += ["# HELP " + name + " Duration of the button callbacks.", "# TYPE " + name + " histogram"]
+        for callback, histogram in self.get_callback_histograms().items():
+            lines += _prometheus_histogram(name, "callback", callback, histogram)
+        name = prefix + "_events_total"
+        lines += ["# HELP " + name + " Number of events applied to a control.", "# TYPE " + name + " counter"]
+        lines += [f'{name}{{code="{_escape(code)}"}} {count}' for code, count in self.get_event_counts().items()]
+        name = prefix + "_debounce_rejections_total"
+        lines += ["# HELP " + name + " Number of button state changes ignored by debounce.", "# TYPE " + name + " counter"]
+        lines += [f'{name}{{button="{_escape(button)}"}} {count}' for button, count in self.get_debounce_rejections().items()]
+        return "\n".join(lines) + "\n"
+
+    def _record_read(self, duration: int) -> None:
+        """Internal method to record the duration of a backend read in nanoseconds."""
+        self.__read.record(duration)
+
+    def _measure_decode(self, decode: Callable[[Any], None], events) -> None:
+        """Internal method to decode a batch of events, recording the time spent outside of the event handlers."""
+        handler_time = self.__handler_time
+        start = perf_counter_ns()
+        decode(events)
+        self.__decode.record(perf_counter_ns() - start - (self.__handler_time - handler_time))
+
+    def _instrument_handler(self, code: str, handler: Callable[[int, Optional[float]], None]) -> Callable[[int, Optional[float]], None]:
+        """Internal method to wrap an event handler, counting its events and recording their apply durations."""
+        event_counts = self.__event_counts
+        apply = self.__apply
+
+        def instrumented(state: int, timestamp: Optional[float]) -> None:
+            entry = perf_counter_ns()
+            event_counts[code] = event_counts.get(code, 0) + 1
+            callback_time = self.__callback_time
+            start = perf_counter_ns()
+            handler(state, timestamp)
+            apply.record(perf_counter_ns() - start - (self.__callback_time - callback_time))
+            # The bookkeeping is charged to the handlers too, so it does not inflate the decode stage
+            self.__handler_time += perf_counter_ns() - entry
+        return instrumented
+
+    def _run_callbacks(self, callbacks: Iterable[Callable[[], Any]], callback_dispatcher) -> None:
+        """Internal method to call or dispatch triggered callbacks, recording the duration of each, including ones that raise."""
+        for callback in callbacks:
+            start = perf_counter_ns()
+            try:
+                if callback_dispatcher is None:
+                    callback()
+                else:
+                    callback_dispatcher.dispatch(callback)
+            finally:
+                elapsed = perf_counter_ns() - start
+                self.__callback_time += elapsed
+                self.__callback.record(elapsed)
+                histogram = self.__callback_histograms.get(callback)
+                if histogram is None:
+                    histogram = self.__callback_histograms[callback] = LatencyHistogram(self.__bounds)
+                histogram.record(elapsed)
+
+    def _count_debounce_rejection(self, button) -> None:
+        """Internal method to count a state change of a button ignored by its debounce filter."""
+        self.__debounce_rejections[button] = self.__debounce_rejections.get(button, 0) + 1
+
+    def _name_buttons(self, buttons: Mapping[str, Any]) -> None:
+        """Internal method to set the names labelling the debounce rejections of buttons."""
+        for name, button in buttons.items():
+            self.__button_names[button] = name
+
+
+def _callback_name(callback: Callable) -> str:
+    """
+    Gets a readable name of a callback.
+
+    Args:
+        callback (Callable): The callback.
+
+    Returns:
+        str: The module and qualified name of the callback, or its repr if it has none.
+    """
+    name = getattr(callback, "__qualname__", None)
+    if name is None:
+        return repr(callback)
+    module = getattr(callback, "__module__", None)
+    return f"{module}.{name}" if module else name
+
+
+def _escape(value: str) -> str:
+    """
+    Escapes a Prometheus label value.
+
+    Args:
+        value (str): The label value.
+
+    Returns:
+        str: The value with backslashes, quotes and newlines escaped.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prometheus_histogram(name: str, label: str, value: str, histogram: LatencyHistogram) -> list:
+    """
+    Formats the samples of a histogram in the Prometheus text exposition format.
+
+    Args:
+        name (str): The name of the metric.
+        label (str): The name of the label distinguishing the histograms of the metric.
+        value (str): The value of the label.
+        histogram (LatencyHistogram): The histogram.
+
+    Returns:
+        list: The lines of the histogram, with cumulative buckets in seconds.
+    """
+    value = _escape(value)
+    lines = []
+    cumulative = 0
+    counts = histogram.get_counts()
+    for bound, count in zip(histogram.get_bounds(), counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{label}="{value}",le="{bound / 1e9:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{label}="{value}",le="+Inf"}} {cumulative + counts[-1]}')
+    lines.append(f'{name}_sum{{{label}="{value}"}} {histogram.get_sum() / 1e9:g}')
+    lines.append(f'{name}_count{{{label}="{value}"}} {histogram.get_count()}')
+    return lines
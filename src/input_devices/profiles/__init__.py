@@ -0,0 +1,5 @@
+from .device_profile import *
+from .builtin_profiles import *
+from .profile_registry import *
+from .profile_decoder import *
+from .profiled_controller import ProfiledController
@@ -0,0 +1,110 @@
+from ..evdev import event_keys
+
+__all__ = ['xbox_gen4_profile', 'dualshock4_profile', 'dualsense_profile', 'generic_joystick_profile', 'keyboard_profile']
+
+# Declarative definitions of the built-in profiles, parsed by load_profile on first use.
+# Event codes follow the Linux kernel drivers (xpad, hid-sony, hid-playstation, hid-generic, atkbd/hid-generic).
+
+xbox_gen4_profile = {
+    "name": "xbox_gen4",
+    "buttons": {
+        "A": "BTN_SOUTH",
+        "B": "BTN_EAST",
+        "X": "BTN_NORTH",
+        "Y": "BTN_WEST",
+        "select_button": "BTN_SELECT",
+        "key_record_button": "KEY_RECORD",
+        "start_button": "BTN_START",
+        "left_bumper": {"code": "BTN_TL", "debounce_time": 0.07},
+        "right_bumper": {"code": "BTN_TR", "debounce_time": 0.07},
+    },
+    "hats": {"directional_pad": {"x": "ABS_HAT0X", "y": "ABS_HAT0Y"}},
+    "sticks": {
+        "left_stick": {"x": "ABS_X", "y": "ABS_Y", "button": "BTN_THUMBL", "range": [-32768, 32767], "invert_y": True},
+        "right_stick": {"x": "ABS_RX", "y": "ABS_RY", "button": "BTN_THUMBR", "range": [-32768, 32767], "invert_y": True},
+    },
+    "axes": {
+        "left_trigger": {"code": "ABS_Z", "range": [0, 1023]},
+        "right_trigger": {"code": "ABS_RZ", "range": [0, 1023]},
+    },
+}
+
+_playstation_sticks = {
+    "left_stick": {"x": "ABS_X", "y": "ABS_Y", "button": "BTN_THUMBL", "range": [0, 255], "invert_y": True},
+    "right_stick": {"x": "ABS_RX", "y": "ABS_RY", "button": "BTN_THUMBR", "range": [0, 255], "invert_y": True},
+}
+
+_playstation_axes = {
+    "l2": {"code": "ABS_Z", "range": [0, 255]},
+    "r2": {"code": "ABS_RZ", "range": [0, 255]},
+}
+
+dualshock4_profile = {
+    "name": "dualshock4",
+    "buttons": {
+        "cross": "BTN_SOUTH",
+        "circle": "BTN_EAST",
+        "triangle": "BTN_NORTH",
+        "square": "BTN_WEST",
+        "l1": "BTN_TL",
+        "r1": "BTN_TR",
+        "l2_pressed": "BTN_TL2",
+        "r2_pressed": "BTN_TR2",
+        "share": "BTN_SELECT",
+        "options": "BTN_START",
+        "ps": "BTN_MODE",
+    },
+    "hats": {"directional_pad": {"x": "ABS_HAT0X", "y": "ABS_HAT0Y"}},
+    "sticks": _playstation_sticks,
+    "axes": _playstation_axes,
+}
+
+dualsense_profile = {
+    "name": "dualsense",
+    "buttons": {
+        "cross": "BTN_SOUTH",
+        "circle": "BTN_EAST",
+        "triangle": "BTN_NORTH",
+        "square": "BTN_WEST",
+        "l1": "BTN_TL",
+        "r1": "BTN_TR",
+        "l2_pressed": "BTN_TL2",
+        "r2_pressed": "BTN_TR2",
+        "create": "BTN_SELECT",
+        "options": "BTN_START",
+        "ps": "BTN_MODE",
+    },
+    "hats": {"directional_pad": {"x": "ABS_HAT0X", "y": "ABS_HAT0Y"}},
+    "sticks": _playstation_sticks,
+    "axes": _playstation_axes,
+}
+
+generic_joystick_profile = {
+    "name": "generic_joystick",
+    "buttons": {
+        "trigger": "BTN_TRIGGER",
+        "thumb": "BTN_THUMB",
+        "thumb2": "BTN_THUMB2",
+        "top": "BTN_TOP",
+        "top2": "BTN_TOP2",
+        "pinkie": "BTN_PINKIE",
+        "base": "BTN_BASE",
+        "base2": "BTN_BASE2",
+        "base3": "BTN_BASE3",
+        "base4": "BTN_BASE4",
+        "base5": "BTN_BASE5",
+        "base6": "BTN_BASE6",
+    },
+    "hats": {"hat": {"x": "ABS_HAT0X", "y": "ABS_HAT0Y"}},
+    "sticks": {"stick": {"x": "ABS_X", "y": "ABS_Y", "range": [0, 1023], "invert_y": True}},
+    "axes": {
+        "twist": {"code": "ABS_RZ", "range": [0, 255]},
+        "throttle": {"code": "ABS_THROTTLE", "range": [0, 255]},
+    },
+}
+
+keyboard_profile = {
+    "name": "keyboard",
+    "debounce_time": 0.0,  # Keyboards debounce in hardware, and autorepeat must not be filtered
+    "buttons": {name.lower(): name for name in event_keys if name.startswith("KEY_")},
+}
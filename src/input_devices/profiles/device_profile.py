@@ -0,0 +1,194 @@
+from typing import Any, List, Mapping, NamedTuple, Optional, Tuple
+from ..evdev import event_keys
+from ..shared import Button, DeadzoneMode
+from ..utils.type_hints import number_t, range_t
+
+__all__ = ['ButtonSpec', 'HatSpec', 'StickSpec', 'AxisSpec', 'DeviceProfile', 'parse_profile']
+
+
+class ButtonSpec(NamedTuple):
+    """A button driven by a key event, reporting 0 on release and a non-zero value on press or autorepeat."""
+    name: str  # Name of the control and of its snapshot field.
+    code: str  # Event code driving the button.
+    debounce_time: float  # Debounce time of the button in seconds.
+
+
+class HatSpec(NamedTuple):
+    """A directional pad driven by a pair of hat axes reporting -1, 0 or 1."""
+    name: str  # Name of the control; its snapshot fields are suffixed with _up, _down, _left and _right.
+    x_code: str  # Event code of the horizontal hat axis, -1 for left and 1 for right.
+    y_code: str  # Event code of the vertical hat axis, -1 for up and 1 for down.
+    debounce_time: float  # Debounce time of the four directional buttons in seconds.
+
+
+class StickSpec(NamedTuple):
+    """A two-axis stick, optionally clickable, with an optional joint deadzone."""
+    name: str  # Name of the control; its snapshot fields are suffixed with _pressed, _x and _y.
+    x_code: str  # Event code of the horizontal axis.
+    y_code: str  # Event code of the vertical axis.
+    button_code: Optional[str]  # Event code of the stick button, or None if the stick cannot be pressed.
+    horizontal_value_range: range_t  # Raw value range of the horizontal axis.
+    vertical_value_range: range_t  # Raw value range of the vertical axis.
+    horizontal_axis_inverted: bool  # Whether the horizontal axis values are inverted.
+    vertical_axis_inverted: bool  # Whether the vertical axis values are inverted.
+    deadzone: Optional[float]  # Deadzone as a fraction of the full deflection, or None for no StickCalibration.
+    deadzone_mode: DeadzoneMode  # Shape of the deadzone.
+    debounce_time: float  # Debounce time of the stick button in seconds.
+
+
+class AxisSpec(NamedTuple):
+    """A single absolute axis, such as a pressure-sensitive trigger, a throttle or a rudder."""
+    name: str  # Name of the control and of its snapshot field.
+    code: str  # Event code of the axis.
+    value_range: range_t  # Raw value range of the axis.
+    axis_inverted: bool  # Whether the axis values are inverted.
+    blindspot_range: Optional[range_t]  # Range of raw values ignored by the Calibration, or None for no Calibration.
+    axis_zero: Optional[number_t]  # Raw value representing zero input for the Calibration.
+    calibrated_range: range_t  # Range of the calibrated values.
+
+
+class DeviceProfile(NamedTuple):
+    """
+    A parsed and validated description of the controls of a device and the event codes driving them.
+    Profiles are immutable, so one parsed profile is shared by every controller compiled from it.
+    """
+    name: str
+    buttons: Tuple[ButtonSpec, ...]
+    hats: Tuple[HatSpec, ...]
+    sticks: Tuple[StickSpec, ...]
+    axes: Tuple[AxisSpec, ...]
+
+    def field_names(self) -> List[str]:
+        """
+        Returns:
+            List[str]: The names of the snapshot fields of the profile after the timestamp, in snapshot order.
+        """
+        names = [button.name for button in self.buttons]
+        for hat in self.hats:
+            names += [hat.name + "_up", hat.name + "_down", hat.name + "_left", hat.name + "_right"]
+        for stick in self.sticks:
+            if stick.button_code is not None:
+                names.append(stick.name + "_pressed")
+            names += [stick.name + "_x", stick.name + "_y"]
+        names += [axis.name for axis in self.axes]
+        return names
+
+    def axis_codes(self) -> List[str]:
+        """
+        Returns:
+            List[str]: The event codes of the stick and single axes, which may be coalesced. Hat axes are excluded,
+                       since their transitions drive buttons.
+        """
+        codes = []
+        for stick in self.sticks:
+            codes += [stick.x_code, stick.y_code]
+        codes += [axis.code for axis in self.axes]
+        return codes
+
+
+def parse_profile(definition: Mapping[str, Any], name: Optional[str] = None) -> DeviceProfile:
+    """
+    Parses and validates a declarative profile definition, e.g. loaded from JSON:
+
+        {
+            "name": "my_pad",
+            "debounce_time": 0.04,
+            "buttons": {"A": "BTN_SOUTH", "left_bumper": {"code": "BTN_TL", "debounce_time": 0.07}},
+            "hats": {"directional_pad": {"x": "ABS_HAT0X", "y": "ABS_HAT0Y"}},
+            "sticks": {"left_stick": {"x": "ABS_X", "y": "ABS_Y", "button": "BTN_THUMBL", "range": [-32768, 32767],
+                                      "invert_y": true, "deadzone": 0.1, "deadzone_mode": "scaled_radial"}},
+            "axes": {"left_trigger": {"code": "ABS_Z", "range": [0, 1023], "blindspot": [0, 30], "calibrated_range": [0, 1]}}
+        }
+
+    Sticks accept "x_range" and "y_range" in place of a shared "range". Every key but "name" is optional.
+
+    Args:
+        definition (Mapping[str, Any]): The profile definition.
+        name (Optional[str]): The name of the profile, or None to use the "name" of the definition.
+
+    Returns:
+        DeviceProfile: The parsed profile.
+
+    Raises:
+        ValueError: If the definition is invalid, e.g. names an unknown event code or maps a code twice.
+    """
+    name = name if name is not None else definition.get("name")
+    if not name:
+        raise ValueError("A device profile must have a name.")
+    default_debounce_time = definition.get("debounce_time", Button.default_debounce_time)
+
+    buttons = []
+    for button_name, entry in definition.get("buttons", {}).items():
+        if isinstance(entry, str):
+            entry = {"code": entry}
+        buttons.append(ButtonSpec(button_name, entry["code"], entry.get("debounce_time", default_debounce_time)))
+
+    hats = [HatSpec(hat_name, entry["x"], entry["y"], entry.get("debounce_time", default_debounce_time))
+            for hat_name, entry in definition.get("hats", {}).items()]
+
+    sticks = []
+    for stick_name, entry in definition.get("sticks", {}).items():
+        deadzone_mode = entry.get("deadzone_mode", DeadzoneMode.SCALED_RADIAL.value)
+        sticks.append(StickSpec(
+            stick_name, entry["x"], entry["y"], entry.get("button"),
+            _parse_range(entry.get("x_range", entry.get("range")), stick_name),
+            _parse_range(entry.get("y_range", entry.get("range")), stick_name),
+            entry.get("invert_x", False), entry.get("invert_y", False),
+            entry.get("deadzone"), DeadzoneMode(deadzone_mode),
+            entry.get("debounce_time", default_debounce_time),
+        ))
+
+    axes = []
+    for axis_name, entry in definition.get("axes", {}).items():
+        blindspot = entry.get("blindspot")
+        axes.append(AxisSpec(
+            axis_name, entry["code"], _parse_range(entry.get("range"), axis_name), entry.get("inverted", False),
+            _parse_range(blindspot, axis_name) if blindspot is not None else None,
+            entry.get("zero"), _parse_range(entry.get("calibrated_range", (-1, 1)), axis_name),
+        ))
+
+    profile = DeviceProfile(name, tuple(buttons), tuple(hats), tuple(sticks), tuple(axes))
+    _validate(profile)
+    return profile
+
+
+def _parse_range(value_range, control_name: str) -> range_t:
+    """
+    Parses a value range of a control.
+
+    Args:
+        value_range: The [minimum, maximum] pair of the definition.
+        control_name (str): The name of the control, for error messages.
+
+    Returns:
+        range_t: The value range.
+    """
+    if value_range is None or len(value_range) != 2 or value_range[0] >= value_range[1]:
+        raise ValueError(f"The control {control_name!r} needs a value range of the form [minimum, maximum].")
+    return value_range[0], value_range[1]
+
+
+def _validate(profile: DeviceProfile) -> None:
+    """
+    Checks that the snapshot fields of a profile are valid and unique and that every event code is known and
+    drives a single control.
+
+    Args:
+        profile (DeviceProfile): The profile to check.
+    """
+    fields = profile.field_names()
+    for field in fields:
+        if not field.isidentifier() or field.startswith("_") or field == "timestamp":
+            raise ValueError(f"Invalid control name {field!r} in device profile {profile.name!r}.")
+    if len(set(fields)) != len(fields):
+        raise ValueError(f"Duplicate control names in device profile {profile.name!r}.")
+
+    codes = [button.code for button in profile.buttons]
+    codes += [code for hat in profile.hats for code in (hat.x_code, hat.y_code)]
+    codes += [stick.button_code for stick in profile.sticks if stick.button_code is not None]
+    codes += profile.axis_codes()
+    for code in codes:
+        if code not in event_keys:
+            raise ValueError(f"Unknown event code {code!r} in device profile {profile.name!r}.")
+    if len(set(codes)) != len(codes):
+        raise ValueError(f"An event code drives several controls in device profile {profile.name!r}.")
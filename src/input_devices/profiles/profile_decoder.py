@@ -0,0 +1,272 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from ..evdev import event_keys
+from ..shared import Button
+from ..instrumentation import PipelineMetrics
+from .device_profile import DeviceProfile
+
+__all__ = ['event_handler_t', 'ProfileDecoder']
+
+event_handler_t = Callable[[int, Optional[float]], None]  # Type alias for handlers that consume the state and timestamp of an input event.
+
+
+class ProfileDecoder:
+    """
+    Routes input events to the controls of a device. The decoder is compiled from a DeviceProfile once, when the
+    controller is created: every event code is bound to a handler of its control, by name for decoded events and by
+    packed evdev key for raw ones, so decoding an event is a single dictionary lookup and call.
+    """
+
+    def __init__(self, profile: DeviceProfile, controls: Mapping[str, Any], coalesce_axes: bool = False) -> None:
+        """
+        Compiles a decoder for a profile.
+
+        Args:
+            profile (DeviceProfile): The profile describing the event codes of the device.
+            controls (Mapping[str, Any]): The controls driven by the events, keyed by the names of their profile entries:
+                                          a Button per button, a DirectionalPad per hat, a CartesianAxisInput (an
+                                          AxisTrigger if it has a button) per stick and a VerticalAxisInput per axis.
+            coalesce_axes (bool): If True, only the last value of each axis in a batch of events is applied.
+        """
+        self.__handlers = _compile_dispatch_table(profile, controls)  # Uninstrumented handlers by event code.
+        self.__dispatch_table = self.__handlers
+        self.__raw_dispatch_table = {event_keys[code]: handler for code, handler in self.__handlers.items()}
+        self.__state_setters = _compile_state_setters(profile, controls)
+        self.__metrics: Optional[PipelineMetrics] = None  # Metrics measuring the decoding, None unless enabled.
+        self.__axis_codes = frozenset(profile.axis_codes())
+        self.__raw_axis_keys = frozenset(event_keys[code] for code in self.__axis_codes)
+        self.__coalesce_axes = coalesce_axes  # Whether axis events are collapsed to their last value per batch.
+        self.__coalesced_event_count = 0  # Number of axis events skipped by coalescing.
+
+    def get_dispatch_table(self) -> Dict[str, event_handler_t]:
+        """
+        Returns:
+            Dict[str, event_handler_t]: A copy of the mapping from event codes to handlers taking the event state and timestamp.
+        """
+        return dict(self.__handlers)
+
+    def set_metrics(self, metrics: Optional[PipelineMetrics]) -> None:
+        """
+        Measures the decoding of every batch and the application of every event, or stops measuring. The dispatch
+        tables are swapped for instrumented ones, so decoding is not slowed down while metrics are disabled.
+
+        Args:
+            metrics (Optional[PipelineMetrics]): The metrics to record into, or None to stop measuring.
+        """
+        self.__metrics = metrics
+        if metrics is None:
+            self.__dispatch_table = self.__handlers
+        else:
+            self.__dispatch_table = {code: metrics._instrument_handler(code, handler) for code, handler in self.__handlers.items()}
+        self.__raw_dispatch_table = {event_keys[code]: handler for code, handler in self.__dispatch_table.items()}
+
+    def get_state_setters(self) -> List[event_handler_t]:
+        """
+        Gets handlers that set a value of the state store through the control it belongs to, so button callbacks and
+        waiters fire as for device events, e.g. when a state is loaded or reset.
+
+        Returns:
+            List[event_handler_t]: The handlers, indexed like the state store of the controls, taking the value and timestamp.
+        """
+        return list(self.__state_setters)
+
+    def set_axis_coalescing(self, coalesce_axes: bool) -> None:
+        """
+        Enables or disables axis coalescing. When enabled, each batch of events applies only the last value of each
+        axis, while button and hat transitions are still applied in order so no press or release is lost.
+
+        Args:
+            coalesce_axes (bool): True to coalesce axis events, False to apply every axis event.
+        """
+        self.__coalesce_axes = coalesce_axes
+
+    def get_coalesced_event_count(self) -> int:
+        """
+        Returns:
+            int: The number of axis events that were skipped by coalescing since the decoder was created.
+        """
+        return self.__coalesced_event_count
+
+    def decode(self, events) -> None:
+        """
+        Routes a batch of decoded events, with code, state and timestamp attributes, to their controls.
+
+        Args:
+            events: The input events to apply.
+        """
+        if self.__metrics is None:
+            self.__decode(events)
+        else:
+            self.__metrics._measure_decode(self.__decode, events)
+
+    def decode_raw(self, events) -> None:
+        """
+        Routes a batch of undecoded evdev events to their controls.
+
+        Args:
+            events: The (seconds, microseconds, type, code, value) tuples to apply.
+        """
+        if self.__metrics is None:
+            self.__decode_raw(events)
+        else:
+            self.__metrics._measure_decode(self.__decode_raw, events)
+
+    def __decode(self, events) -> None:
+        """
+        Private method to route a batch of decoded events to their controls.
+
+        Args:
+            events: The input events to apply.
+        """
+        dispatch = self.__dispatch_table
+        if self.__coalesce_axes:
+            # Axis values are collected and applied after the other events of the batch, which are applied in order
+            axis_codes = self.__axis_codes
+            latest = {}
+            axis_event_count = 0
+            for event in events:
+                code = event.code
+                if code in axis_codes:
+                    latest[code] = (event.state, event.timestamp)
+                    axis_event_count += 1
+                else:
+                    handler = dispatch.get(code)
+                    if handler is not None:
+                        handler(event.state, event.timestamp)
+            self.__apply_coalesced_axes(latest, axis_event_count, dispatch)
+        else:
+            for event in events:
+                handler = dispatch.get(event.code)
+                if handler is not None:
+                    handler(event.state, event.timestamp)
+
+    def __decode_raw(self, events) -> None:
+        """
+        Private method to route a batch of undecoded evdev events to their controls.
+
+        Args:
+            events: The (seconds, microseconds, type, code, value) tuples to apply.
+        """
+        dispatch = self.__raw_dispatch_table
+        if self.__coalesce_axes:
+            # Axis values are collected and applied after the other events of the batch, which are applied in order
+            axis_keys = self.__raw_axis_keys
+            latest = {}
+            axis_event_count = 0
+            for seconds, microseconds, ev_type, code, value in events:
+                key = ev_type << 16 | code
+                if key in axis_keys:
+                    latest[key] = (value, seconds + microseconds / 1000000)
+                    axis_event_count += 1
+                else:
+                    handler = dispatch.get(key)
+                    if handler is not None:
+                        handler(value, seconds + microseconds / 1000000)
+            self.__apply_coalesced_axes(latest, axis_event_count, dispatch)
+        else:
+            for seconds, microseconds, ev_type, code, value in events:
+                handler = dispatch.get(ev_type << 16 | code)
+                if handler is not None:
+                    handler(value, seconds + microseconds / 1000000)
+
+    def __apply_coalesced_axes(self, latest: dict, axis_event_count: int, dispatch: dict) -> None:
+        """
+        Private method to apply the final axis values of a coalesced batch and account for the skipped events.
+
+        Args:
+            latest (dict): The last value and its event timestamp of each axis in the batch, keyed like the dispatch table.
+            axis_event_count (int): The number of axis events in the batch.
+            dispatch (dict): The dispatch table for the keys.
+        """
+        for key, (value, timestamp) in latest.items():
+            dispatch[key](value, timestamp)
+        self.__coalesced_event_count += axis_event_count - len(latest)
+
+
+def _compile_dispatch_table(profile: DeviceProfile, controls: Mapping[str, Any]) -> Dict[str, event_handler_t]:
+    """
+    Binds every event code of a profile to a handler of the control it drives.
+
+    Args:
+        profile (DeviceProfile): The profile describing the event codes of the device.
+        controls (Mapping[str, Any]): The controls keyed by the names of their profile entries.
+
+    Returns:
+        Dict[str, event_handler_t]: A mapping from an event code to a handler that takes the event state and timestamp.
+    """
+    dispatch: Dict[str, event_handler_t] = {}
+    for button in profile.buttons:
+        dispatch[button.code] = _button_handler(controls[button.name])
+    for hat in profile.hats:
+        pad = controls[hat.name]
+        dispatch[hat.y_code] = _hat_handler(pad.up, pad.down)
+        dispatch[hat.x_code] = _hat_handler(pad.left, pad.right)
+    for stick_spec in profile.sticks:
+        stick = controls[stick_spec.name]
+        dispatch[stick_spec.x_code] = stick._set_x
+        dispatch[stick_spec.y_code] = stick._set_y
+        if stick_spec.button_code is not None:
+            dispatch[stick_spec.button_code] = _button_handler(stick)
+    for axis in profile.axes:
+        dispatch[axis.code] = controls[axis.name]._set_y
+    return dispatch
+
+
+def _compile_state_setters(profile: DeviceProfile, controls: Mapping[str, Any]) -> List[event_handler_t]:
+    """
+    Maps every index of the state store of the controls of a profile to a handler that sets the value at that index.
+
+    Args:
+        profile (DeviceProfile): The profile describing the controls.
+        controls (Mapping[str, Any]): The controls keyed by the names of their profile entries, sharing one StateStore.
+
+    Returns:
+        List[event_handler_t]: The handlers, indexed like the state store, taking the value and timestamp.
+    """
+    setters: Dict[int, event_handler_t] = {}
+    buttons = [controls[button.name] for button in profile.buttons]
+    for hat in profile.hats:
+        pad = controls[hat.name]
+        buttons += [pad.up, pad.down, pad.left, pad.right]
+    buttons += [controls[stick.name] for stick in profile.sticks if stick.button_code is not None]
+    for button in buttons:
+        setters[button._get_state_index()] = _button_handler(button)
+    for stick_spec in profile.sticks:
+        stick = controls[stick_spec.name]
+        setters[stick._get_x_index()] = stick._set_x
+        setters[stick._get_y_index()] = stick._set_y
+    for axis_spec in profile.axes:
+        axis = controls[axis_spec.name]
+        setters[axis._get_y_index()] = axis._set_y
+    return [setters[index] for index in range(len(setters))]
+
+
+def _button_handler(button: Button) -> event_handler_t:
+    """
+    Creates an event handler that sets the state of a button from a key event state.
+
+    Args:
+        button (Button): The button driven by the event.
+
+    Returns:
+        event_handler_t: The handler for the button event code.
+    """
+    set_state = button._set_state
+    return lambda state, timestamp: set_state(state != 0, timestamp)  # Keys report 2 on autorepeat, which keeps them pressed
+
+
+def _hat_handler(negative: Button, positive: Button) -> event_handler_t:
+    """
+    Creates an event handler that sets the states of two opposite buttons from a hat axis event state.
+
+    Args:
+        negative (Button): The button pressed when the hat axis reports -1.
+        positive (Button): The button pressed when the hat axis reports 1.
+
+    Returns:
+        event_handler_t: The handler for the hat axis event code.
+    """
+    def handler(state: int, timestamp: Optional[float]) -> None:
+        negative._set_state(state == -1, timestamp)
+        positive._set_state(state == 1, timestamp)
+    return handler
+
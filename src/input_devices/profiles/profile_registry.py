@@ -0,0 +1,90 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Tuple
+from .device_profile import DeviceProfile, parse_profile
+from .builtin_profiles import xbox_gen4_profile, dualshock4_profile, dualsense_profile, generic_joystick_profile, keyboard_profile
+
+__all__ = ['register_profile', 'load_profile', 'load_profile_file', 'profile_names']
+
+_definitions: Dict[str, Mapping[str, Any]] = {}  # Registered profile definitions by name, in registration order.
+
+
+def register_profile(name: str, definition: Mapping[str, Any]) -> None:
+    """
+    Registers a declarative profile definition, see parse_profile for its format. The definition is parsed when
+    the profile is first loaded.
+
+    Args:
+        name (str): The name of the profile, replacing any profile registered under the same name.
+        definition (Mapping[str, Any]): The profile definition.
+    """
+    _definitions[name] = definition
+    load_profile.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def load_profile(name: str) -> DeviceProfile:
+    """
+    Loads a registered profile. Profiles are parsed once and cached, so controllers created later share the result.
+
+    Args:
+        name (str): The name of the profile, e.g. "xbox_gen4", "dualshock4", "dualsense", "generic_joystick" or "keyboard".
+
+    Returns:
+        DeviceProfile: The parsed profile.
+
+    Raises:
+        KeyError: If no profile is registered under the name.
+        ValueError: If the registered definition is invalid.
+    """
+    try:
+        definition = _definitions[name]
+    except KeyError:
+        raise KeyError(f"No device profile named {name!r} is registered, available profiles: {', '.join(_definitions)}.") from None
+    return parse_profile(definition, name)
+
+
+def load_profile_file(path: str) -> DeviceProfile:
+    """
+    Loads a profile from a JSON file, see parse_profile for its format. The parsed profile is cached until the
+    file changes.
+
+    Args:
+        path (str): The path of the JSON file.
+
+    Returns:
+        DeviceProfile: The parsed profile.
+    """
+    path = os.path.realpath(path)
+    status = os.stat(path)
+    return _load_profile_file(path, (status.st_mtime_ns, status.st_size))
+
+
+@lru_cache(maxsize=32)
+def _load_profile_file(path: str, version: Tuple[int, int]) -> DeviceProfile:
+    """
+    Parses a profile file, cached by its path and version.
+
+    Args:
+        path (str): The resolved path of the JSON file.
+        version (Tuple[int, int]): The modification time and size of the file, invalidating the cache when it changes.
+
+    Returns:
+        DeviceProfile: The parsed profile.
+    """
+    import json  # Only profile files need the json module
+    with open(path, "r", encoding="utf-8") as file:
+        definition = json.load(file)
+    return parse_profile(definition, definition.get("name") or os.path.splitext(os.path.basename(path))[0])
+
+
+def profile_names() -> List[str]:
+    """
+    Returns:
+        List[str]: The names of all registered profiles.
+    """
+    return list(_definitions)
+
+
+for _definition in (xbox_gen4_profile, dualshock4_profile, dualsense_profile, generic_joystick_profile, keyboard_profile):
+    register_profile(_definition["name"], _definition)
@@ -0,0 +1,620 @@
+import re
+from functools import lru_cache
+from threading import Thread
+from time import perf_counter, perf_counter_ns
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, Union
+from ..shared import Button, DirectionalPad, CartesianAxisInput, VerticalAxisInput, AxisTrigger, AsyncEventReader
+from ..shared import Calibration, StickCalibration, StateStore, CallbackDispatcher, QueueDispatcher, ControlHistory
+from ..shared.axis_change_subscription import AxisChangeSubscription
+from ..recording import EventRecorder
+from ..backends import get_backend
+from ..connection import ConnectionManager
+from ..instrumentation import PipelineMetrics
+from ..utils.type_hints import number_t, range_t
+from .device_profile import DeviceProfile
+from .profile_decoder import ProfileDecoder
+from .profile_registry import load_profile
+
+__all__ = ['ProfiledController']
+
+
+class ProfiledController:
+    """
+    A controller whose controls and event decoding are built from a DeviceProfile, e.g. a DualShock 4, a DualSense,
+    a generic joystick or a keyboard. The profile is compiled into a ProfileDecoder and prebuilt calibrations when
+    the controller is created, so decoding an event is a single dictionary lookup and call. Device specific
+    controllers, such as XboxControllerGen4, subclass it to expose their controls as attributes.
+    """
+
+    default_backend = "inputs"  # Name of the registered backend used to find a gamepad to connect to.
+    snapshot_type: Optional[Type[NamedTuple]] = None  # Snapshot type of subclasses, None for one generated from the profile.
+
+    def __init__(self, profile: Union[DeviceProfile, str], gamepad=None, coalesce_axes: bool = False,
+                 backend: str = default_backend) -> None:
+        """
+        Initializes a ProfiledController.
+
+        Args:
+            profile (Union[DeviceProfile, str]): The device profile, or the name of a registered one.
+            gamepad: The device to read events from, e.g. an EvdevDevice, an EventReplayer or a device of the 'inputs'
+                     library, or None to connect later.
+            coalesce_axes (bool): If True, only the last value of each axis in a batch of events is applied.
+            backend (str): The name of the registered backend used to find a gamepad when waiting for a connection,
+                           e.g. "inputs", "evdev" or "simulated". It is only loaded when the controller connects.
+        """
+        if isinstance(profile, str):
+            profile = load_profile(profile)
+        self.__profile = profile
+        self.__gamepad = gamepad
+        self.__backend = backend
+        self.__state_store = StateStore()  # Single buffer holding the state of every control
+        self.__batched_sticks: Tuple[CartesianAxisInput, ...] = ()  # Sticks with position callbacks, reported once per batch.
+        self.__held_changes: List[AxisChangeSubscription] = []  # Axis subscriptions holding a change back until their rate limit allows it.
+        self.__controls = self.__build_controls()
+        self.__decoder = ProfileDecoder(profile, self.__controls, coalesce_axes)
+        self.__state_setters = self.__decoder.get_state_setters()
+        self.__snapshot_type = self.snapshot_type if self.snapshot_type is not None else _snapshot_type(profile)
+        self.__snapshot_readers = self.__build_snapshot_readers()
+        self.__reader_thread: Optional[Thread] = None  # Background thread draining the gamepad in threaded mode.
+        self.__reader_running = False  # Flag telling the reader thread to keep reading.
+        self.__reader_error: Optional[BaseException] = None  # Error that terminated the reader thread, if any.
+        self.__callback_dispatcher: Optional[CallbackDispatcher] = None  # Dispatcher of all button callbacks.
+        self.__reader_callback_queue: Optional[QueueDispatcher] = None  # Queue of button callbacks drained by the consumer.
+        self.__recorder: Optional[EventRecorder] = None  # Recorder receiving every processed event.
+        self.__metrics: Optional[PipelineMetrics] = None  # Metrics measuring the input pipeline, None unless enabled.
+        self.__connection_manager: Optional[ConnectionManager] = None  # Manager reused by halt_until_connected, created on first use.
+        self.__snapshot = self.__take_snapshot()
+
+    def get_profile(self) -> DeviceProfile:
+        """
+        Returns:
+            DeviceProfile: The profile the controller was built from.
+        """
+        return self.__profile
+
+    def get_control(self, name: str) -> Any:
+        """
+        Gets a control by the name of its profile entry.
+
+        Args:
+            name (str): The name of the control, e.g. "cross", "directional_pad" or "left_stick".
+
+        Returns:
+            The Button, DirectionalPad, CartesianAxisInput, AxisTrigger or VerticalAxisInput of the entry.
+
+        Raises:
+            KeyError: If the profile has no control of that name.
+        """
+        try:
+            return self.__controls[name]
+        except KeyError:
+            raise KeyError(f"The device profile {self.__profile.name!r} has no control named {name!r}.") from None
+
+    def get_buttons(self) -> Dict[str, Button]:
+        """
+        Gets every button of the controller, including the directional pad and stick buttons.
+
+        Returns:
+            Dict[str, Button]: The buttons keyed by the names of their snapshot fields.
+        """
+        buttons = {spec.name: self.__controls[spec.name] for spec in self.__profile.buttons}
+        for spec in self.__profile.hats:
+            pad = self.__controls[spec.name]
+            buttons.update({spec.name + "_up": pad.up, spec.name + "_down": pad.down,
+                            spec.name + "_left": pad.left, spec.name + "_right": pad.right})
+        for spec in self.__profile.sticks:
+            if spec.button_code is not None:
+                buttons[spec.name + "_pressed"] = self.__controls[spec.name]
+        return buttons
+
+    def get_state_store(self) -> StateStore:
+        """
+        Gets the store holding the state of every control, e.g. to copy, compare or serialize the whole controller
+        state in a single buffer operation.
+
+        Returns:
+            StateStore: The state store of the controller.
+        """
+        return self.__state_store
+
+    def get_gamepad(self):
+        """
+        Returns:
+            The device the controller reads events from, or None if it is not connected.
+        """
+        return self.__gamepad
+
+    def set_gamepad(self, gamepad) -> None:
+        """
+        Connects the controller to another device, or disconnects it. The controls and their callbacks are kept.
+
+        Args:
+            gamepad: The device to read events from, or None to disconnect the controller.
+        """
+        self.__gamepad = gamepad
+
+    def get_backend(self) -> str:
+        """
+        Returns:
+            str: The name of the registered backend used to find a gamepad when waiting for a connection.
+        """
+        return self.__backend
+
+    def reset_state(self) -> None:
+        """
+        Returns every control to rest, as after a disconnect: pressed buttons are released, calling their release
+        callbacks, and axes are set to 0.
+        """
+        self._load_state((index, 0.0) for index in range(len(self.__state_store)))
+
+    def enable_history(self, capacity: int = ControlHistory.default_capacity) -> Dict[str, ControlHistory]:
+        """
+        Attaches a new history to every button and axis, recording each accepted change with the time of its event,
+        e.g. to query the peak of a trigger or the mean of a stick axis over the last few hundred milliseconds.
+        Recording adds a constant cost to each event and nothing to controls without a history.
+
+        Args:
+            capacity (int): The maximum number of samples kept per control.
+
+        Returns:
+            Dict[str, ControlHistory]: The histories keyed by the names of the snapshot fields.
+        """
+        histories = {}
+        for name, button in self.get_buttons().items():
+            histories[name] = ControlHistory(capacity)
+            button.set_history(histories[name])
+        for spec in self.__profile.sticks:
+            stick = self.__controls[spec.name]
+            histories[spec.name + "_x"] = ControlHistory(capacity)
+            histories[spec.name + "_y"] = ControlHistory(capacity)
+            stick.set_history_x(histories[spec.name + "_x"])
+            stick.set_history_y(histories[spec.name + "_y"])
+        for spec in self.__profile.axes:
+            histories[spec.name] = ControlHistory(capacity)
+            self.__controls[spec.name].set_history_y(histories[spec.name])
+        return histories
+
+    def halt_until_connected(self, timeout: Optional[float] = None) -> bool:
+        """
+        Halts the program execution until a gamepad is connected. Waits for changes of the device directory
+        instead of polling, so waiting costs no CPU time. The ConnectionManager and its directory watch are created
+        on the first call and reused by later ones.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            bool: True if the controller is connected, False if the timeout expired.
+        """
+        return self.__get_connection_manager().wait_connected(timeout)
+
+    async def halt_until_connected_async(self) -> None:
+        """
+        Suspends the calling coroutine until a gamepad is connected, without blocking the event loop. The device
+        directory is watched through the event loop, so the backend is only scanned when a device node changed. The
+        ConnectionManager is shared with halt_until_connected.
+        """
+        await self.__get_connection_manager().wait_connected_async()
+
+    def update(self) -> None:
+        """
+        Updates the state of the controls by reading and processing all recent input events of the device, and
+        publishes a new snapshot. Each event is routed through the dispatch table, so only its control is touched.
+        """
+        gamepad = self.__gamepad
+        read_raw = getattr(gamepad, "read_raw", None)
+        if read_raw is not None:
+            # Undecoded events straight from the device buffer
+            self.__process_raw(read_raw() if self.__metrics is None else self.__measure_read(read_raw))
+        else:
+            self.__process(gamepad.read() if self.__metrics is None else self.__measure_read(gamepad.read))
+
+    def set_axis_coalescing(self, coalesce_axes: bool) -> None:
+        """
+        Enables or disables axis coalescing. When enabled, each batch of events applies only the last value of each
+        axis, while button and hat transitions are still applied in order so no press or release is lost.
+
+        Args:
+            coalesce_axes (bool): True to coalesce axis events, False to apply every axis event.
+        """
+        self.__decoder.set_axis_coalescing(coalesce_axes)
+
+    def get_coalesced_event_count(self) -> int:
+        """
+        Returns:
+            int: The number of axis events that were skipped by coalescing since the controller was created.
+        """
+        return self.__decoder.get_coalesced_event_count()
+
+    def set_recorder(self, recorder: Optional[EventRecorder]) -> None:
+        """
+        Records every event processed by the controller from now on.
+
+        Args:
+            recorder (Optional[EventRecorder]): The recorder to write the events to, or None to stop recording.
+        """
+        self.__recorder = recorder
+
+    def set_metrics(self, metrics: Optional[PipelineMetrics]) -> None:
+        """
+        Measures the input pipeline of the controller from now on: backend reads, decoding, event application and
+        callbacks, broken down by callback, as well as events by code and debounce rejections by button.
+        The same metrics may be shared by several controllers.
+
+        Args:
+            metrics (Optional[PipelineMetrics]): The metrics to record into, or None to stop measuring.
+        """
+        self.__metrics = metrics
+        self.__decoder.set_metrics(metrics)
+        buttons = self.get_buttons()
+        for button in buttons.values():
+            button._set_metrics(metrics)
+        if metrics is not None:
+            metrics._name_buttons(buttons)
+
+    async def events(self) -> AsyncIterator:
+        """
+        Asynchronously reads and processes input events, yielding each event after the controller state was updated.
+        Reads are registered with the running event loop, so many controllers can be served by one loop.
+
+        Yields:
+            The input events read from the gamepad.
+        """
+        reader = AsyncEventReader(self.__gamepad)
+        try:
+            while True:
+                events = await reader.read()
+                self.__process(events)
+                for event in events:
+                    yield event
+        finally:
+            reader.close()
+
+    async def run(self) -> None:
+        """
+        Processes input events on the running event loop until cancelled, driving callbacks and button waiters.
+        """
+        async for _ in self.events():
+            pass
+
+    def _load_state(self, values: Iterable[Tuple[int, float]], timestamp: Optional[float] = None) -> None:
+        """
+        Internal method to set values of the state store through the controls they belong to, so button callbacks and
+        waiters fire as for device events, and publish a new snapshot.
+
+        Args:
+            values (Iterable[Tuple[int, float]]): The (store index, value) pairs to apply.
+            timestamp (Optional[float]): The time at which the values were read, used to debounce the buttons.
+        """
+        setters = self.__state_setters
+        sticks = self.__batched_sticks
+        for stick in sticks:
+            stick._begin_batch()
+        try:
+            for index, value in values:
+                setters[index](value, timestamp)
+        finally:
+            for stick in sticks:
+                stick._end_batch()
+        self.__snapshot = self.__take_snapshot()
+
+    def snapshot(self) -> NamedTuple:
+        """
+        Gets the most recently published state of all controls. The snapshot is immutable and is replaced as a whole
+        after every processed batch of events, so reading it never blocks and needs no locking.
+
+        Returns:
+            NamedTuple: The latest state, with a timestamp followed by the fields of DeviceProfile.field_names.
+
+        Raises:
+            Exception: The error that terminated the reader thread, if it stopped due to one.
+        """
+        if self.__reader_error is not None:
+            raise self.__reader_error
+        return self.__snapshot
+
+    def start_reader(self, queue_callbacks: bool = False) -> None:
+        """
+        Starts a background thread that continuously drains the gamepad and publishes state snapshots, so that
+        the main loop never blocks on input. While the reader is running, update() must not be called directly.
+
+        Args:
+            queue_callbacks (bool): If True, button callbacks are put on a queue drained by process_callbacks()
+                                    on the consumer thread. If False, they are handed to the callback dispatcher
+                                    of the controller, or called on the reader thread if there is none.
+        """
+        if self.__reader_thread is not None:
+            raise RuntimeError("The reader thread is already running.")
+
+        if queue_callbacks:
+            self.__reader_callback_queue = QueueDispatcher()
+            self.__apply_callback_dispatcher(self.__reader_callback_queue)
+
+        self.__reader_error = None
+        self.__reader_running = True
+        self.__reader_thread = Thread(target=self.__read_loop, name=f"{type(self).__name__} reader", daemon=True)
+        self.__reader_thread.start()
+
+    def stop_reader(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the background reader thread. The thread exits after its current read returns.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait for the thread to exit, or None to wait indefinitely.
+        """
+        if self.__reader_thread is None:
+            return
+        self.__reader_running = False
+        self.__reader_thread.join(timeout)
+        self.__reader_thread = None
+        if self.__reader_callback_queue is not None:
+            self.__reader_callback_queue = None
+            self.__apply_callback_dispatcher(self.__callback_dispatcher)
+
+    def process_callbacks(self) -> int:
+        """
+        Calls all button callbacks queued by the reader thread when it was started with queue_callbacks=True.
+
+        Returns:
+            int: The number of callbacks that were called.
+        """
+        if self.__reader_callback_queue is None:
+            return 0
+        return self.__reader_callback_queue.process()
+
+    def set_callback_dispatcher(self, callback_dispatcher: Optional[CallbackDispatcher]) -> None:
+        """
+        Sets the policy deciding where and when the callbacks of all buttons run, e.g. on a thread pool or an asyncio
+        loop, so that slow callbacks do not delay input processing.
+
+        Args:
+            callback_dispatcher (Optional[CallbackDispatcher]): The dispatcher to hand triggered callbacks to,
+                                                                or None to call them directly.
+        """
+        self.__callback_dispatcher = callback_dispatcher
+        if self.__reader_callback_queue is None:
+            self.__apply_callback_dispatcher(callback_dispatcher)
+
+    def __apply_callback_dispatcher(self, callback_dispatcher: Optional[CallbackDispatcher]) -> None:
+        """
+        Private method to set the callback dispatcher of every button.
+
+        Args:
+            callback_dispatcher (Optional[CallbackDispatcher]): The dispatcher to set.
+        """
+        for button in self.get_buttons().values():
+            button.set_callback_dispatcher(callback_dispatcher)
+
+    def __read_loop(self) -> None:
+        """
+        Private method run by the reader thread, processing events until the reader is stopped or reading fails.
+        """
+        try:
+            while self.__reader_running:
+                self.update()
+        except BaseException as error:
+            self.__reader_error = error
+            self.__reader_running = False
+
+    def __measure_read(self, read: Callable[[], Any]):
+        """
+        Private method to read a batch of events from the backend, recording the duration of the read.
+
+        Args:
+            read (Callable[[], Any]): The read method of the gamepad.
+
+        Returns:
+            The batch of events.
+        """
+        start = perf_counter_ns()
+        events = read()
+        self.__metrics._record_read(perf_counter_ns() - start)
+        return events
+
+    def __process(self, events) -> None:
+        """
+        Private method to route a batch of input events to their controls and publish a new snapshot.
+
+        Args:
+            events: The input events to process.
+        """
+        if self.__recorder is not None:
+            self.__recorder.write(events)
+        if self.__batched_sticks:
+            self.__apply_batch(self.__decoder.decode, events)
+        else:
+            self.__decoder.decode(events)
+        if self.__held_changes:
+            self.__flush_held_changes()
+        self.__snapshot = self.__take_snapshot()  # Publish by swapping in a new immutable snapshot
+
+    def __process_raw(self, events) -> None:
+        """
+        Private method to route a batch of undecoded evdev events to their controls and publish a new snapshot.
+
+        Args:
+            events: The (seconds, microseconds, type, code, value) tuples to process.
+        """
+        if self.__recorder is not None:
+            events = list(events)
+            self.__recorder.write_raw(events)
+        if self.__batched_sticks:
+            self.__apply_batch(self.__decoder.decode_raw, events)
+        else:
+            self.__decoder.decode_raw(events)
+        if self.__held_changes:
+            self.__flush_held_changes()
+        self.__snapshot = self.__take_snapshot()  # Publish by swapping in a new immutable snapshot
+
+    def __apply_batch(self, decode: Callable[[Any], None], events) -> None:
+        """
+        Private method to decode a batch of events while the sticks with position callbacks hold their changes, so
+        each of them reports its position once, after both of its axes were applied.
+
+        Args:
+            decode (Callable[[Any], None]): The decoder method applying the events.
+            events: The events to apply.
+        """
+        sticks = self.__batched_sticks
+        for stick in sticks:
+            stick._begin_batch()
+        try:
+            decode(events)
+        finally:
+            for stick in sticks:
+                stick._end_batch()
+
+    def __get_connection_manager(self) -> ConnectionManager:
+        """
+        Private method to get the ConnectionManager used to wait for a gamepad, creating it on first use.
+
+        Returns:
+            ConnectionManager: The manager of the controller, whose directory watch is kept between waits.
+        """
+        if self.__connection_manager is None:
+            self.__connection_manager = ConnectionManager(self)
+        return self.__connection_manager
+
+    def __flush_held_changes(self) -> None:
+        """
+        Private method to report the axis changes held back by rate limits whose interval is over, so the final value
+        of a movement is reported even when no further event of the axis arrives.
+        """
+        now = perf_counter()
+        held_changes, self.__held_changes = self.__held_changes, []
+        for subscription in held_changes:
+            if subscription.flush(now):
+                self.__held_changes.append(subscription)
+
+    def __hold_change(self, subscription: AxisChangeSubscription) -> None:
+        """
+        Private method to flush an axis subscription after the next batches until its held change was reported.
+
+        Args:
+            subscription (AxisChangeSubscription): The subscription whose rate limit held a change back.
+        """
+        self.__held_changes.append(subscription)
+
+    def __add_batched_stick(self, stick: CartesianAxisInput) -> None:
+        """
+        Private method to bracket the batches of events of a stick that got its first position callback.
+
+        Args:
+            stick (CartesianAxisInput): The stick to report once per batch.
+        """
+        self.__batched_sticks += (stick,)
+
+    def __build_controls(self) -> Dict[str, Any]:
+        """
+        Private method to create the controls of the profile in the state store, with their prebuilt calibrations.
+
+        Returns:
+            Dict[str, Any]: The controls keyed by the names of their profile entries.
+        """
+        store = self.__state_store
+        controls: Dict[str, Any] = {}
+        for spec in self.__profile.buttons:
+            controls[spec.name] = Button(spec.debounce_time, state_store=store)
+        for spec in self.__profile.hats:
+            pad = controls[spec.name] = DirectionalPad(store)
+            for button in (pad.up, pad.down, pad.left, pad.right):
+                button.set_debounce_time(spec.debounce_time)
+        for spec in self.__profile.sticks:
+            if spec.button_code is not None:
+                stick = AxisTrigger(spec.horizontal_value_range, spec.vertical_value_range, spec.horizontal_axis_inverted,
+                                    spec.vertical_axis_inverted, spec.debounce_time, state_store=store)
+            else:
+                stick = CartesianAxisInput(spec.horizontal_value_range, spec.vertical_value_range, spec.horizontal_axis_inverted,
+                                           spec.vertical_axis_inverted, state_store=store)
+            if spec.deadzone is not None:
+                stick.set_calibration(StickCalibration(_read_range(spec.horizontal_value_range, spec.horizontal_axis_inverted),
+                                                       _read_range(spec.vertical_value_range, spec.vertical_axis_inverted),
+                                                       spec.deadzone, spec.deadzone_mode))
+            stick._set_batch_hook(self.__add_batched_stick)
+            stick._set_held_change_hook(self.__hold_change)
+            controls[spec.name] = stick
+        for spec in self.__profile.axes:
+            axis = controls[spec.name] = VerticalAxisInput(spec.value_range, spec.axis_inverted, state_store=store)
+            if spec.blindspot_range is not None:
+                axis.set_calibration_y(Calibration(_read_range(spec.value_range, spec.axis_inverted),
+                                                   _read_range(spec.blindspot_range, spec.axis_inverted),
+                                                   _read_value(spec.axis_zero, spec.axis_inverted), *spec.calibrated_range))
+            axis._set_held_change_hook(self.__hold_change)
+        return controls
+
+    def __build_snapshot_readers(self) -> List[Callable[[], Any]]:
+        """
+        Private method to list the getters of the snapshot fields, in snapshot order.
+
+        Returns:
+            List[Callable[[], Any]]: The getters, called without arguments.
+        """
+        controls = self.__controls
+        readers: List[Callable[[], Any]] = [controls[spec.name].pressed for spec in self.__profile.buttons]
+        for spec in self.__profile.hats:
+            pad = controls[spec.name]
+            readers += [pad.up.pressed, pad.down.pressed, pad.left.pressed, pad.right.pressed]
+        for spec in self.__profile.sticks:
+            stick = controls[spec.name]
+            if spec.button_code is not None:
+                readers.append(stick.pressed)
+            readers += [stick.get_x, stick.get_y]
+        readers += [controls[spec.name].get_y for spec in self.__profile.axes]
+        return readers
+
+    def __take_snapshot(self) -> NamedTuple:
+        """
+        Private method to capture the current state of all controls.
+
+        Returns:
+            NamedTuple: An immutable copy of the controller state.
+        """
+        return self.__snapshot_type(perf_counter(), *[read() for read in self.__snapshot_readers])
+
+
+def _read_range(value_range: range_t, inverted: bool) -> range_t:
+    """
+    Gets the range of the values read from an axis, which are negated when the axis is inverted.
+
+    Args:
+        value_range (range_t): The raw value range.
+        inverted (bool): Whether the axis is inverted.
+
+    Returns:
+        range_t: The range of the values returned by the getters of the axis.
+    """
+    return (-value_range[1], -value_range[0]) if inverted else value_range
+
+
+def _read_value(value: Optional[number_t], inverted: bool) -> Optional[number_t]:
+    """
+    Gets a raw value as read from an axis, which is negated when the axis is inverted.
+
+    Args:
+        value (Optional[number_t]): The raw value, or None.
+        inverted (bool): Whether the axis is inverted.
+
+    Returns:
+        Optional[number_t]: The value returned by the getters of the axis, or None.
+    """
+    return -value if inverted and value is not None else value
+
+
+@lru_cache(maxsize=None)
+def _snapshot_type(profile: DeviceProfile) -> Type[NamedTuple]:
+    """
+    Creates the snapshot type of a profile, once per profile.
+
+    Args:
+        profile (DeviceProfile): The device profile.
+
+    Returns:
+        Type[NamedTuple]: A NamedTuple with a timestamp, a bool per button and a number per axis.
+    """
+    axis_fields = {stick.name + suffix for stick in profile.sticks for suffix in ("_x", "_y")}
+    axis_fields.update(axis.name for axis in profile.axes)
+    fields = [("timestamp", float)] + [(name, number_t if name in axis_fields else bool) for name in profile.field_names()]
+    type_name = "".join(part[:1].upper() + part[1:] for part in re.split(r"\W|_", profile.name)) + "Snapshot"
+    if not type_name.isidentifier():
+        type_name = "Profile" + type_name
+    return NamedTuple(type_name, fields)
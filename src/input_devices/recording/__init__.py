@@ -0,0 +1,2 @@
+from .event_recorder import EventRecorder
+from .event_replayer import EventReplayer
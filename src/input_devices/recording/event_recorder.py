@@ -0,0 +1,68 @@
+from typing import Iterable
+from ..evdev import event_keys
+from .recording_format import header_struct, magic, record_struct, version
+
+class EventRecorder:
+    """
+    Writes input events to a binary recording file, which can be replayed with EventReplayer.
+    Attach it to a controller with set_recorder() to record every event the controller processes.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Creates a new recording file, replacing an existing one.
+
+        Args:
+            path (str): The path of the recording file.
+        """
+        self.__file = open(path, 'wb')
+        self.__file.write(header_struct.pack(magic, version, record_struct.size))
+        self.__count = 0
+
+    def write_raw(self, events: Iterable) -> None:
+        """
+        Records undecoded events.
+
+        Args:
+            events (Iterable): The (seconds, microseconds, type, code, value) tuples to record.
+        """
+        pack = record_struct.pack
+        records = [pack(*event) for event in events]
+        self.__file.write(b"".join(records))
+        self.__count += len(records)
+
+    def write(self, events: Iterable) -> None:
+        """
+        Records decoded events, such as the ones of the 'inputs' library. Events with unknown codes are skipped.
+
+        Args:
+            events (Iterable): The events to record, with timestamp, code and state attributes.
+        """
+        raw_events = []
+        for event in events:
+            key = event_keys.get(event.code)
+            if key is None:
+                continue
+            seconds = int(event.timestamp)
+            microseconds = round((event.timestamp - seconds) * 1000000)
+            raw_events.append((seconds, microseconds, key >> 16, key & 0xffff, event.state))
+        self.write_raw(raw_events)
+
+    def count(self) -> int:
+        """
+        Returns:
+            int: The number of events recorded so far.
+        """
+        return self.__count
+
+    def close(self) -> None:
+        """
+        Flushes and closes the recording file.
+        """
+        self.__file.close()
+
+    def __enter__(self) -> 'EventRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,120 @@
+import mmap
+from time import perf_counter, sleep
+from typing import Iterator, Optional
+from .recording_format import header_struct, magic, record_struct, version
+
+class EventReplayer:
+    """
+    Replays a recording written by EventRecorder. The file is memory-mapped, so it is never loaded into memory as a
+    whole and reading events needs no file system calls. A replayer can be passed to a controller in place of a
+    gamepad, feeding the recorded events through the same update path as a live device.
+    """
+
+    default_batch_size = 64  # Maximum number of events returned by a single read.
+
+    def __init__(self, path: str, speed: Optional[float] = None, batch_size: int = default_batch_size) -> None:
+        """
+        Opens a recording for replay.
+
+        Args:
+            path (str): The path of the recording file.
+            speed (Optional[float]): The replay speed relative to real time, e.g. 1.0 for real time or 2.0 for twice as
+                                     fast, or None to replay as fast as possible.
+            batch_size (int): The maximum number of events returned by a single read.
+        """
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__map)
+        file_magic, file_version, size = header_struct.unpack_from(self.__view) if len(self.__map) >= header_struct.size else (None, None, None)
+        if file_magic != magic or file_version != version or size != record_struct.size:
+            self.close()
+            raise ValueError(f"{path} is not a supported event recording.")
+
+        self.__speed = speed
+        self.__batch_size = batch_size
+        self.__end = header_struct.size + (len(self.__map) - header_struct.size) // size * size
+        self.__position = header_struct.size
+        self.__start_time: Optional[float] = None  # perf_counter time at which the first event was replayed.
+        self.__start_timestamp = 0.0  # Recorded time of the first event.
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of events in the recording.
+        """
+        return (self.__end - header_struct.size) // record_struct.size
+
+    def read_raw(self) -> Iterator:
+        """
+        Returns the next batch of recorded events. When replaying at a given speed, waits until the next event is due
+        and returns the events that are due by then.
+
+        Returns:
+            Iterator: An iterator over (seconds, microseconds, type, code, value) tuples.
+
+        Raises:
+            EOFError: If all events of the recording were replayed.
+        """
+        position = self.__position
+        if position >= self.__end:
+            raise EOFError("The end of the recording was reached.")
+        end = min(self.__end, position + self.__batch_size * record_struct.size)
+
+        if self.__speed is not None:
+            end = self.__wait_due(position, end)
+
+        self.__position = end
+        return record_struct.iter_unpack(self.__view[position:end])
+
+    def rewind(self) -> None:
+        """
+        Restarts the replay from the first event.
+        """
+        self.__position = header_struct.size
+        self.__start_time = None
+
+    def close(self) -> None:
+        """
+        Unmaps the recording file.
+        """
+        self.__view.release()
+        self.__map.close()
+
+    def __enter__(self) -> 'EventReplayer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __wait_due(self, position: int, end: int) -> int:
+        """
+        Private method to sleep until the event at position is due, and find the end of the events due by then.
+
+        Args:
+            position (int): The offset of the next event.
+            end (int): The offset after the last event that may be returned.
+
+        Returns:
+            int: The offset after the last due event.
+        """
+        unpack_from = record_struct.unpack_from
+        view = self.__view
+        seconds, microseconds, _, _, _ = unpack_from(view, position)
+        timestamp = seconds + microseconds / 1000000
+        if self.__start_time is None:
+            self.__start_time = perf_counter()
+            self.__start_timestamp = timestamp
+
+        due_time = self.__start_time + (timestamp - self.__start_timestamp) / self.__speed
+        delay = due_time - perf_counter()
+        if delay > 0:
+            sleep(delay)
+
+        due_timestamp = self.__start_timestamp + (perf_counter() - self.__start_time) * self.__speed
+        position += record_struct.size
+        while position < end:
+            seconds, microseconds, _, _, _ = unpack_from(view, position)
+            if seconds + microseconds / 1000000 > due_timestamp:
+                break
+            position += record_struct.size
+        return position
@@ -0,0 +1,8 @@
+from struct import Struct
+
+# A recording starts with a header (magic, format version, record size) followed by fixed-width little-endian
+# records laid out like struct input_event: seconds, microseconds, type, code, value.
+magic = b"IDRC"
+version = 1
+header_struct = Struct('<4sHH')
+record_struct = Struct('<IIHHi')
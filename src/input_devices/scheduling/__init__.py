@@ -0,0 +1,2 @@
+from .loop_statistics import LoopStatistics
+from .fixed_rate_loop import *
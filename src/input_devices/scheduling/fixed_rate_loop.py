@@ -0,0 +1,212 @@
+from time import perf_counter, sleep
+from typing import Any, Callable, List, Optional
+from ..instrumentation import LatencyHistogram
+from .loop_statistics import LoopStatistics
+
+__all__ = ['tick_handler_t', 'overrun_callback_t', 'FixedRateLoop']
+
+tick_handler_t = Callable[[float, float], None]  # Type alias for handlers receiving the frame time and the time since the previous frame.
+overrun_callback_t = Callable[[int, float], None]  # Type alias for callbacks receiving the skipped frames and the lateness in seconds.
+
+
+class FixedRateLoop:
+    """
+    Runs the update of controllers and tick handlers at a fixed rate, e.g. 250 Hz, in place of a `while True` loop.
+    Frame deadlines are laid on a fixed grid, so timing errors do not accumulate. Between frames, the loop sleeps until
+    shortly before the deadline and spins, yielding the CPU, for the rest, which gives sub-millisecond wake-up jitter
+    without keeping a core busy. A frame that runs past the next deadline is an overrun: the next frame starts at once,
+    and deadlines the loop fell behind by a whole period or more are skipped instead of being run in a burst.
+
+    Controllers are updated at the start of every frame, so their reads must not block: use non-blocking devices,
+    such as EvdevDevice instances opened with blocking=False, or a ConnectionManager, which reconnects unplugged
+    gamepads. Controllers read by a background reader (start_reader) should not be added; their snapshots can be
+    read in a tick handler instead.
+    """
+
+    default_spin_time = 0.0005  # Time in seconds before a deadline from which the loop spins instead of sleeping.
+
+    def __init__(self, rate: float, spin_time: float = default_spin_time) -> None:
+        """
+        Initializes a FixedRateLoop without controllers or handlers.
+
+        Args:
+            rate (float): The number of frames per second.
+            spin_time (float): The time in seconds before each deadline spent spinning, trading CPU time for precision.
+                               0 relies on sleep alone.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.__period = 1.0 / rate
+        self.__spin_time = spin_time
+        self.__controllers: List[Any] = []  # Objects updated at the start of every frame.
+        self.__tick_handlers: tuple = ()  # Functions called with the frame time and the time since the previous frame.
+        self.__overrun_callbacks: tuple = ()  # Functions called with the skipped frames and the lateness of an overrun.
+        self.__running = False  # Flag telling run to keep going.
+        self.__last_tick: Optional[float] = None  # Time of the previous frame.
+        self.__lateness = LatencyHistogram()  # Time between the deadline and the start of each frame, in nanoseconds.
+        self.__frame_times = LatencyHistogram()  # Time spent in each frame, in nanoseconds.
+        self.__overruns = 0  # Number of frames finished after the next deadline.
+        self.__missed_frames = 0  # Number of skipped deadlines.
+
+    def get_period(self) -> float:
+        """
+        Returns:
+            float: The time between two frames in seconds.
+        """
+        return self.__period
+
+    def add_controller(self, controller) -> 'FixedRateLoop':
+        """
+        Updates a controller at the start of every frame, before the tick handlers run. Controllers are updated in the
+        order they were added.
+
+        Args:
+            controller: Any object with an update method, e.g. an XboxControllerGen4, a ProfiledController or a
+                        ConnectionManager.
+
+        Returns:
+            FixedRateLoop: The instance of this class to allow method chaining.
+        """
+        self.__controllers.append(controller)
+        return self
+
+    def remove_controller(self, controller) -> None:
+        """
+        Stops updating a controller.
+
+        Args:
+            controller: The controller to remove.
+        """
+        self.__controllers.remove(controller)
+
+    def on_tick(self, *handlers: tick_handler_t) -> 'FixedRateLoop':
+        """
+        Registers handlers called every frame after the controllers were updated, e.g. to read controls and drive actuators.
+
+        Args:
+            handlers (tick_handler_t): A variadic number of functions taking the perf_counter time of the frame and
+                                       the time in seconds since the previous frame.
+
+        Returns:
+            FixedRateLoop: The instance of this class to allow method chaining.
+        """
+        self.__tick_handlers += handlers
+        return self
+
+    def on_overrun(self, *callbacks: overrun_callback_t) -> 'FixedRateLoop':
+        """
+        Registers callbacks called when a frame finishes after the deadline of the next frame.
+
+        Args:
+            callbacks (overrun_callback_t): A variadic number of functions taking the number of skipped frames and how
+                                            late in seconds the frame finished relative to the next deadline.
+
+        Returns:
+            FixedRateLoop: The instance of this class to allow method chaining.
+        """
+        self.__overrun_callbacks += callbacks
+        return self
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """
+        Runs a single frame immediately: updates the controllers, then calls the tick handlers.
+
+        Args:
+            now (Optional[float]): The perf_counter time of the frame, or None to use the current time.
+        """
+        start = perf_counter() if now is None else now
+        delta_time = self.__period if self.__last_tick is None else start - self.__last_tick
+        self.__last_tick = start
+        for controller in self.__controllers:
+            controller.update()
+        for handler in self.__tick_handlers:
+            handler(start, delta_time)
+        self.__frame_times.record(int((perf_counter() - start) * 1e9))
+
+    def run(self, frames: Optional[int] = None) -> None:
+        """
+        Runs frames at the target rate until stop is called, e.g. from a tick handler or another thread.
+
+        Args:
+            frames (Optional[int]): The number of frames to run before returning, or None to run until stopped.
+        """
+        period = self.__period
+        self.__running = True
+        deadline = perf_counter()
+        count = 0
+        while self.__running and (frames is None or count < frames):
+            now = self.__sleep_until(deadline)
+            self.__lateness.record(int((now - deadline) * 1e9))
+            self.tick(now)
+            count += 1
+            deadline += period
+            finished = perf_counter()
+            if finished > deadline:
+                # The next frame starts at once; deadlines a whole period or more in the past are skipped
+                lateness = finished - deadline
+                missed = int(lateness // period)
+                deadline += missed * period
+                self.__overruns += 1
+                self.__missed_frames += missed
+                for callback in self.__overrun_callbacks:
+                    callback(missed, lateness)
+        self.__running = False
+
+    def stop(self) -> None:
+        """
+        Makes run return after the current frame.
+        """
+        self.__running = False
+
+    def is_running(self) -> bool:
+        """
+        Returns:
+            bool: True while run is executing frames.
+        """
+        return self.__running
+
+    def get_statistics(self) -> LoopStatistics:
+        """
+        Returns:
+            LoopStatistics: The frame timing of the loop since it was created or its statistics were reset.
+        """
+        lateness = self.__lateness
+        frame_times = self.__frame_times
+        return LoopStatistics(
+            frame_times.get_count(),
+            self.__overruns,
+            self.__missed_frames,
+            lateness.get_sum() / lateness.get_count() / 1e9 if lateness.get_count() else 0.0,
+            (lateness.get_percentile(99) or 0) / 1e9,
+            lateness.get_max() / 1e9,
+            frame_times.get_sum() / frame_times.get_count() / 1e9 if frame_times.get_count() else 0.0,
+            frame_times.get_max() / 1e9,
+        )
+
+    def reset_statistics(self) -> None:
+        """
+        Discards the frame timing measured so far.
+        """
+        self.__lateness.reset()
+        self.__frame_times.reset()
+        self.__overruns = 0
+        self.__missed_frames = 0
+
+    def __sleep_until(self, deadline: float) -> float:
+        """
+        Private method to wait for a deadline, sleeping for most of the time and spinning for the last spin_time.
+
+        Args:
+            deadline (float): The perf_counter time to wait for.
+
+        Returns:
+            float: The perf_counter time at which the wait ended.
+        """
+        remaining = deadline - perf_counter()
+        if remaining > self.__spin_time:
+            sleep(remaining - self.__spin_time)
+        now = perf_counter()
+        while now < deadline:
+            sleep(0)  # Yields the CPU to other threads while spinning
+            now = perf_counter()
+        return now
@@ -0,0 +1,15 @@
+from typing import NamedTuple
+
+__all__ = ['LoopStatistics']
+
+
+class LoopStatistics(NamedTuple):
+    """Timing of a FixedRateLoop since it was created or its statistics were reset. Durations are in seconds."""
+    frames: int  # Number of frames run.
+    overruns: int  # Number of frames that finished after the deadline of the next frame.
+    missed_frames: int  # Number of frame deadlines skipped because the loop fell more than a period behind.
+    mean_lateness: float  # Mean time between the deadline of a frame and its start, i.e. the wake-up jitter.
+    p99_lateness: float  # 99th percentile of the lateness, estimated from histogram buckets.
+    max_lateness: float  # Largest lateness.
+    mean_frame_time: float  # Mean time spent updating controllers and running tick handlers per frame.
+    max_frame_time: float  # Largest time spent in a frame.
@@ -1,4 +1,11 @@
+from .state_store import StateStore
 from .button import Button
+from .callback_dispatchers import *
 from .directional_pad import DirectionalPad
+from .axis_filters import *
+from .control_history import ControlHistory
 from .axis_input import *
-from .axis_trigger import AxisTrigger
\ No newline at end of file
+from .calibration import Calibration
+from .stick_calibration import *
+from .axis_trigger import AxisTrigger
+from .async_event_reader import AsyncEventReader
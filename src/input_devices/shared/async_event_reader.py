@@ -0,0 +1,86 @@
+import os
+from struct import calcsize, iter_unpack
+from typing import List
+from ..evdev import EvdevDevice, event_format
+
+
+class AsyncEventReader:
+    """
+    Reads batches of input events from an 'inputs' device without blocking the asyncio event loop.
+
+    Devices backed by an evdev character device, including EvdevDevice instances, are opened a second time in
+    non-blocking mode and their file descriptor is registered with the event loop, so any number of devices can be read on a single loop without
+    a thread per device. Devices without a character device (e.g. on Windows) fall back to reading in the
+    loop's default executor.
+    """
+
+    default_batch_size = 64  # Maximum number of events read from the device at once.
+
+    def __init__(self, device, batch_size: int = default_batch_size) -> None:
+        """
+        Initializes a new AsyncEventReader for a device.
+
+        Args:
+            device: The input device from the 'inputs' library to read events from.
+            batch_size (int): The maximum number of events returned by a single read.
+        """
+        self.__device = device
+        self.__read_size = calcsize(event_format) * batch_size
+        self.__fd = None
+        self.__evdev_device = None
+        if isinstance(device, EvdevDevice):
+            self.__evdev_device = EvdevDevice(device.get_char_device_path(), batch_size, blocking=False)
+            self.__fd = self.__evdev_device.fileno()
+        elif getattr(device, "_evdev", False) and hasattr(os, "O_NONBLOCK"):
+            self.__fd = os.open(device.get_char_device_path(), os.O_RDONLY | os.O_NONBLOCK)
+
+    async def read(self) -> List:
+        """
+        Waits until the device has events available and reads them.
+
+        Returns:
+            List: The input events read from the device.
+        """
+        if self.__fd is None:
+            import asyncio  # Already loaded by the running loop, imported here to keep importing the package fast
+            return await asyncio.get_running_loop().run_in_executor(None, self.__device.read)
+
+        while True:
+            if self.__evdev_device is not None:
+                events = self.__evdev_device.read()
+                if events:
+                    return events
+                await self.__wait_readable()
+                continue
+            try:
+                data = os.read(self.__fd, self.__read_size)
+            except BlockingIOError:
+                await self.__wait_readable()
+                continue
+            if not data:
+                raise EOFError("The input device was closed.")
+            return [self.__device._make_event(*event) for event in iter_unpack(event_format, data)]
+
+    def close(self) -> None:
+        """
+        Closes the non-blocking file descriptor of the device, if one was opened.
+        """
+        if self.__evdev_device is not None:
+            self.__evdev_device.close()
+        elif self.__fd is not None:
+            os.close(self.__fd)
+        self.__fd = None
+        self.__evdev_device = None
+
+    async def __wait_readable(self) -> None:
+        """
+        Private method to suspend until the file descriptor of the device becomes readable.
+        """
+        import asyncio  # Already loaded by the running loop, imported here to keep importing the package fast
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        loop.add_reader(self.__fd, lambda: readable.done() or readable.set_result(None))
+        try:
+            await readable
+        finally:
+            loop.remove_reader(self.__fd)
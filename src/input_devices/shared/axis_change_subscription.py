@@ -0,0 +1,127 @@
+from time import perf_counter
+from typing import Callable, Optional, Tuple, Union
+from ..utils.type_hints import number_t
+
+axis_value_t = Union[number_t, Tuple[number_t, number_t]]  # Value of a single axis, or the position of a stick.
+axis_reader_t = Callable[[], Tuple[axis_value_t, Optional[axis_value_t]]]  # Returns the current and rest values.
+held_change_hook_t = Callable[['AxisChangeSubscription'], None]  # Type alias for functions told about a change held back by the rate limit.
+
+
+class AxisChangeSubscription:
+    """
+    Calls the callbacks subscribed to an axis when its value moved far enough since the last call. The axis notifies
+    the subscription whenever it is set, so nothing is computed while the axis is idle. Changes that enter or leave
+    the rest value of the calibration, i.e. cross a deadzone boundary, are always reported. A change held back by the
+    rate limit is reported by flush once the interval is over, so the final value of a movement is not lost when no
+    further event arrives.
+    """
+
+    __slots__ = ('__read', '__callbacks', '__threshold', '__min_interval', '__unpack', '__last_value', '__last_timestamp',
+                 '__on_held', '__held', '__held_deadline')
+
+    def __init__(self, read: axis_reader_t, callbacks: tuple, threshold: float = 0.0, min_interval: float = 0.0,
+                 on_held: Optional[held_change_hook_t] = None) -> None:
+        """
+        Initializes an AxisChangeSubscription starting from the current value of the axis.
+
+        Args:
+            read (axis_reader_t): Returns the current value of the axis and its rest value, or None if it has none.
+            callbacks (tuple): The functions to call with the new value, or with x and y for a stick position.
+            threshold (float): The smallest change of the value, or of either coordinate of a position, that is reported.
+            min_interval (float): The smallest time in seconds between two reported changes, 0 for no rate limit.
+                                  Changes to or from the rest value are reported regardless of the rate limit.
+            on_held (Optional[held_change_hook_t]): Called with the subscription when the rate limit starts holding a
+                                                    change back, so its owner can call flush later, or None.
+        """
+        self.__read = read
+        self.__callbacks = callbacks
+        self.__threshold = threshold
+        self.__min_interval = min_interval
+        value, _ = read()
+        self.__unpack = isinstance(value, tuple)
+        self.__last_value = value  # Last reported value.
+        self.__last_timestamp: Optional[float] = None  # Time of the last reported change.
+        self.__on_held = on_held
+        self.__held = False  # Whether a change was held back by the rate limit and not reported yet.
+        self.__held_deadline = 0.0  # perf_counter time at which the held change may be reported.
+
+    def __call__(self, timestamp: Optional[float] = None) -> None:
+        """
+        Checks the current value of the axis and calls the callbacks if it changed enough.
+
+        Args:
+            timestamp (Optional[float]): The time of the event that set the axis, or None to use the current perf_counter time.
+        """
+        self.__check(timestamp, True)
+
+    def flush(self, now: Optional[float] = None) -> bool:
+        """
+        Reports a change held back by the rate limit once its interval is over, even if no further event arrived.
+
+        Args:
+            now (Optional[float]): The current perf_counter time, or None to read it.
+
+        Returns:
+            bool: True if a change is still held back, i.e. flush must be called again later.
+        """
+        if not self.__held:
+            return False
+        if (perf_counter() if now is None else now) < self.__held_deadline:
+            return True
+        self.__held = False
+        self.__check(self.__last_timestamp + self.__min_interval, False)  # In the clock of the events, which may differ from perf_counter
+        return False
+
+    def __check(self, timestamp: Optional[float], rate_limited: bool) -> None:
+        """
+        Private method to check the current value of the axis and call the callbacks if it changed enough.
+
+        Args:
+            timestamp (Optional[float]): The time of the event that set the axis, or None to use the current perf_counter time.
+            rate_limited (bool): False to skip the rate limit, when the interval is known to be over.
+        """
+        value, rest = self.__read()
+        last = self.__last_value
+        if value == last:
+            self.__held = False
+            return
+        if rest is None or (value == rest) == (last == rest):
+            if self.__unpack:
+                if abs(value[0] - last[0]) < self.__threshold and abs(value[1] - last[1]) < self.__threshold:
+                    return
+            elif abs(value - last) < self.__threshold:
+                return
+            if self.__min_interval:
+                if timestamp is None:
+                    timestamp = perf_counter()
+                if rate_limited and self.__last_timestamp is not None:
+                    elapsed = timestamp - self.__last_timestamp
+                    if 0 <= elapsed < self.__min_interval:
+                        self.__hold(self.__min_interval - elapsed)
+                        return
+        elif self.__min_interval and timestamp is None:
+            timestamp = perf_counter()
+
+        self.__held = False
+        self.__last_value = value
+        self.__last_timestamp = timestamp
+        if self.__unpack:
+            for callback in self.__callbacks:
+                callback(*value)
+        else:
+            for callback in self.__callbacks:
+                callback(value)
+
+    def __hold(self, remaining: float) -> None:
+        """
+        Private method to hold a change back until the rate limit allows it, telling the owner once per held change.
+
+        Args:
+            remaining (float): The time in seconds left in the interval.
+        """
+        if self.__held:
+            return  # The deadline of the first held change still applies, the flush reports the latest value
+        self.__held = True
+        self.__held_deadline = perf_counter() + remaining
+        if self.__on_held is not None:
+            self.__on_held(self)
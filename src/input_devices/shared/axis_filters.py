@@ -0,0 +1,326 @@
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from time import perf_counter
+from typing import Deque, List, Optional
+from ..utils.optional_import import optional_import
+from ..utils.type_hints import number_t
+
+__all__ = ['AxisFilter', 'ExponentialMovingAverage', 'OneEuroFilter', 'SlewRateLimiter', 'MedianFilter', 'FilterChain']
+
+
+class AxisFilter:
+    """
+    Base class of incremental axis filters. A filter is updated with every new axis sample in constant time and keeps
+    its current output, so reading the filtered value never recomputes anything from the sample history.
+    Timestamps are in seconds; a sample older than the previous one means the clock source changed and restarts the filter.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a filter without samples.
+        """
+        self._value: Optional[float] = None  # Current output of the filter, None before the first sample.
+
+    def update(self, value: number_t, timestamp: Optional[float] = None) -> float:
+        """
+        Feeds a new sample into the filter.
+
+        Args:
+            value (number_t): The raw axis value.
+            timestamp (Optional[float]): The time of the sample, or None to use the current perf_counter time.
+
+        Returns:
+            float: The filtered value.
+        """
+        raise NotImplementedError
+
+    def get_value(self) -> Optional[float]:
+        """
+        Returns:
+            Optional[float]: The current filtered value, or None if the filter has not received a sample yet.
+        """
+        return self._value
+
+    def reset(self) -> None:
+        """
+        Discards the state of the filter, so the next sample passes through unchanged.
+        """
+        self._value = None
+
+    def filter_array(self, values, timestamps=None):
+        """
+        Filters a whole array of samples, e.g. recorded offline data, continuing from the current state of the filter.
+        Subclasses override this with a vectorized implementation where the filter allows one.
+
+        Args:
+            values (numpy.ndarray): The raw axis values.
+            timestamps (Optional[numpy.ndarray]): The times of the samples, required by time-based filters.
+
+        Returns:
+            numpy.ndarray: The filtered values.
+        """
+        np = _numpy()
+        values = np.asarray(values, dtype=np.float64)
+        if timestamps is None:
+            return np.array([self.update(value) for value in values.tolist()], dtype=np.float64)
+        return np.array([self.update(value, timestamp) for value, timestamp in zip(values.tolist(), np.asarray(timestamps).tolist())],
+                        dtype=np.float64)
+
+
+class ExponentialMovingAverage(AxisFilter):
+    """Exponential moving average, smoothing each sample with weight alpha against the previous output."""
+
+    def __init__(self, alpha: float) -> None:
+        """
+        Initializes an ExponentialMovingAverage.
+
+        Args:
+            alpha (float): The weight of a new sample, between 0 (frozen output) and 1 (no smoothing).
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in the range (0, 1].")
+        super().__init__()
+        self.__alpha = alpha
+
+    def update(self, value: number_t, timestamp: Optional[float] = None) -> float:
+        previous = self._value
+        self._value = float(value) if previous is None else previous + self.__alpha * (value - previous)
+        return self._value
+
+    def filter_array(self, values, timestamps=None):
+        """
+        Vectorized exponential moving average. The recursion is evaluated in closed form over blocks short enough
+        for the decay factors to stay well within floating point range.
+
+        Args:
+            values (numpy.ndarray): The raw axis values.
+            timestamps (Optional[numpy.ndarray]): Ignored, the average does not depend on time.
+
+        Returns:
+            numpy.ndarray: The filtered values.
+        """
+        np = _numpy()
+        values = np.asarray(values, dtype=np.float64)
+        result = np.empty_like(values)
+        if values.size == 0:
+            return result
+        alpha = self.__alpha
+        start = 0
+        if self._value is None:
+            self._value = result[0] = values[0]
+            start = 1
+        if alpha == 1.0:
+            result[start:] = values[start:]
+        else:
+            decay = 1.0 - alpha
+            block_size = max(1, int(math.log(1e-12) / math.log(decay)))
+            powers = decay ** np.arange(1, block_size + 1)
+            previous = self._value
+            for block_start in range(start, values.size, block_size):
+                block = values[block_start:block_start + block_size]
+                block_powers = powers[:block.size]
+                # y[i] = decay^(i+1) * y[-1] + alpha * sum(decay^(i-k) * x[k] for k <= i)
+                output = block_powers * (previous + alpha * np.cumsum(block / block_powers))
+                result[block_start:block_start + block.size] = output
+                previous = output[-1]
+        self._value = float(result[-1])
+        return result
+
+
+class OneEuroFilter(AxisFilter):
+    """
+    One Euro filter: a low-pass filter whose cutoff frequency rises with the speed of the signal, smoothing jitter
+    at rest while keeping the lag low during fast motion.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, derivative_cutoff: float = 1.0) -> None:
+        """
+        Initializes a OneEuroFilter.
+
+        Args:
+            min_cutoff (float): The cutoff frequency in Hz at rest; lower values smooth more.
+            beta (float): How much the cutoff frequency rises with speed; higher values reduce lag.
+            derivative_cutoff (float): The cutoff frequency in Hz used to smooth the speed estimate.
+        """
+        super().__init__()
+        self.__min_cutoff = min_cutoff
+        self.__beta = beta
+        self.__derivative_cutoff = derivative_cutoff
+        self.__derivative = 0.0  # Smoothed rate of change of the signal.
+        self.__last_timestamp = 0.0  # Time of the previous sample.
+
+    def update(self, value: number_t, timestamp: Optional[float] = None) -> float:
+        if timestamp is None:
+            timestamp = perf_counter()
+        previous = self._value
+        delta_time = timestamp - self.__last_timestamp
+        if delta_time == 0 and previous is not None:
+            return previous  # A second sample at the same time carries no rate information
+        self.__last_timestamp = timestamp
+        if previous is None or delta_time < 0:
+            self.__derivative = 0.0
+            self._value = float(value)
+            return self._value
+        derivative = (value - previous) / delta_time
+        self.__derivative += _smoothing_factor(self.__derivative_cutoff, delta_time) * (derivative - self.__derivative)
+        cutoff = self.__min_cutoff + self.__beta * abs(self.__derivative)
+        self._value = previous + _smoothing_factor(cutoff, delta_time) * (value - previous)
+        return self._value
+
+    def reset(self) -> None:
+        super().reset()
+        self.__derivative = 0.0
+
+
+class SlewRateLimiter(AxisFilter):
+    """Limits how fast the output can change, e.g. to protect actuators from sudden jumps of a stick."""
+
+    def __init__(self, max_rate: float) -> None:
+        """
+        Initializes a SlewRateLimiter.
+
+        Args:
+            max_rate (float): The maximum change of the output in axis units per second.
+        """
+        super().__init__()
+        self.__max_rate = max_rate
+        self.__last_timestamp = 0.0  # Time of the previous sample.
+
+    def update(self, value: number_t, timestamp: Optional[float] = None) -> float:
+        if timestamp is None:
+            timestamp = perf_counter()
+        previous = self._value
+        delta_time = timestamp - self.__last_timestamp
+        self.__last_timestamp = timestamp
+        if previous is None or delta_time < 0:
+            self._value = float(value)
+            return self._value
+        max_step = self.__max_rate * delta_time
+        self._value = min(max(value, previous - max_step), previous + max_step)
+        return self._value
+
+
+class MedianFilter(AxisFilter):
+    """Median of the last samples, removing isolated spikes without blurring steps."""
+
+    def __init__(self, size: int = 5) -> None:
+        """
+        Initializes a MedianFilter.
+
+        Args:
+            size (int): The number of most recent samples the median is taken over.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        super().__init__()
+        self.__size = size
+        self.__window: Deque[float] = deque()  # Samples in arrival order.
+        self.__sorted: List[float] = []  # The same samples in ascending order.
+
+    def update(self, value: number_t, timestamp: Optional[float] = None) -> float:
+        value = float(value)
+        window = self.__window
+        ordered = self.__sorted
+        if len(window) == self.__size:
+            del ordered[bisect_left(ordered, window.popleft())]
+        window.append(value)
+        insort(ordered, value)
+        middle = len(ordered) // 2
+        self._value = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+        return self._value
+
+    def reset(self) -> None:
+        super().reset()
+        self.__window.clear()
+        self.__sorted.clear()
+
+    def filter_array(self, values, timestamps=None):
+        """
+        Vectorized median over sliding windows, continuing from the samples currently held by the filter.
+
+        Args:
+            values (numpy.ndarray): The raw axis values.
+            timestamps (Optional[numpy.ndarray]): Ignored, the median does not depend on time.
+
+        Returns:
+            numpy.ndarray: The filtered values.
+        """
+        np = _numpy()
+        values = np.asarray(values, dtype=np.float64)
+        history = np.concatenate((np.array(self.__window, dtype=np.float64), values))
+        offset = len(self.__window)
+        size = self.__size
+        result = np.empty_like(values)
+        # Until the window is full, medians are taken over the samples received so far, as in update()
+        warmup = min(values.size, max(0, size - 1 - offset))
+        for index in range(warmup):
+            result[index] = np.median(history[:offset + index + 1])
+        if values.size > warmup:
+            windows = np.lib.stride_tricks.sliding_window_view(history, size)
+            result[warmup:] = np.median(windows[offset + warmup - size + 1:], axis=1)
+        for value in values[-size:].tolist():
+            self.update(value)
+        return result
+
+
+class FilterChain(AxisFilter):
+    """Applies several filters in sequence, e.g. a median to remove spikes followed by a One Euro filter."""
+
+    def __init__(self, *filters: AxisFilter) -> None:
+        """
+        Initializes a FilterChain.
+
+        Args:
+            filters (AxisFilter): The filters to apply, in order.
+        """
+        super().__init__()
+        self.__filters = filters
+
+    def update(self, value: number_t, timestamp: Optional[float] = None) -> float:
+        if timestamp is None:
+            timestamp = perf_counter()
+        for axis_filter in self.__filters:
+            value = axis_filter.update(value, timestamp)
+        self._value = value
+        return value
+
+    def reset(self) -> None:
+        super().reset()
+        for axis_filter in self.__filters:
+            axis_filter.reset()
+
+    def filter_array(self, values, timestamps=None):
+        for axis_filter in self.__filters:
+            values = axis_filter.filter_array(values, timestamps)
+        if len(values):
+            self._value = float(values[-1])
+        return values
+
+
+def _smoothing_factor(cutoff: float, delta_time: float) -> float:
+    """
+    Computes the weight of a new sample for a first order low-pass filter.
+
+    Args:
+        cutoff (float): The cutoff frequency in Hz.
+        delta_time (float): The time in seconds since the previous sample.
+
+    Returns:
+        float: The smoothing factor between 0 and 1.
+    """
+    time_constant = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + time_constant / delta_time)
+
+
+def _numpy():
+    """
+    Gets NumPy for the array methods of the filters, failing with a helpful message if it is not installed.
+
+    Returns:
+        module: The numpy module.
+    """
+    np = optional_import('numpy')  # NumPy is an optional dependency, installed with the 'numpy' extra
+    if np is None:
+        raise ImportError("Filtering arrays requires NumPy, install it with 'pip install input_devices[numpy]'.")
+    return np
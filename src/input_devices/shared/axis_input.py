@@ -1,17 +1,57 @@
-from typing import Tuple
+from typing import Callable, Optional, Tuple
+from .axis_change_subscription import AxisChangeSubscription, held_change_hook_t
+from .axis_filters import AxisFilter
+from .control_history import ControlHistory
+from .calibration import Calibration
+from .stick_calibration import StickCalibration
+from .state_store import StateStore
 from ..utils.functions import map, range_adjust
 from ..utils.type_hints import number_t, range_t
 
 class HorizontalAxisInput:
-    """Handles the horizontal axis input settings for a controller."""
-    def __init__(self, value_range: range_t, axis_inverted: bool = False) -> None:
+    """Handles the horizontal axis input settings for a controller. The axis value is kept in a StateStore."""
+    def __init__(self, value_range: range_t, axis_inverted: bool = False, state_store: Optional[StateStore] = None) -> None:
+        """
+        Initialize the horizontal axis input configuration.
+
+        Args:
+            value_range (range_t): The full range of horizontal axis values.
+            axis_inverted (bool): If True, inverts the axis values.
+            state_store (Optional[StateStore]): The store to keep the axis value in, or None for a store of its own.
+        """
+        state_store = state_store if state_store is not None else StateStore()
         self.__axis_inverted = axis_inverted
         self.__value_range = value_range
-        self.__x: float = 0.0
+        self.__x_values = state_store.values()
+        self.__x_index = state_store.allocate()
+        self.__calibration_x: Optional[Calibration] = None
+        self.__filter_x: Optional[AxisFilter] = None
+        self.__history_x: Optional[ControlHistory] = None
+        self._held_change_hook: Optional[held_change_hook_t] = None  # Told about changes held back by a rate limit, e.g. by the owning controller.
+        self.__x_listeners: Tuple[Callable[[Optional[float]], None], ...] = ()  # Notified whenever the value is set.
+
+    def _set_x(self, x: number_t, timestamp: Optional[float] = None) -> None:
+        """Internal method to set the x value directly, feeding the attached filter and history with the time of the event."""
+        self.__x_values[self.__x_index] = x
+        if self.__filter_x is not None:
+            self.__filter_x.update(x, timestamp)
+        if self.__history_x is not None:
+            self.__history_x.append(x, timestamp)
+        if self.__x_listeners:
+            for listener in self.__x_listeners:
+                listener(timestamp)
+
+    def _set_held_change_hook(self, hook: Optional[held_change_hook_t]) -> None:
+        """Internal method to set a function called with a change subscription whose rate limit held a change back, so its owner can flush it once the interval is over. Applies to subscriptions registered afterwards."""
+        self._held_change_hook = hook
+
+    def _add_x_listener(self, listener: Callable[[Optional[float]], None]) -> None:
+        """Internal method to add a function called with the event timestamp whenever the x value is set."""
+        self.__x_listeners += (listener,)
 
-    def _set_x(self, x: number_t) -> None:
-        """Internal method to set the x value directly."""
-        self.__x = x
+    def _get_x_index(self) -> int:
+        """Internal method to get the index of the x value in its StateStore."""
+        return self.__x_index
 
     def get_x(self) -> number_t:
         """
@@ -20,8 +60,81 @@ class HorizontalAxisInput:
         Returns:
             number_t: The current horizontal axis value.
         """
-        return -self.__x if self.__axis_inverted else self.__x
+        x = self.__x_values[self.__x_index]
+        return -x if self.__axis_inverted else x
     
+    def on_change_x(self, *callbacks: Callable[[number_t], None], threshold: float = 0.0, min_interval: float = 0.0) -> 'HorizontalAxisInput':
+        """
+        Registers callbacks called with the new horizontal axis value when it changes. If a calibration is attached, the
+        calibrated value is reported, and entering or leaving its blindspot is always reported.
+
+        Args:
+            callbacks (Callable[[number_t], None]): A variadic number of callback functions to register.
+            threshold (float): The smallest change of the value since the last call that is reported.
+            min_interval (float): The smallest time in seconds between two calls, 0 for no rate limit. A change held
+                                  back by the limit is reported once the interval is over, by the next event or, for
+                                  the controls of a controller, by its next update.
+
+        Returns:
+            HorizontalAxisInput: The instance of this class to allow method chaining.
+        """
+        self._add_x_listener(AxisChangeSubscription(self.__read_change_x, callbacks, threshold, min_interval, self._held_change_hook))
+        return self
+
+    def __read_change_x(self) -> Tuple[number_t, Optional[number_t]]:
+        """
+        Private method to read the horizontal axis value reported to change callbacks.
+
+        Returns:
+            Tuple[number_t, Optional[number_t]]: The calibrated value and the rest value of the calibration,
+                                                 or the value and None if no calibration is attached.
+        """
+        calibration = self.__calibration_x
+        if calibration is None:
+            return self.get_x(), None
+        return calibration.calibrate(self.get_x()), calibration.get_rest_value()
+
+    def set_filter_x(self, axis_filter: Optional[AxisFilter]) -> None:
+        """
+        Attach a filter that is updated with every new horizontal axis value, so get_filtered_x reads it in constant time.
+
+        Args:
+            axis_filter (Optional[AxisFilter]): The filter to attach, e.g. a FilterChain, or None to detach the current one.
+        """
+        self.__filter_x = axis_filter
+
+    def set_history_x(self, history: Optional[ControlHistory]) -> None:
+        """
+        Attach a history that records every new horizontal axis value with the time of its event.
+        Raw values are recorded, without inversion or calibration.
+
+        Args:
+            history (Optional[ControlHistory]): The history to record into, or None to stop recording.
+        """
+        self.__history_x = history
+
+    def get_history_x(self) -> Optional[ControlHistory]:
+        """
+        Returns:
+            Optional[ControlHistory]: The history recording the horizontal axis values, or None if none is attached.
+        """
+        return self.__history_x
+
+    def get_filtered_x(self) -> number_t:
+        """
+        Get the horizontal axis value smoothed by the attached filter, considering whether it is inverted.
+        Before the filter received its first value, the current axis value is returned.
+
+        Returns:
+            number_t: The filtered horizontal axis value.
+        """
+        if self.__filter_x is None:
+            raise ValueError("No filter is attached to the horizontal axis.")
+        x = self.__filter_x.get_value()
+        if x is None:
+            return self.get_x()
+        return -x if self.__axis_inverted else x
+
     def get_adjusted_x(self, axis_blindspot_range: range_t, axis_zero: number_t) -> number_t:
         """
         Get the adjusted horizontal axis value, applying blindspot processing and normalization based on zero.
@@ -49,12 +162,28 @@ class HorizontalAxisInput:
         """
         return map(self.get_x(), *self.__value_range, new_minimum, new_maximum)
     
-    def get_calibrated_x(self, axis_blindspot_range: range_t, axis_zero: number_t, new_minimum: number_t, new_maximum: number_t) -> number_t:
+    def set_calibration_x(self, calibration: Optional[Calibration]) -> None:
+        """
+        Attach a precompiled calibration used by get_calibrated_x when it is called without arguments.
+
+        Args:
+            calibration (Optional[Calibration]): The calibration to attach, or None to detach the current one. It is
+                                                 applied to the value of get_x, so for an inverted axis it must be
+                                                 built from the negated raw range, blindspot and zero.
+        """
+        self.__calibration_x = calibration
+
+    def get_calibrated_x(self,
+                         axis_blindspot_range: Optional[range_t] = None,
+                         axis_zero: number_t = None,
+                         new_minimum: number_t = None,
+                         new_maximum: number_t = None) -> number_t:
         """
         Get the calibrated horizontal axis value, first adjusting and then mapping it to a new range.
+        If no blindspot range is given, the attached calibration is used instead.
 
         Args:
-            axis_blindspot_range (range_t): The range within which the axis input is ignored.
+            axis_blindspot_range (Optional[range_t]): The range within which the axis input is ignored.
             axis_zero (number_t): The value that represents zero input.
             new_minimum (number_t): The lower bound of the new range.
             new_maximum (number_t): The upper bound of the new range.
@@ -62,29 +191,60 @@ class HorizontalAxisInput:
         Returns:
             number_t: The calibrated horizontal axis value.
         """
+        if axis_blindspot_range is None:
+            if self.__calibration_x is None:
+                raise ValueError("No calibration is attached to the horizontal axis.")
+            return self.__calibration_x.calibrate(self.get_x())
         adjusted_value = self.get_adjusted_x(axis_blindspot_range, axis_zero)
         return map(adjusted_value, *self.__value_range, new_minimum, new_maximum)
          
     
 
 class VerticalAxisInput:
-    """Handles the vertical axis input settings for a controller."""
+    """Handles the vertical axis input settings for a controller. The axis value is kept in a StateStore."""
 
-    def __init__(self, value_range: range_t, axis_inverted: bool = False) -> None:
+    def __init__(self, value_range: range_t, axis_inverted: bool = False, state_store: Optional[StateStore] = None) -> None:
         """
         Initialize the vertical axis input configuration.
 
         Args:
             value_range (range_t): The full range of vertical axis values.
             axis_inverted (bool): If True, inverts the axis values.
+            state_store (Optional[StateStore]): The store to keep the axis value in, or None for a store of its own.
         """
+        state_store = state_store if state_store is not None else StateStore()
         self.__axis_inverted = axis_inverted
         self.__value_range = value_range
-        self.__y: float = 0.0
+        self.__y_values = state_store.values()
+        self.__y_index = state_store.allocate()
+        self.__calibration_y: Optional[Calibration] = None
+        self.__filter_y: Optional[AxisFilter] = None
+        self.__history_y: Optional[ControlHistory] = None
+        self._held_change_hook: Optional[held_change_hook_t] = None  # Told about changes held back by a rate limit, e.g. by the owning controller.
+        self.__y_listeners: Tuple[Callable[[Optional[float]], None], ...] = ()  # Notified whenever the value is set.
     
-    def _set_y(self, y: number_t) -> None:
-        """Internal method to set the y value directly."""
-        self.__y = y
+    def _set_y(self, y: number_t, timestamp: Optional[float] = None) -> None:
+        """Internal method to set the y value directly, feeding the attached filter and history with the time of the event."""
+        self.__y_values[self.__y_index] = y
+        if self.__filter_y is not None:
+            self.__filter_y.update(y, timestamp)
+        if self.__history_y is not None:
+            self.__history_y.append(y, timestamp)
+        if self.__y_listeners:
+            for listener in self.__y_listeners:
+                listener(timestamp)
+
+    def _set_held_change_hook(self, hook: Optional[held_change_hook_t]) -> None:
+        """Internal method to set a function called with a change subscription whose rate limit held a change back, so its owner can flush it once the interval is over. Applies to subscriptions registered afterwards."""
+        self._held_change_hook = hook
+
+    def _add_y_listener(self, listener: Callable[[Optional[float]], None]) -> None:
+        """Internal method to add a function called with the event timestamp whenever the y value is set."""
+        self.__y_listeners += (listener,)
+
+    def _get_y_index(self) -> int:
+        """Internal method to get the index of the y value in its StateStore."""
+        return self.__y_index
 
     def get_y(self) -> number_t:
         """
@@ -93,8 +253,81 @@ class VerticalAxisInput:
         Returns:
             number_t: The current vertical axis value.
         """
-        return -self.__y if self.__axis_inverted else self.__y
+        y = self.__y_values[self.__y_index]
+        return -y if self.__axis_inverted else y
     
+    def on_change_y(self, *callbacks: Callable[[number_t], None], threshold: float = 0.0, min_interval: float = 0.0) -> 'VerticalAxisInput':
+        """
+        Registers callbacks called with the new vertical axis value when it changes. If a calibration is attached, the
+        calibrated value is reported, and entering or leaving its blindspot is always reported.
+
+        Args:
+            callbacks (Callable[[number_t], None]): A variadic number of callback functions to register.
+            threshold (float): The smallest change of the value since the last call that is reported.
+            min_interval (float): The smallest time in seconds between two calls, 0 for no rate limit. A change held
+                                  back by the limit is reported once the interval is over, by the next event or, for
+                                  the controls of a controller, by its next update.
+
+        Returns:
+            VerticalAxisInput: The instance of this class to allow method chaining.
+        """
+        self._add_y_listener(AxisChangeSubscription(self.__read_change_y, callbacks, threshold, min_interval, self._held_change_hook))
+        return self
+
+    def __read_change_y(self) -> Tuple[number_t, Optional[number_t]]:
+        """
+        Private method to read the vertical axis value reported to change callbacks.
+
+        Returns:
+            Tuple[number_t, Optional[number_t]]: The calibrated value and the rest value of the calibration,
+                                                 or the value and None if no calibration is attached.
+        """
+        calibration = self.__calibration_y
+        if calibration is None:
+            return self.get_y(), None
+        return calibration.calibrate(self.get_y()), calibration.get_rest_value()
+
+    def set_filter_y(self, axis_filter: Optional[AxisFilter]) -> None:
+        """
+        Attach a filter that is updated with every new vertical axis value, so get_filtered_y reads it in constant time.
+
+        Args:
+            axis_filter (Optional[AxisFilter]): The filter to attach, e.g. a FilterChain, or None to detach the current one.
+        """
+        self.__filter_y = axis_filter
+
+    def set_history_y(self, history: Optional[ControlHistory]) -> None:
+        """
+        Attach a history that records every new vertical axis value with the time of its event.
+        Raw values are recorded, without inversion or calibration.
+
+        Args:
+            history (Optional[ControlHistory]): The history to record into, or None to stop recording.
+        """
+        self.__history_y = history
+
+    def get_history_y(self) -> Optional[ControlHistory]:
+        """
+        Returns:
+            Optional[ControlHistory]: The history recording the vertical axis values, or None if none is attached.
+        """
+        return self.__history_y
+
+    def get_filtered_y(self) -> number_t:
+        """
+        Get the vertical axis value smoothed by the attached filter, considering whether it is inverted.
+        Before the filter received its first value, the current axis value is returned.
+
+        Returns:
+            number_t: The filtered vertical axis value.
+        """
+        if self.__filter_y is None:
+            raise ValueError("No filter is attached to the vertical axis.")
+        y = self.__filter_y.get_value()
+        if y is None:
+            return self.get_y()
+        return -y if self.__axis_inverted else y
+
     def get_adjusted_y(self, axis_blindspot_range: range_t, axis_zero: number_t) -> number_t:
         """
         Get the adjusted vertical axis value, applying blindspot processing and normalization based on zero.
@@ -121,12 +354,28 @@ class VerticalAxisInput:
         """
         return map(self.get_y(), *self.__value_range, new_minimum, new_maximum)
     
-    def get_calibrated_y(self, axis_blindspot_range: range_t, axis_zero: number_t, new_minimum: number_t, new_maximum: number_t) -> number_t:
+    def set_calibration_y(self, calibration: Optional[Calibration]) -> None:
+        """
+        Attach a precompiled calibration used by get_calibrated_y when it is called without arguments.
+
+        Args:
+            calibration (Optional[Calibration]): The calibration to attach, or None to detach the current one. It is
+                                                 applied to the value of get_y, so for an inverted axis it must be
+                                                 built from the negated raw range, blindspot and zero.
+        """
+        self.__calibration_y = calibration
+
+    def get_calibrated_y(self,
+                         axis_blindspot_range: Optional[range_t] = None,
+                         axis_zero: number_t = None,
+                         new_minimum: number_t = None,
+                         new_maximum: number_t = None) -> number_t:
         """
         Get the calibrated vertical axis value, first adjusting and then mapping it to a new range.
+        If no blindspot range is given, the attached calibration is used instead.
 
         Args:
-            axis_blindspot_range (range_t): The range within which the axis input is ignored.
+            axis_blindspot_range (Optional[range_t]): The range within which the axis input is ignored.
             axis_zero (number_t): The value that represents zero input.
             new_minimum (number_t): The lower bound of the new range.
             new_maximum (number_t): The upper bound of the new range.
@@ -134,6 +383,10 @@ class VerticalAxisInput:
         Returns:
             number_t: The calibrated vertical axis value.
         """
+        if axis_blindspot_range is None:
+            if self.__calibration_y is None:
+                raise ValueError("No calibration is attached to the vertical axis.")
+            return self.__calibration_y.calibrate(self.get_y())
         adjusted_value = self.get_adjusted_y(axis_blindspot_range, axis_zero)
         return map(adjusted_value, *self.__value_range, new_minimum, new_maximum)
       
@@ -144,7 +397,8 @@ class CartesianAxisInput(HorizontalAxisInput, VerticalAxisInput):
                  horizontal_value_range: range_t,
                  vertical_value_range: range_t,
                  horizontal_axis_inverted: bool = False, 
-                 vertical_axis_inverted: bool = False) -> None:
+                 vertical_axis_inverted: bool = False,
+                 state_store: Optional[StateStore] = None) -> None:
         """
         Initialize the Cartesian axis input configuration for managing two-dimensional control inputs.
 
@@ -153,11 +407,123 @@ class CartesianAxisInput(HorizontalAxisInput, VerticalAxisInput):
             vertical_value_range (range_t): The full range of vertical axis values.
             horizontal_axis_inverted (bool): If True, inverts the horizontal axis values.
             vertical_axis_inverted (bool): If True, inverts the vertical axis values.
+            state_store (Optional[StateStore]): The store to keep the axis values in, or None for a store of their own.
 
         Initializes a two-axis controller setup where each axis can be individually configured for ranges and inversion,
         enabling precise control over input handling.
         """
 
-        HorizontalAxisInput.__init__(self, axis_inverted=horizontal_axis_inverted, value_range=horizontal_value_range)
-        VerticalAxisInput.__init__(self, axis_inverted=vertical_axis_inverted, value_range=vertical_value_range)
- 
\ No newline at end of file
+        state_store = state_store if state_store is not None else StateStore()
+        HorizontalAxisInput.__init__(self, axis_inverted=horizontal_axis_inverted, value_range=horizontal_value_range, state_store=state_store)
+        VerticalAxisInput.__init__(self, axis_inverted=vertical_axis_inverted, value_range=vertical_value_range, state_store=state_store)
+        self.__calibration: Optional[StickCalibration] = None
+        self.__position_subscriptions: Tuple[AxisChangeSubscription, ...] = ()  # Subscriptions of on_change, checked once per position change.
+        self.__batch_hook: Optional[Callable[['CartesianAxisInput'], None]] = None  # Called when the first position callback is registered.
+        self.__batching = False  # Whether position changes are held until the end of the current batch of events.
+        self.__batch_pending = False  # Whether an axis was set during the current batch.
+        self.__batch_timestamp: Optional[float] = None  # Time of the last event of the current batch that set an axis.
+
+    def set_calibration(self, calibration: Optional[StickCalibration]) -> None:
+        """
+        Attach a precompiled joint calibration of both axes used by get_calibrated and get_calibrated_polar.
+
+        Args:
+            calibration (Optional[StickCalibration]): The calibration to attach, or None to detach the current one. It is
+                                                      applied to the values of get_x and get_y, so the range of an
+                                                      inverted axis must be given negated.
+        """
+        self.__calibration = calibration
+
+    def on_change(self, *callbacks: Callable[[number_t, number_t], None], threshold: float = 0.0,
+                  min_interval: float = 0.0) -> 'CartesianAxisInput':
+        """
+        Registers callbacks called with the new x and y values when the position changes. If a stick calibration is
+        attached, the calibrated position is reported, and entering or leaving its deadzone is always reported.
+        A controller reports the position once per batch of events, after every axis event of the batch was applied,
+        so a diagonal move is seen as one position. A stick set directly through _set_x and _set_y outside a batch
+        reports after each set, so callbacks can then see x updated before y.
+
+        Args:
+            callbacks (Callable[[number_t, number_t], None]): A variadic number of callback functions to register.
+            threshold (float): The smallest change of either value since the last call that is reported.
+            min_interval (float): The smallest time in seconds between two calls, 0 for no rate limit. A change held
+                                  back by the limit is reported once the interval is over, by the next event or, for
+                                  the controls of a controller, by its next update.
+
+        Returns:
+            CartesianAxisInput: The instance of this class to allow method chaining.
+        """
+        subscription = AxisChangeSubscription(self.__read_change, callbacks, threshold, min_interval, self._held_change_hook)
+        if not self.__position_subscriptions:
+            self._add_x_listener(self.__position_set)
+            self._add_y_listener(self.__position_set)
+            if self.__batch_hook is not None:
+                self.__batch_hook(self)
+        self.__position_subscriptions += (subscription,)
+        return self
+
+    def _set_batch_hook(self, hook: Callable[['CartesianAxisInput'], None]) -> None:
+        """Internal method to set a function called with the stick when its first position callback is registered, so its owner can bracket batches of events with _begin_batch and _end_batch."""
+        self.__batch_hook = hook
+        if self.__position_subscriptions:
+            hook(self)
+
+    def _begin_batch(self) -> None:
+        """Internal method to hold position changes until _end_batch is called."""
+        self.__batching = True
+
+    def _end_batch(self) -> None:
+        """Internal method to report the position once if an axis was set since _begin_batch."""
+        self.__batching = False
+        if self.__batch_pending:
+            self.__batch_pending = False
+            self.__position_set(self.__batch_timestamp)
+
+    def __position_set(self, timestamp: Optional[float]) -> None:
+        """
+        Private method called whenever an axis is set, reporting the position to the subscriptions unless a batch is open.
+
+        Args:
+            timestamp (Optional[float]): The time of the event that set the axis, or None to use the current perf_counter time.
+        """
+        if self.__batching:
+            self.__batch_pending = True
+            self.__batch_timestamp = timestamp
+            return
+        for subscription in self.__position_subscriptions:
+            subscription(timestamp)
+
+    def __read_change(self) -> Tuple[Tuple[number_t, number_t], Optional[Tuple[number_t, number_t]]]:
+        """
+        Private method to read the position reported to change callbacks.
+
+        Returns:
+            Tuple: The calibrated position and the rest position of the calibration,
+                   or the position and None if no stick calibration is attached.
+        """
+        calibration = self.__calibration
+        if calibration is None:
+            return (self.get_x(), self.get_y()), None
+        return calibration.calibrate(self.get_x(), self.get_y()), calibration.get_rest_value()
+
+    def get_calibrated(self) -> Tuple[number_t, number_t]:
+        """
+        Get both axis values calibrated jointly by the attached calibration, e.g. with a radial deadzone.
+
+        Returns:
+            Tuple[number_t, number_t]: The calibrated horizontal and vertical axis values.
+        """
+        if self.__calibration is None:
+            raise ValueError("No stick calibration is attached to the axis input.")
+        return self.__calibration.calibrate(self.get_x(), self.get_y())
+
+    def get_calibrated_polar(self) -> Tuple[number_t, number_t]:
+        """
+        Get the position calibrated jointly by the attached calibration as a magnitude and an angle.
+
+        Returns:
+            Tuple[number_t, number_t]: The magnitude between 0 and 1 and the angle in radians.
+        """
+        if self.__calibration is None:
+            raise ValueError("No stick calibration is attached to the axis input.")
+        return self.__calibration.calibrate_polar(self.get_x(), self.get_y())
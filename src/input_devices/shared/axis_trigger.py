@@ -1,5 +1,7 @@
 from .axis_input import CartesianAxisInput
+from typing import Optional
 from .button import Button
+from .state_store import StateStore
 from ..utils.type_hints import range_t
 
 class AxisTrigger(CartesianAxisInput, Button):
@@ -13,7 +15,8 @@ class AxisTrigger(CartesianAxisInput, Button):
                  vertical_value_range: range_t,
                  horizontal_axis_inverted: bool = False,
                  vertical_axis_inverted: bool = False,
-                 debounce_time: float = Button.default_debounce_time) -> None:
+                 debounce_time: float = Button.default_debounce_time,
+                 state_store: Optional[StateStore] = None) -> None:
         """
         Initializes an AxisTrigger with specific configurations for axis input and button debounce timing.
 
@@ -23,10 +26,13 @@ class AxisTrigger(CartesianAxisInput, Button):
             horizontal_axis_inverted (bool): Whether to invert the horizontal axis.
             vertical_axis_inverted (bool): Whether to invert the vertical axis.
             debounce_time (float): Time in seconds to ignore changes in state to prevent bounce.
+            state_store (Optional[StateStore]): The store to keep the axis values and button state in, or None for a store of their own.
         """
+        state_store = state_store if state_store is not None else StateStore()
         CartesianAxisInput.__init__(self,
                                     horizontal_value_range=horizontal_value_range,
                                     vertical_value_range=vertical_value_range,
                                     horizontal_axis_inverted=horizontal_axis_inverted,
-                                    vertical_axis_inverted=vertical_axis_inverted)
-        Button.__init__(self, debounce_time)
+                                    vertical_axis_inverted=vertical_axis_inverted,
+                                    state_store=state_store)
+        Button.__init__(self, debounce_time, state_store)
@@ -1,26 +1,48 @@
-from typing import Callable
+from typing import Callable, List, Optional
 from time import perf_counter
+from .callback_dispatchers import CallbackDispatcher, callback_t
+from .control_history import ControlHistory
+from ..instrumentation import PipelineMetrics
+from .state_store import StateStore
 
-callback_t = Callable[[], None]  # Type alias for callback functions that take no parameters and return nothing.
+_no_callbacks: frozenset = frozenset()  # Shared empty callback set of buttons without registered callbacks.
 
 class Button:
-    """Encapsulates the functionality of a button on a controller, including state management and event handling."""
+    """
+    Encapsulates the functionality of a button on a controller, including state management and event handling.
+    The pressed state is kept in a StateStore, which is shared by all controls of a controller.
+    """
+
+    __slots__ = ('__press_callbacks', '__release_callbacks', '__state_values', '__state_index', '__last_timestamp',
+                 '__press_timestamp', '__release_timestamp', '__debounce_time', '__callback_dispatcher',
+                 '__press_waiters', '__release_waiters', '__transition_listeners', '__history', '__metrics')
 
     default_debounce_time = 0.04  # Default debounce time set to 40 milliseconds
 
-    def __init__(self, debounce_time=default_debounce_time) -> None:
+    def __init__(self, debounce_time=default_debounce_time, state_store: Optional[StateStore] = None) -> None:
         """
         Initializes a new Button instance with optional debounce configuration.
 
         Args:
             debounce_time (float): The minimum amount of time in seconds that must elapse between button state changes 
                                     to consider them valid, preventing "bouncing".
+            state_store (Optional[StateStore]): The store to keep the button state in, or None for a store of its own.
         """
-        self.__press_callbacks = set()  # Set of functions to call when button is pressed.
-        self.__release_callbacks = set()  # Set of functions to call when button is released.
-        self.__state = bool()  # Current state of the button; False for released, True for pressed.
+        state_store = state_store if state_store is not None else StateStore()
+        self.__press_callbacks = _no_callbacks  # Set of functions to call when button is pressed, replaced on registration.
+        self.__release_callbacks = _no_callbacks  # Set of functions to call when button is released, replaced on registration.
+        self.__state_values = state_store.values()  # Values of the store; 0.0 for released, 1.0 for pressed.
+        self.__state_index = state_store.allocate()  # Index of the button state in the store.
         self.__last_timestamp = perf_counter()  # Time of the last state change to handle debounce.
+        self.__press_timestamp: Optional[float] = None  # Time of the last accepted press.
+        self.__release_timestamp: Optional[float] = None  # Time of the last accepted release.
         self.__debounce_time = debounce_time  # Time threshold to ignore subsequent state changes.
+        self.__callback_dispatcher: Optional[CallbackDispatcher] = None  # Policy running the callbacks, None to call them directly.
+        self.__press_waiters: Optional[List['asyncio.Future']] = None  # Futures awaiting the next press, created on first use.
+        self.__release_waiters: Optional[List['asyncio.Future']] = None  # Futures awaiting the next release, created on first use.
+        self.__transition_listeners: tuple = ()  # Functions called with the state and timestamp of every accepted change.
+        self.__history: Optional[ControlHistory] = None  # Records accepted state changes, None unless enabled.
+        self.__metrics: Optional[PipelineMetrics] = None  # Metrics timing the callbacks and counting debounce rejections, None unless enabled.
 
     def on_press(self, *callbacks: callback_t) -> 'Button':
         """
@@ -32,7 +54,7 @@ class Button:
         Returns:
             Button: The instance of this class to allow method chaining.
         """
-        self.__press_callbacks.update(callbacks)
+        self.__press_callbacks = self.__press_callbacks.union(callbacks)
         return self
 
     def on_release(self, *callbacks: callback_t) -> 'Button':
@@ -45,7 +67,7 @@ class Button:
         Returns:
             Button: The instance of this class to allow method chaining.
         """
-        self.__release_callbacks.update(callbacks)
+        self.__release_callbacks = self.__release_callbacks.union(callbacks)
         return self
 
     def pressed(self) -> bool:
@@ -55,7 +77,7 @@ class Button:
         Returns:
             bool: True if the button is pressed, False otherwise.
         """
-        return self.__state
+        return self.__state_values[self.__state_index] != 0.0
 
     def released(self) -> bool:
         """
@@ -64,7 +86,60 @@ class Button:
         Returns:
             bool: True if the button is released, False otherwise.
         """
-        return not self.__state
+        return self.__state_values[self.__state_index] == 0.0
+
+    async def wait_pressed(self) -> None:
+        """
+        Waits until the button is pressed. Returns at the next press, even if the button is currently pressed.
+        """
+        if self.__press_waiters is None:
+            self.__press_waiters = []
+        await self.__wait(self.__press_waiters)
+
+    async def wait_released(self) -> None:
+        """
+        Waits until the button is released. Returns at the next release, even if the button is currently released.
+        """
+        if self.__release_waiters is None:
+            self.__release_waiters = []
+        await self.__wait(self.__release_waiters)
+
+    def get_press_time(self) -> Optional[float]:
+        """
+        Gets the time of the last press, taken from the timestamp of the event that pressed the button.
+
+        Returns:
+            Optional[float]: The time of the last press, or None if the button was never pressed.
+        """
+        return self.__press_timestamp
+
+    def get_release_time(self) -> Optional[float]:
+        """
+        Gets the time of the last release, taken from the timestamp of the event that released the button.
+
+        Returns:
+            Optional[float]: The time of the last release, or None if the button was never released.
+        """
+        return self.__release_timestamp
+
+    def get_hold_duration(self, now: Optional[float] = None) -> float:
+        """
+        Gets how long the button is or was held. While the button is pressed, this is the time since the press;
+        once released, it is the duration of the last press.
+
+        Args:
+            now (Optional[float]): The current time on the clock of the event timestamps, required while the button is pressed.
+
+        Returns:
+            float: The hold duration in seconds, or 0 if the button was never pressed.
+        """
+        if self.__press_timestamp is None:
+            return 0.0
+        if self.pressed():
+            if now is None:
+                raise ValueError("The current time is required while the button is pressed.")
+            return now - self.__press_timestamp
+        return self.__release_timestamp - self.__press_timestamp
 
     def set_debounce_time(self, debounce_time: float) -> None:
         """
@@ -75,24 +150,133 @@ class Button:
         """
         self.__debounce_time = debounce_time
 
-    def _set_state(self, state: bool) -> None:
+    def set_callback_dispatcher(self, callback_dispatcher: Optional[CallbackDispatcher]) -> 'Button':
         """
-        Sets the state of the button, applying a debounce filter.
+        Sets the policy deciding where and when the callbacks of this button run, e.g. on a thread pool or an asyncio loop.
+
+        Args:
+            callback_dispatcher (Optional[CallbackDispatcher]): The dispatcher to hand triggered callbacks to,
+                                                                or None to call them directly.
+
+        Returns:
+            Button: The instance of this class to allow method chaining.
+        """
+        self.__callback_dispatcher = callback_dispatcher
+        return self
+
+    def set_history(self, history: Optional[ControlHistory]) -> 'Button':
+        """
+        Attaches a history that records every accepted state change, 1.0 for a press and 0.0 for a release,
+        with the time of its event.
+
+        Args:
+            history (Optional[ControlHistory]): The history to record into, or None to stop recording.
+
+        Returns:
+            Button: The instance of this class to allow method chaining.
+        """
+        self.__history = history
+        return self
+
+    def get_history(self) -> Optional[ControlHistory]:
+        """
+        Returns:
+            Optional[ControlHistory]: The history recording the state changes, or None if none is attached.
+        """
+        return self.__history
+
+    def _add_transition_listener(self, listener: Callable[[bool, float], None]) -> None:
+        """
+        Internal method to add a function called synchronously with the new state and the timestamp of every accepted
+        state change, before the callbacks, regardless of the callback dispatcher.
+        """
+        self.__transition_listeners += (listener,)
+
+    def _set_metrics(self, metrics: Optional[PipelineMetrics]) -> None:
+        """Internal method to set the metrics timing the callbacks and counting debounce rejections, or None."""
+        self.__metrics = metrics
+
+    def _get_state_index(self) -> int:
+        """Internal method to get the index of the button state in its StateStore."""
+        return self.__state_index
+
+    def _set_state(self, state: bool, timestamp: Optional[float] = None) -> None:
+        """
+        Sets the state of the button, applying a debounce filter based on the time of the event. Changes within the
+        debounce time of the last accepted one are ignored on either side of it, so reordered events cannot bypass the
+        filter. A jump by more than the debounce time, e.g. when perf_counter times and kernel timestamps are mixed,
+        is accepted and debounces later changes on the new clock.
 
         Args:
             state (bool): The new state of the button (True for pressed, False for released).
+            timestamp (Optional[float]): The time of the event that changed the state, e.g. its kernel timestamp,
+                                         or None to use the current perf_counter time.
         """
-        if state == self.__state:
+        if state == (self.__state_values[self.__state_index] != 0.0):
             return  # No state change occurred
         
-        timestamp = perf_counter()
+        local_clock = timestamp is None
+        if local_clock:
+            timestamp = perf_counter()
         delta_time = timestamp - self.__last_timestamp
-        if delta_time < self.__debounce_time:
-            return  # State change is ignored due to debounce time
+        if -self.__debounce_time < delta_time < self.__debounce_time:
+            if self.__metrics is not None:
+                self.__metrics._count_debounce_rejection(self)
+            return  # State change is ignored due to debounce time, also for reordered events slightly in the past
         
         self.__last_timestamp = timestamp
-        self.__state = state
+        self.__state_values[self.__state_index] = 1.0 if state else 0.0
+        if state:
+            self.__press_timestamp = timestamp
+        else:
+            self.__release_timestamp = timestamp
+        if self.__history is not None:
+            self.__history.append(1.0 if state else 0.0, None if local_clock else timestamp)  # Lets the history tell the clocks apart
         
-        # Call the appropriate callbacks based on the new state
-        for callback in (self.__press_callbacks if state else self.__release_callbacks):
-            callback()
+        waiters = self.__press_waiters if state else self.__release_waiters
+        if waiters:
+            for waiter in waiters:
+                waiter.get_loop().call_soon_threadsafe(_resolve_waiter, waiter)
+            waiters.clear()
+
+        if self.__transition_listeners:
+            for listener in self.__transition_listeners:
+                listener(state, timestamp)
+
+        # Call or dispatch the appropriate callbacks based on the new state
+        callbacks = self.__press_callbacks if state else self.__release_callbacks
+        if self.__metrics is not None:
+            self.__metrics._run_callbacks(callbacks, self.__callback_dispatcher)
+        elif self.__callback_dispatcher is None:
+            for callback in callbacks:
+                callback()
+        else:
+            for callback in callbacks:
+                self.__callback_dispatcher.dispatch(callback)
+
+    async def __wait(self, waiters: List['asyncio.Future']) -> None:
+        """
+        Private method to wait on a future that is resolved at the next matching state change.
+
+        Args:
+            waiters (List[asyncio.Future]): The list of waiters for the awaited state.
+        """
+        import asyncio  # Already loaded by the running loop, imported here to keep importing the package fast
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+
+
+def _resolve_waiter(waiter: 'asyncio.Future') -> None:
+    """
+    Resolves a waiter future unless it was cancelled in the meantime.
+
+    Args:
+        waiter (asyncio.Future): The future to resolve.
+    """
+    if not waiter.done():
+        waiter.set_result(None)
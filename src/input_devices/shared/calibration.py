@@ -0,0 +1,144 @@
+from typing import List, Optional
+from ..utils.functions import map, range_adjust, calibrate_array
+from ..utils.type_hints import number_t, range_t
+
+class Calibration:
+    """
+    A precompiled axis calibration. The blindspot adjustment followed by the mapping to a new range, as performed by
+    get_calibrated_x/get_calibrated_y, is a piecewise-linear function of the raw axis value. This class computes the
+    slope and offset of each piece once, so calibrating a value is a single multiply-add, and can optionally
+    tabulate the whole function for integer-valued axes, so calibrating a value is a single list index.
+    A calibration acts on the values returned by get_x/get_y, which are already negated on inverted axes, so its
+    ranges and zero must be given in that negated form, e.g. (-1023, 0) for an inverted axis reading 0 to 1023.
+    """
+
+    def __init__(self,
+                 value_range: range_t,
+                 axis_blindspot_range: range_t,
+                 axis_zero: Optional[number_t],
+                 new_minimum: number_t,
+                 new_maximum: number_t,
+                 lookup_table: bool = False) -> None:
+        """
+        Initializes a new Calibration and compiles its mapping.
+
+        Args:
+            value_range (range_t): The full range of axis values as read by get_x/get_y. For an inverted axis this is
+                                   the negated raw range, (-maximum, -minimum).
+            axis_blindspot_range (range_t): The range within which the axis input is ignored, negated in the same way
+                                            for an inverted axis.
+            axis_zero (Optional[number_t]): The value that represents zero input, negated for an inverted axis, or
+                                            None for the middle of the value range.
+            new_minimum (number_t): The lower bound of the new range.
+            new_maximum (number_t): The upper bound of the new range.
+            lookup_table (bool): If True, tabulates the calibrated value of every integer in the value range.
+        """
+        self.__value_range = value_range
+        self.__axis_blindspot_range = axis_blindspot_range
+        self.__axis_zero = axis_zero
+        self.__new_range = (new_minimum, new_maximum)
+
+        bounds_start, bounds_end = value_range
+        blindspot_start, blindspot_end = axis_blindspot_range
+        zero = (bounds_start + bounds_end) / 2 if axis_zero is None else axis_zero
+        scale = (new_maximum - new_minimum) / (bounds_end - bounds_start)  # Slope of the final mapping to the new range
+
+        # Below the blindspot [bounds_start, blindspot_start] is mapped onto [bounds_start, zero - 1]
+        low_slope = _slope(bounds_start, blindspot_start, bounds_start, zero - 1)
+        self.__low_slope = low_slope * scale
+        self.__low_offset = (bounds_start - low_slope * bounds_start - bounds_start) * scale + new_minimum
+
+        # Above the blindspot [blindspot_end, bounds_end] is mapped onto [zero + 1, bounds_end]
+        high_slope = _slope(blindspot_end, bounds_end, zero + 1, bounds_end)
+        self.__high_slope = high_slope * scale
+        self.__high_offset = (zero + 1 - high_slope * blindspot_end - bounds_start) * scale + new_minimum
+
+        # Inside the blindspot the adjusted value is 0
+        self.__blindspot_value = map(0, bounds_start, bounds_end, new_minimum, new_maximum)
+        self.__blindspot_start = blindspot_start
+        self.__blindspot_end = blindspot_end
+
+        self.__table: Optional[List[number_t]] = None
+        if lookup_table:
+            self.__table = [self.__reference(value) for value in range(int(bounds_start), int(bounds_end) + 1)]
+        self.__table_start = int(bounds_start)
+        self.__table_end = int(bounds_end)
+
+    def calibrate(self, value: number_t) -> number_t:
+        """
+        Calibrates a raw axis value.
+
+        Args:
+            value (number_t): The raw axis value. Values are looked up in the table only if they are integral and within the value range.
+
+        Returns:
+            number_t: The calibrated axis value.
+        """
+        table = self.__table
+        if table is not None and self.__table_start <= value <= self.__table_end:
+            index = int(value)
+            if index == value:
+                return table[index - self.__table_start]
+        if value < self.__blindspot_start:
+            return self.__low_slope * value + self.__low_offset
+        if value <= self.__blindspot_end:
+            return self.__blindspot_value
+        return self.__high_slope * value + self.__high_offset
+
+    def calibrate_array(self, values):
+        """
+        Calibrates a whole array of raw axis values at once. Requires NumPy. The results are identical to the
+        uncompiled get_calibrated_x/get_calibrated_y computation for each value.
+
+        Args:
+            values (numpy.ndarray): The raw axis values.
+
+        Returns:
+            numpy.ndarray: The calibrated axis values.
+        """
+        return calibrate_array(values, self.__value_range, self.__axis_blindspot_range, self.__axis_zero, *self.__new_range)
+
+    def get_rest_value(self) -> number_t:
+        """
+        Returns:
+            number_t: The calibrated value of every raw value inside the blindspot.
+        """
+        return self.__blindspot_value
+
+    def get_value_range(self) -> range_t:
+        """
+        Returns:
+            range_t: The full range of raw axis values this calibration was compiled for.
+        """
+        return self.__value_range
+
+    def __reference(self, value: number_t) -> number_t:
+        """
+        Private method to calibrate a value with the uncompiled functions, used to fill the lookup table.
+
+        Args:
+            value (number_t): The raw axis value.
+
+        Returns:
+            number_t: The calibrated axis value.
+        """
+        adjusted_value = range_adjust(value, self.__axis_blindspot_range, self.__value_range, self.__axis_zero)
+        return map(adjusted_value, *self.__value_range, *self.__new_range)
+
+
+def _slope(from_low: number_t, from_high: number_t, to_low: number_t, to_high: number_t) -> number_t:
+    """
+    Computes the slope of the linear mapping between two ranges, treating an empty source range as unused.
+
+    Args:
+        from_low (number_t): The lower bound of the source range.
+        from_high (number_t): The upper bound of the source range.
+        to_low (number_t): The lower bound of the target range.
+        to_high (number_t): The upper bound of the target range.
+
+    Returns:
+        number_t: The slope of the mapping, or 0 if the source range is empty.
+    """
+    if from_high == from_low:
+        return 0
+    return (to_high - to_low) / (from_high - from_low)
@@ -0,0 +1,270 @@
+import logging
+from collections import deque
+from enum import Enum
+from threading import Condition, Lock, Thread
+from time import perf_counter
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Set
+
+__all__ = ['CallbackStats', 'Backpressure', 'CallbackDispatcher', 'InlineDispatcher', 'QueueDispatcher',
+           'ThreadPoolDispatcher', 'AsyncioDispatcher']
+
+callback_t = Callable[[], None]  # Type alias for callback functions that take no parameters and return nothing.
+error_handler_t = Callable[[callback_t, Exception], None]  # Type alias for handlers of exceptions raised by callbacks.
+
+_logger = logging.getLogger(__name__)  # Reports callback errors of dispatchers without an error handler.
+
+class CallbackStats(NamedTuple):
+    """Timing counters of a single callback run by a dispatcher."""
+    calls: int  # Number of completed calls.
+    total_time: float  # Total time in seconds spent in the callback.
+    max_time: float  # Longest single call in seconds.
+
+
+class Backpressure(Enum):
+    """What a bounded dispatcher does with a new callback when its pending queue is full."""
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest pending callback to make room.
+    BLOCK = "block"  # Wait until a pending callback was taken, stalling the dispatching thread while the queue is not drained.
+    COALESCE = "coalesce"  # Skip callbacks that are already pending, and discard the oldest one if still full.
+
+
+class CallbackDispatcher:
+    """
+    Base class of the policies deciding where and when button callbacks run. Subclasses implement dispatch(), and run
+    callbacks through _run(), which keeps per-callback timing counters.
+    """
+
+    def __init__(self) -> None:
+        self.__stats: Dict[callback_t, List] = {}  # Calls, total time and max time per callback.
+        self.__stats_lock = Lock()
+        self._dropped_count = 0  # Number of callbacks discarded due to backpressure.
+        self._error_count = 0  # Number of callbacks that raised an exception.
+
+    def dispatch(self, callback: callback_t) -> None:
+        """
+        Schedules a callback to be run according to the policy of the dispatcher.
+
+        Args:
+            callback (callback_t): The callback to run.
+        """
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[callback_t, CallbackStats]:
+        """
+        Returns:
+            Dict[callback_t, CallbackStats]: The timing counters of every callback run so far.
+        """
+        with self.__stats_lock:
+            return {callback: CallbackStats(*stats) for callback, stats in self.__stats.items()}
+
+    def get_dropped_count(self) -> int:
+        """
+        Returns:
+            int: The number of callbacks discarded due to backpressure or coalescing.
+        """
+        return self._dropped_count
+
+    def get_error_count(self) -> int:
+        """
+        Returns:
+            int: The number of callbacks that raised an exception.
+        """
+        return self._error_count
+
+    def _run(self, callback: callback_t) -> None:
+        """
+        Runs a callback and updates its timing counters, counting it as an error if it raises.
+
+        Args:
+            callback (callback_t): The callback to run.
+        """
+        start = perf_counter()
+        failed = True
+        try:
+            callback()
+            failed = False
+        finally:
+            elapsed = perf_counter() - start
+            with self.__stats_lock:
+                if failed:
+                    self._error_count += 1
+                stats = self.__stats.get(callback)
+                if stats is None:
+                    self.__stats[callback] = [1, elapsed, elapsed]
+                else:
+                    stats[0] += 1
+                    stats[1] += elapsed
+                    if elapsed > stats[2]:
+                        stats[2] = elapsed
+
+
+class InlineDispatcher(CallbackDispatcher):
+    """Runs callbacks immediately on the thread that changed the button state."""
+
+    def dispatch(self, callback: callback_t) -> None:
+        self._run(callback)
+
+
+class QueueDispatcher(CallbackDispatcher):
+    """
+    Collects callbacks in a bounded queue that the consumer drains with process(), so callbacks run on the consumer's
+    thread at a time of its choosing. With Backpressure.BLOCK, dispatch waits while the queue is full, so a consumer
+    that stops calling process() stalls the thread processing input events, e.g. the background reader.
+    """
+
+    default_max_pending = 1024  # Default capacity of the pending queue.
+
+    def __init__(self, max_pending: int = default_max_pending, backpressure: Backpressure = Backpressure.DROP_OLDEST) -> None:
+        """
+        Initializes a new QueueDispatcher.
+
+        Args:
+            max_pending (int): The maximum number of callbacks waiting to be run.
+            backpressure (Backpressure): What to do with a new callback when the queue is full.
+        """
+        super().__init__()
+        self._pending: Deque[callback_t] = deque()
+        self._condition = Condition()
+        self._closed = False
+        self.__max_pending = max_pending
+        self.__backpressure = backpressure
+        self.__coalesce = backpressure is Backpressure.COALESCE
+        self.__pending_set: Set[callback_t] = set()  # Pending callbacks when coalescing, for constant-time duplicate checks.
+
+    def dispatch(self, callback: callback_t) -> None:
+        with self._condition:
+            pending = self._pending
+            if self.__coalesce:
+                if callback in self.__pending_set:
+                    self._dropped_count += 1
+                    return
+                self.__pending_set.add(callback)
+            while len(pending) >= self.__max_pending:
+                if self.__backpressure is Backpressure.BLOCK and not self._closed:
+                    self._condition.wait()
+                else:
+                    self._pop_pending()
+                    self._dropped_count += 1
+            pending.append(callback)
+            self._condition.notify_all()  # Producers blocked by backpressure share the condition with the consumers
+
+    def process(self) -> int:
+        """
+        Runs all pending callbacks on the calling thread.
+
+        Returns:
+            int: The number of callbacks that were run.
+        """
+        count = 0
+        while True:
+            with self._condition:
+                if not self._pending:
+                    return count
+                callback = self._pop_pending()
+                self._condition.notify_all()
+            self._run(callback)
+            count += 1
+
+    def get_pending_count(self) -> int:
+        """
+        Returns:
+            int: The number of callbacks waiting to be run.
+        """
+        return len(self._pending)
+
+    def _pop_pending(self) -> callback_t:
+        """
+        Internal method to take the oldest pending callback, called with the condition held.
+
+        Returns:
+            callback_t: The callback removed from the queue.
+        """
+        callback = self._pending.popleft()
+        if self.__coalesce:
+            self.__pending_set.discard(callback)
+        return callback
+
+
+class ThreadPoolDispatcher(QueueDispatcher):
+    """
+    Runs callbacks on a fixed number of worker threads fed from a bounded queue, so slow callbacks never delay
+    the thread processing input events, unless Backpressure.BLOCK is used and the workers cannot keep up. An exception
+    raised by a callback is counted and passed to the error handler, and the worker carries on.
+    """
+
+    default_max_workers = 4  # Default number of worker threads.
+
+    def __init__(self,
+                 max_workers: int = default_max_workers,
+                 max_pending: int = QueueDispatcher.default_max_pending,
+                 backpressure: Backpressure = Backpressure.DROP_OLDEST,
+                 on_error: Optional[error_handler_t] = None) -> None:
+        """
+        Initializes a new ThreadPoolDispatcher and starts its worker threads.
+
+        Args:
+            max_workers (int): The number of worker threads.
+            max_pending (int): The maximum number of callbacks waiting for a worker.
+            backpressure (Backpressure): What to do with a new callback when the queue is full.
+            on_error (Optional[error_handler_t]): A function taking a failed callback and its exception, called on the
+                                                  worker thread, or None to log the exception with the logging module.
+        """
+        super().__init__(max_pending, backpressure)
+        self.__on_error = on_error
+        self.__workers = [Thread(target=self.__work, name=f"ThreadPoolDispatcher worker {index}", daemon=True)
+                          for index in range(max_workers)]
+        for worker in self.__workers:
+            worker.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the worker threads after the pending callbacks were run.
+
+        Args:
+            wait (bool): If True, waits until the workers exited.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self.__workers:
+                worker.join()
+
+    def __work(self) -> None:
+        """
+        Private method run by the worker threads, taking and running pending callbacks until shut down.
+        """
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                callback = self._pop_pending()
+                self._condition.notify_all()
+            try:
+                self._run(callback)
+            except Exception as error:  # A failing callback must not stop the worker
+                if self.__on_error is None:
+                    _logger.exception("Callback %r raised an exception", callback)
+                else:
+                    self.__on_error(callback, error)
+
+
+class AsyncioDispatcher(CallbackDispatcher):
+    """Runs callbacks on an asyncio event loop, scheduled thread-safely from whichever thread changed the button state."""
+
+    def __init__(self, loop: Optional['asyncio.AbstractEventLoop'] = None) -> None:
+        """
+        Initializes a new AsyncioDispatcher.
+
+        Args:
+            loop (Optional[asyncio.AbstractEventLoop]): The loop to run callbacks on, or None for the running loop.
+        """
+        super().__init__()
+        if loop is None:
+            import asyncio  # Imported on use, since importing asyncio is slow
+            loop = asyncio.get_running_loop()
+        self.__loop = loop
+
+    def dispatch(self, callback: callback_t) -> None:
+        self.__loop.call_soon_threadsafe(self._run, callback)
@@ -0,0 +1,328 @@
+from array import array
+from time import perf_counter
+from typing import List, Optional, Tuple
+from ..utils.optional_import import optional_import
+from ..utils.type_hints import number_t
+
+__all__ = ['ControlHistory']
+
+
+class ControlHistory:
+    """
+    A fixed-capacity ring buffer of the recent values of a control and the times they were set. All storage is
+    preallocated, so appending a sample is O(1) and allocates nothing, and the oldest samples are overwritten once
+    the buffer is full. Windows over the last seconds are exposed as zero-copy memoryviews. A running sum makes the
+    mean of any window O(1); it is recomputed from the retained samples each time the buffer wraps around, so its
+    rounding error does not grow over long sessions. Minimum and maximum scan the window, using NumPy when it is installed.
+    Timestamps are expected to increase, as event timestamps from one device do; a sample older than the newest one
+    means the clock was restarted, e.g. by a replay, and clears the history. Samples stamped with perf_counter, i.e.
+    appended without a timestamp, and samples with event timestamps are not comparable, so a history holds samples
+    of one kind only and rejects the other until it is cleared.
+    """
+
+    __slots__ = ('__values', '__timestamps', '__prefix_sums', '__capacity', '__head', '__count', '__total', '__local_clock')
+
+    default_capacity = 4096  # About four seconds of a control reporting at 1000 Hz.
+
+    def __init__(self, capacity: int = default_capacity) -> None:
+        """
+        Initializes an empty ControlHistory.
+
+        Args:
+            capacity (int): The maximum number of samples kept.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.__values = array('d', bytes(8 * capacity))
+        self.__timestamps = array('d', bytes(8 * capacity))
+        self.__prefix_sums = array('d', bytes(8 * capacity))  # Running sum of the values since the last wrap-around, up to and including each sample.
+        self.__capacity = capacity
+        self.__head = 0  # Index the next sample is written to.
+        self.__count = 0  # Number of samples held, up to the capacity.
+        self.__total = 0.0  # Running sum of the values appended since the last wrap-around.
+        self.__local_clock = False  # Whether the samples held are stamped with perf_counter rather than event timestamps.
+
+    def append(self, value: number_t, timestamp: Optional[float] = None) -> bool:
+        """
+        Appends a sample, overwriting the oldest one if the buffer is full. A sample older than the newest one
+        clears the history first, since the windows rely on increasing timestamps.
+
+        Args:
+            value (number_t): The value of the control.
+            timestamp (Optional[float]): The time the value was set, or None to use the current perf_counter time.
+
+        Returns:
+            bool: True if the sample was recorded, False if it was rejected because the samples held use the other
+                  clock, e.g. a sample without a timestamp in a history of kernel-timestamped events.
+        """
+        local_clock = timestamp is None
+        if local_clock:
+            timestamp = perf_counter()
+        if self.__count:
+            if local_clock != self.__local_clock:
+                return False
+            if timestamp < self.__timestamps[self.__head - 1]:
+                self.clear()
+        self.__local_clock = local_clock
+        head = self.__head
+        self.__values[head] = value
+        self.__timestamps[head] = timestamp
+        self.__total += value
+        self.__prefix_sums[head] = self.__total
+        head += 1
+        if self.__count < self.__capacity:
+            self.__count += 1
+        if head == self.__capacity:
+            head = 0
+            self.__rebase()
+        self.__head = head
+        return True
+
+    def clear(self) -> None:
+        """
+        Removes all samples.
+        """
+        self.__head = 0
+        self.__count = 0
+        self.__total = 0.0
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of samples held.
+        """
+        return self.__count
+
+    def get_capacity(self) -> int:
+        """
+        Returns:
+            int: The maximum number of samples kept.
+        """
+        return self.__capacity
+
+    def get_latest(self) -> Optional[Tuple[float, float]]:
+        """
+        Returns:
+            Optional[Tuple[float, float]]: The value and timestamp of the newest sample, or None if there is none.
+        """
+        if not self.__count:
+            return None
+        index = self.__head - 1
+        return self.__values[index], self.__timestamps[index]
+
+    def get_segments(self, duration: Optional[float] = None, now: Optional[float] = None) -> List[Tuple[memoryview, memoryview]]:
+        """
+        Gets zero-copy views of the samples in a time window. Since the buffer wraps around, the window consists of
+        up to two contiguous segments.
+
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, in the clock of the timestamps, or None for the newest sample.
+
+        Returns:
+            List[Tuple[memoryview, memoryview]]: The (values, timestamps) views of each segment, oldest first.
+                                                 The views reflect later appends, so copy them to keep the data.
+        """
+        start, end = self.__window(duration, now)
+        values = memoryview(self.__values)
+        timestamps = memoryview(self.__timestamps)
+        segments = []
+        for segment_start, segment_end in self.__physical_ranges(start, end):
+            segments.append((values[segment_start:segment_end], timestamps[segment_start:segment_end]))
+        return segments
+
+    def get_values(self, duration: Optional[float] = None, now: Optional[float] = None):
+        """
+        Copies the values of a time window into a single contiguous array, oldest first.
+
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, in the clock of the timestamps, or None for the newest sample.
+
+        Returns:
+            numpy.ndarray if NumPy is installed, array otherwise: The values of the window.
+        """
+        segments = [values for values, _ in self.get_segments(duration, now)]
+        np = optional_import('numpy')
+        if np is not None:
+            return np.concatenate([np.frombuffer(segment, dtype=np.float64) for segment in segments]) if segments else np.empty(0)
+        result = array('d')
+        for segment in segments:
+            result.frombytes(segment.cast('B'))
+        return result
+
+    def count(self, duration: Optional[float] = None, now: Optional[float] = None) -> int:
+        """
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, in the clock of the timestamps, or None for the newest sample.
+
+        Returns:
+            int: The number of samples in the window.
+        """
+        start, end = self.__window(duration, now)
+        return end - start
+
+    def mean(self, duration: Optional[float] = None, now: Optional[float] = None) -> Optional[float]:
+        """
+        Computes the mean value of a time window in constant time.
+
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, in the clock of the timestamps, or None for the newest sample.
+
+        Returns:
+            Optional[float]: The mean value, or None if the window holds no samples.
+        """
+        start, end = self.__window(duration, now)
+        if start == end:
+            return None
+        total = self.__prefix_sums[self.__physical(end - 1)]
+        if start > 0:
+            total -= self.__prefix_sums[self.__physical(start - 1)]
+        else:
+            oldest = self.__physical(0)
+            total -= self.__prefix_sums[oldest] - self.__values[oldest]
+        return total / (end - start)
+
+    def min(self, duration: Optional[float] = None, now: Optional[float] = None) -> Optional[float]:
+        """
+        Finds the minimum value of a time window.
+
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, in the clock of the timestamps, or None for the newest sample.
+
+        Returns:
+            Optional[float]: The minimum value, or None if the window holds no samples.
+        """
+        return self.__reduce(duration, now, min, 'min')
+
+    def max(self, duration: Optional[float] = None, now: Optional[float] = None) -> Optional[float]:
+        """
+        Finds the maximum value of a time window.
+
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, in the clock of the timestamps, or None for the newest sample.
+
+        Returns:
+            Optional[float]: The maximum value, or None if the window holds no samples.
+        """
+        return self.__reduce(duration, now, max, 'max')
+
+    def __reduce(self, duration: Optional[float], now: Optional[float], reduce, method: str) -> Optional[float]:
+        """
+        Private method to reduce the values of a time window segment by segment.
+
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, or None for the newest sample.
+            reduce: The builtin reducing a segment without NumPy, min or max.
+            method (str): The name of the equivalent NumPy array method.
+
+        Returns:
+            Optional[float]: The reduced value, or None if the window holds no samples.
+        """
+        segments = self.get_segments(duration, now)
+        if not segments:
+            return None
+        np = optional_import('numpy')
+        if np is not None:
+            return float(reduce(getattr(np.frombuffer(values, dtype=np.float64), method)() for values, _ in segments))
+        return reduce(reduce(values) for values, _ in segments)
+
+    def __rebase(self) -> None:
+        """
+        Private method to recompute the running sums from the samples held once the buffer wraps around, which keeps
+        them bounded by the sum of one buffer instead of the whole session. It runs once every capacity appends.
+        """
+        values = self.__values
+        prefix_sums = self.__prefix_sums
+        total = 0.0
+        for index in range(self.__capacity):
+            total += values[index]
+            prefix_sums[index] = total
+        self.__total = total
+
+    def __window(self, duration: Optional[float], now: Optional[float]) -> Tuple[int, int]:
+        """
+        Private method to find the logical range of the samples in a time window, 0 being the oldest sample held.
+
+        Args:
+            duration (Optional[float]): The length of the window in seconds, or None for all samples.
+            now (Optional[float]): The end of the window, or None for the newest sample.
+
+        Returns:
+            Tuple[int, int]: The logical start and end (exclusive) of the window.
+        """
+        count = self.__count
+        if duration is None and now is None:
+            return 0, count
+        timestamps = self.__timestamps
+        end = count
+        if now is not None:
+            end = self.__bisect(0, count, now, inclusive=True)
+        if duration is None:
+            return 0, end
+        if now is None:
+            if not count:
+                return 0, 0
+            now = timestamps[self.__physical(count - 1)]
+        return self.__bisect(0, end, now - duration, inclusive=False), end
+
+    def __bisect(self, low: int, high: int, timestamp: float, inclusive: bool) -> int:
+        """
+        Private method to binary search the logical position of a time.
+
+        Args:
+            low (int): The logical start of the searched range.
+            high (int): The logical end of the searched range.
+            timestamp (float): The time to search for.
+            inclusive (bool): If True, returns the position after all samples at or before the time,
+                              otherwise the position of the first sample at or after it.
+
+        Returns:
+            int: The logical position.
+        """
+        timestamps = self.__timestamps
+        while low < high:
+            middle = (low + high) // 2
+            sample_time = timestamps[self.__physical(middle)]
+            if sample_time < timestamp or (inclusive and sample_time == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __physical(self, position: int) -> int:
+        """
+        Private method to convert a logical position into an index of the buffer.
+
+        Args:
+            position (int): The logical position, 0 being the oldest sample held.
+
+        Returns:
+            int: The index in the buffer.
+        """
+        index = self.__head - self.__count + position
+        return index + self.__capacity if index < 0 else index
+
+    def __physical_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Private method to split a logical range into contiguous ranges of the buffer.
+
+        Args:
+            start (int): The logical start of the range.
+            end (int): The logical end (exclusive) of the range.
+
+        Returns:
+            List[Tuple[int, int]]: Up to two (start, end) index ranges of the buffer, oldest first.
+        """
+        if start >= end:
+            return []
+        first = self.__physical(start)
+        last = self.__physical(end - 1) + 1
+        if first < last:
+            return [(first, last)]
+        return [(first, self.__capacity), (0, last)]
@@ -1,13 +1,21 @@
+from typing import Optional
 from .button import Button
+from .state_store import StateStore
 
 class DirectionalPad:
     """Represents the directional pad (D-pad) on an Xbox controller, consisting of four buttons: up, down, left, and right."""
 
-    def __init__(self) -> None:
+    __slots__ = ('up', 'down', 'left', 'right')
+
+    def __init__(self, state_store: Optional[StateStore] = None) -> None:
         """
         Initializes a new DirectionalPad instance with four directional buttons.
+
+        Args:
+            state_store (Optional[StateStore]): The store to keep the button states in, or None for a store of their own.
         """
-        self.up = Button()  # Button instance for the "up" direction
-        self.down = Button()  # Button instance for the "down" direction
-        self.left = Button()  # Button instance for the "left" direction
-        self.right = Button()  # Button instance for the "right" direction
+        state_store = state_store if state_store is not None else StateStore()
+        self.up = Button(state_store=state_store)  # Button instance for the "up" direction
+        self.down = Button(state_store=state_store)  # Button instance for the "down" direction
+        self.left = Button(state_store=state_store)  # Button instance for the "left" direction
+        self.right = Button(state_store=state_store)  # Button instance for the "right" direction
@@ -0,0 +1,86 @@
+from array import array
+from typing import List
+
+class StateStore:
+    """
+    Contiguous storage for the state of many controls. Every button bit and axis value of a controller lives in a
+    single array of doubles, so the whole state can be snapshotted, copied, compared or serialized as one buffer.
+    Buttons are stored as 0.0 (released) or 1.0 (pressed), axes as their raw, non-inverted values.
+    """
+
+    __slots__ = ('__values',)
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty StateStore.
+        """
+        self.__values = array('d')
+
+    def allocate(self, count: int = 1) -> int:
+        """
+        Reserves space for the values of a control.
+
+        Args:
+            count (int): The number of values to reserve.
+
+        Returns:
+            int: The index of the first reserved value.
+        """
+        index = len(self.__values)
+        self.__values.extend([0.0] * count)
+        return index
+
+    def values(self) -> array:
+        """
+        Returns:
+            array: The live array holding all values. Controls index into it directly.
+        """
+        return self.__values
+
+    def copy(self) -> array:
+        """
+        Returns:
+            array: A copy of all values, taken in a single buffer operation.
+        """
+        return self.__values[:]
+
+    def diff(self, previous: array) -> List[int]:
+        """
+        Compares the current values with a previous copy.
+
+        Args:
+            previous (array): A copy taken earlier with copy().
+
+        Returns:
+            List[int]: The indices of the values that changed.
+        """
+        values = self.__values
+        if values == previous:
+            return []
+        return [index for index, (value, old) in enumerate(zip(values, previous)) if value != old]
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns:
+            bytes: All values serialized in native byte order.
+        """
+        return self.__values.tobytes()
+
+    def load_bytes(self, data: bytes) -> None:
+        """
+        Replaces all values with ones serialized by to_bytes().
+
+        Args:
+            data (bytes): The serialized values, of the same size as the store.
+        """
+        values = self.__values
+        if len(data) != len(values) * values.itemsize:
+            raise ValueError("The serialized state does not match the size of the store.")
+        memoryview(values).cast('B')[:] = data
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of values in the store.
+        """
+        return len(self.__values)
@@ -0,0 +1,149 @@
+import math
+from enum import Enum
+from typing import Tuple
+from ..utils.type_hints import number_t, range_t
+
+__all__ = ['DeadzoneMode', 'StickCalibration']
+
+
+class DeadzoneMode(Enum):
+    """How the deadzone of a two-axis stick is shaped."""
+    RADIAL = "radial"  # Zero inside a circle around the center, the raw magnitude outside of it.
+    SCALED_RADIAL = "scaled_radial"  # Zero inside a circle, the magnitude rescaled to start from zero at its edge.
+    CROSS = "cross"  # Each axis is zeroed and rescaled independently, e.g. to lock onto pure horizontal or vertical motion.
+
+
+class StickCalibration:
+    """
+    A precompiled joint calibration of both axes of a stick. Unlike separate get_calibrated_x/get_calibrated_y calls,
+    which give square deadzones, the deadzone is applied to the position of the stick as a whole. All coefficients
+    are computed once, so calibrating a position is a few multiply-adds and at most one square root.
+    Like Calibration, it acts on the values returned by get_x/get_y, which are already negated on inverted axes.
+    """
+
+    def __init__(self,
+                 horizontal_value_range: range_t,
+                 vertical_value_range: range_t,
+                 deadzone: float = 0.1,
+                 deadzone_mode: DeadzoneMode = DeadzoneMode.SCALED_RADIAL,
+                 anti_deadzone: float = 0.0,
+                 new_minimum: number_t = -1,
+                 new_maximum: number_t = 1) -> None:
+        """
+        Initializes a new StickCalibration and compiles its coefficients.
+
+        Args:
+            horizontal_value_range (range_t): The full range of horizontal axis values as read by get_x. For an
+                                              inverted axis this is the negated raw range, (-maximum, -minimum).
+            vertical_value_range (range_t): The full range of vertical axis values as read by get_y, negated in the
+                                            same way for an inverted axis.
+            deadzone (float): The size of the deadzone as a fraction of the full deflection, between 0 and 1.
+            deadzone_mode (DeadzoneMode): The shape of the deadzone.
+            anti_deadzone (float): The smallest output magnitude outside of the deadzone as a fraction of the full
+                                   deflection, e.g. to overcome a deadzone applied by the receiving application.
+            new_minimum (number_t): The lower bound of the calibrated axis values.
+            new_maximum (number_t): The upper bound of the calibrated axis values.
+        """
+        if not 0 <= deadzone < 1:
+            raise ValueError("deadzone must be in the range [0, 1).")
+        if not 0 <= anti_deadzone < 1:
+            raise ValueError("anti_deadzone must be in the range [0, 1).")
+        self.__deadzone_mode = deadzone_mode
+        self.__deadzone = deadzone
+        self.__deadzone_squared = deadzone * deadzone
+        self.__anti_deadzone = anti_deadzone
+
+        # Raw values are normalized to [-1, 1] around the middle of their range
+        x_start, x_end = horizontal_value_range
+        y_start, y_end = vertical_value_range
+        self.__x_slope = 2 / (x_end - x_start)
+        self.__x_offset = -(x_start + x_end) / (x_end - x_start)
+        self.__y_slope = 2 / (y_end - y_start)
+        self.__y_offset = -(y_start + y_end) / (y_end - y_start)
+
+        # The magnitude outside of the deadzone becomes anti_deadzone + magnitude_slope * (magnitude - magnitude_start)
+        scaled = deadzone_mode is not DeadzoneMode.RADIAL
+        self.__magnitude_start = deadzone if scaled else 0.0
+        self.__magnitude_slope = (1 - anti_deadzone) / (1 - deadzone) if scaled else 1 - anti_deadzone
+
+        # Normalized values are mapped from [-1, 1] to the new range
+        self.__output_slope = (new_maximum - new_minimum) / 2
+        self.__output_offset = (new_maximum + new_minimum) / 2
+
+    def calibrate(self, x: number_t, y: number_t) -> Tuple[float, float]:
+        """
+        Calibrates a stick position.
+
+        Args:
+            x (number_t): The raw horizontal axis value.
+            y (number_t): The raw vertical axis value.
+
+        Returns:
+            Tuple[float, float]: The calibrated horizontal and vertical axis values in the new range.
+        """
+        x, y = self.__normalize(x, y)
+        return x * self.__output_slope + self.__output_offset, y * self.__output_slope + self.__output_offset
+
+    def calibrate_polar(self, x: number_t, y: number_t) -> Tuple[float, float]:
+        """
+        Calibrates a stick position and converts it to polar coordinates.
+
+        Args:
+            x (number_t): The raw horizontal axis value.
+            y (number_t): The raw vertical axis value.
+
+        Returns:
+            Tuple[float, float]: The magnitude, from 0 at rest to 1 at full deflection, and the angle in radians
+                                 counterclockwise from the positive horizontal axis, 0 at rest.
+        """
+        x, y = self.__normalize(x, y)
+        if x == 0 and y == 0:
+            return 0.0, 0.0
+        return min(math.hypot(x, y), 1.0), math.atan2(y, x)
+
+    def get_rest_value(self) -> Tuple[float, float]:
+        """
+        Returns:
+            Tuple[float, float]: The calibrated horizontal and vertical axis values of every position inside the deadzone.
+        """
+        return self.__output_offset, self.__output_offset
+
+    def __normalize(self, x: number_t, y: number_t) -> Tuple[float, float]:
+        """
+        Private method to normalize a stick position to [-1, 1] and apply the deadzone.
+
+        Args:
+            x (number_t): The raw horizontal axis value.
+            y (number_t): The raw vertical axis value.
+
+        Returns:
+            Tuple[float, float]: The normalized position with the deadzone applied.
+        """
+        x = x * self.__x_slope + self.__x_offset
+        y = y * self.__y_slope + self.__y_offset
+        if self.__deadzone_mode is DeadzoneMode.CROSS:
+            return self.__shape_axis(x), self.__shape_axis(y)
+
+        magnitude_squared = x * x + y * y
+        if magnitude_squared <= self.__deadzone_squared:
+            return 0.0, 0.0
+        magnitude = math.sqrt(magnitude_squared)
+        shaped = self.__anti_deadzone + self.__magnitude_slope * (min(magnitude, 1.0) - self.__magnitude_start)
+        factor = shaped / magnitude
+        return x * factor, y * factor
+
+    def __shape_axis(self, value: float) -> float:
+        """
+        Private method to apply the deadzone to a single normalized axis value.
+
+        Args:
+            value (float): The normalized axis value.
+
+        Returns:
+            float: The axis value with the deadzone applied.
+        """
+        magnitude = abs(value)
+        if magnitude <= self.__deadzone:
+            return 0.0
+        shaped = self.__anti_deadzone + self.__magnitude_slope * (min(magnitude, 1.0) - self.__magnitude_start)
+        return shaped if value > 0 else -shaped
@@ -0,0 +1 @@
+from .virtual_gamepad import VirtualGamepad, scenarios
@@ -0,0 +1,130 @@
+import math
+import random
+from typing import Callable, Dict, Iterator, List
+from ..evdev import EV_SYN, EvdevEvent, code_names, event_key, event_keys
+from ..evdev.evdev_device import raw_event_t
+
+frame_t = List[tuple]  # The (type, code, value) events of one report, without timestamps.
+
+_button_codes = ["BTN_SOUTH", "BTN_EAST", "BTN_NORTH", "BTN_WEST", "BTN_TL", "BTN_TR", "BTN_SELECT", "BTN_START",
+                 "BTN_THUMBL", "BTN_THUMBR"]
+
+
+def _code(name: str) -> tuple:
+    """Looks up the (type, code) pair of an event code name."""
+    key = event_keys[name]
+    return key >> 16, key & 0xffff
+
+
+def _stick_sweep(rng: random.Random, index: int) -> frame_t:
+    """Both sticks circle at different speeds, as when a player holds them at an angle and rotates."""
+    angle = index * 0.05
+    radius = 20000 + 10000 * math.sin(index * 0.01)
+    return [(*_code("ABS_X"), int(radius * math.cos(angle))),
+            (*_code("ABS_Y"), int(radius * math.sin(angle))),
+            (*_code("ABS_RX"), int(radius * math.cos(-angle * 0.7))),
+            (*_code("ABS_RY"), int(radius * math.sin(-angle * 0.7)))]
+
+
+def _button_mash(rng: random.Random, index: int) -> frame_t:
+    """A random face button or bumper is pressed or released."""
+    return [(*_code(rng.choice(_button_codes)), rng.randint(0, 1))]
+
+
+def _hat_flick(rng: random.Random, index: int) -> frame_t:
+    """The directional pad is flicked in a random direction or released."""
+    return [(*_code(rng.choice(["ABS_HAT0X", "ABS_HAT0Y"])), rng.choice([-1, 0, 1]))]
+
+
+def _trigger_pull(rng: random.Random, index: int) -> frame_t:
+    """Both triggers are pulled and released smoothly."""
+    value = int(511.5 + 511.5 * math.sin(index * 0.03))
+    return [(*_code("ABS_Z"), value), (*_code("ABS_RZ"), 1023 - value)]
+
+
+def _mixed(rng: random.Random, index: int) -> frame_t:
+    """A realistic mix dominated by stick motion with occasional buttons, hat flicks and trigger pulls."""
+    generator = rng.choices([_stick_sweep, _trigger_pull, _button_mash, _hat_flick], weights=[80, 10, 7, 3])[0]
+    return generator(rng, index)
+
+
+scenarios: Dict[str, Callable[[random.Random, int], frame_t]] = {
+    "stick_sweep": _stick_sweep,
+    "button_mash": _button_mash,
+    "hat_flick": _hat_flick,
+    "trigger_pull": _trigger_pull,
+    "mixed": _mixed,
+}
+
+
+class VirtualGamepad:
+    """
+    A simulated gamepad producing a synthetic stream of evdev events, usable as the gamepad of a controller in place
+    of a physical device. The events are generated up front from a named scenario, each report followed by a
+    SYN_REPORT, and are timestamped as if they arrived at the configured rate. Reads cycle through the stream forever.
+    """
+
+    default_event_count = 100_000  # Number of events generated before the stream repeats.
+    default_batch_size = 64  # Maximum number of events returned by a single read.
+
+    def __init__(self,
+                 scenario: str = "mixed",
+                 rate: float = 1000.0,
+                 event_count: int = default_event_count,
+                 batch_size: int = default_batch_size,
+                 seed: int = 0) -> None:
+        """
+        Generates the event stream of a virtual gamepad.
+
+        Args:
+            scenario (str): The name of the event mix, one of the keys of scenarios.
+            rate (float): The simulated number of events per second, used for the event timestamps.
+            event_count (int): The number of events to generate before the stream repeats.
+            batch_size (int): The maximum number of events returned by a single read.
+            seed (int): The seed of the random generator, so that streams are reproducible.
+        """
+        if scenario not in scenarios:
+            raise ValueError(f"Unknown scenario '{scenario}', expected one of {sorted(scenarios)}.")
+        generator = scenarios[scenario]
+        rng = random.Random(seed)
+        syn_report = (EV_SYN, 0, 0)
+        self.__events: List[raw_event_t] = []
+        index = 0
+        while len(self.__events) < event_count:
+            for ev_type, code, value in generator(rng, index) + [syn_report]:
+                microseconds = round(len(self.__events) * 1000000 / rate)
+                self.__events.append((microseconds // 1000000, microseconds % 1000000, ev_type, code, value))
+            index += 1
+        del self.__events[event_count:]
+        self.__batch_size = batch_size
+        self.__position = 0
+
+    def events(self) -> List[raw_event_t]:
+        """
+        Returns:
+            List[raw_event_t]: The whole generated event stream.
+        """
+        return self.__events
+
+    def read_raw(self) -> Iterator[raw_event_t]:
+        """
+        Returns the next batch of events, wrapping around at the end of the stream.
+
+        Returns:
+            Iterator[raw_event_t]: An iterator over (seconds, microseconds, type, code, value) tuples.
+        """
+        position = self.__position
+        end = position + self.__batch_size
+        batch = self.__events[position:end]
+        self.__position = end if end < len(self.__events) else 0
+        return iter(batch)
+
+    def read(self) -> List[EvdevEvent]:
+        """
+        Returns the next batch of events decoded like the events of the 'inputs' library.
+
+        Returns:
+            List[EvdevEvent]: The decoded events.
+        """
+        return [EvdevEvent(seconds + microseconds / 1000000, ev_type, code_names[event_key(ev_type, code)], value)
+                for seconds, microseconds, ev_type, code, value in self.read_raw()]
@@ -0,0 +1 @@
+from .shared_state import SharedStatePublisher, SharedStateReader
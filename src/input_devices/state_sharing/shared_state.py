@@ -0,0 +1,202 @@
+import mmap
+import os
+from multiprocessing import shared_memory
+from struct import Struct
+from time import perf_counter, sleep
+from typing import Optional, Type
+from ..xbox_controller import XboxControllerGen4Snapshot
+
+try:
+    import _posixshmem  # The shm_open of SharedMemory, used to map POSIX blocks without the resource tracker
+except ImportError:
+    _posixshmem = None  # Windows blocks are not tracked
+
+# A shared state block starts with a header holding the sequence number of the seqlock and the number of fields,
+# followed by every snapshot field as a double. The sequence is odd while the publisher writes the fields.
+_header_struct = Struct('<QI4x')
+_sequence_struct = Struct('<Q')
+
+
+def _fields_struct(snapshot_type: Type) -> Struct:
+    """Builds the struct packing every field of a snapshot type as a double."""
+    return Struct(f'<{len(snapshot_type._fields)}d')
+
+
+def _attach(name: str):
+    """
+    Attaches to an existing shared memory block without registering it with the resource tracker, which would
+    otherwise remove the block when the reading process exits. Before Python 3.13, which has no track argument, POSIX
+    blocks are mapped directly: unregistering them after attaching would also drop the registration of a publisher
+    sharing the same tracker, e.g. one in the same process or the parent of a multiprocessing child.
+
+    Args:
+        name (str): The name of the block.
+
+    Returns:
+        An object with the buf memoryview and the close method of a SharedMemory.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        pass
+    if _posixshmem is None:
+        return shared_memory.SharedMemory(name)
+    return _MappedBlock(name)
+
+
+class _MappedBlock:
+    """A POSIX shared memory block mapped into the process, with the buf and close members of a SharedMemory."""
+
+    def __init__(self, name: str) -> None:
+        fd = _posixshmem.shm_open("/" + name, os.O_RDWR)
+        try:
+            self.__mmap = mmap.mmap(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+        self.buf = memoryview(self.__mmap)
+
+    def close(self) -> None:
+        self.buf.release()
+        self.__mmap.close()
+
+
+class SharedStatePublisher:
+    """
+    Publishes controller snapshots into a shared memory block that any number of processes can read with
+    SharedStateReader. Updates are guarded by a seqlock, so readers get consistent snapshots without locks, pipes
+    or pickling, and never block the publisher.
+    """
+
+    def __init__(self, name: Optional[str] = None, snapshot_type: Type = XboxControllerGen4Snapshot) -> None:
+        """
+        Creates the shared memory block.
+
+        Args:
+            name (Optional[str]): The name of the block, or None for a generated unique name.
+            snapshot_type (Type): The NamedTuple type of the published snapshots, whose fields must all be numbers.
+        """
+        self.__fields_struct = _fields_struct(snapshot_type)
+        self.__memory = shared_memory.SharedMemory(name, create=True, size=_header_struct.size + self.__fields_struct.size)
+        self.__buffer = self.__memory.buf
+        self.__sequence = 0
+        _header_struct.pack_into(self.__buffer, 0, self.__sequence, len(snapshot_type._fields))
+
+    def get_name(self) -> str:
+        """
+        Returns:
+            str: The name of the shared memory block, to be passed to SharedStateReader.
+        """
+        return self.__memory.name
+
+    def publish(self, snapshot: tuple) -> None:
+        """
+        Writes a snapshot into the shared memory block.
+
+        Args:
+            snapshot (tuple): The snapshot to publish, e.g. the result of XboxControllerGen4.snapshot().
+        """
+        buffer = self.__buffer
+        sequence = self.__sequence
+        _sequence_struct.pack_into(buffer, 0, sequence + 1)  # Odd: the fields are being written
+        self.__fields_struct.pack_into(buffer, _header_struct.size, *snapshot)
+        _sequence_struct.pack_into(buffer, 0, sequence + 2)  # Even: the fields are consistent
+        self.__sequence = sequence + 2
+
+    def close(self) -> None:
+        """
+        Closes and removes the shared memory block. Readers that are still attached keep their mapping.
+        """
+        self.__buffer = None
+        self.__memory.close()
+        self.__memory.unlink()
+
+    def __enter__(self) -> 'SharedStatePublisher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedStateReader:
+    """Reads consistent snapshots published by a SharedStatePublisher in another process."""
+
+    default_read_timeout = 1.0  # Default time in seconds read waits for the publisher to finish writing a snapshot.
+
+    def __init__(self, name: str, snapshot_type: Type = XboxControllerGen4Snapshot) -> None:
+        """
+        Attaches to a shared memory block created by a SharedStatePublisher.
+
+        Args:
+            name (str): The name of the shared memory block.
+            snapshot_type (Type): The NamedTuple type of the published snapshots.
+        """
+        self.__memory = _attach(name)
+        self.__buffer = self.__memory.buf
+        self.__snapshot_type = snapshot_type
+        self.__fields_struct = _fields_struct(snapshot_type)
+        _, field_count = _header_struct.unpack_from(self.__buffer, 0)
+        if field_count != len(snapshot_type._fields):
+            self.close()
+            raise ValueError(f"The shared state {name} does not hold {snapshot_type.__name__} snapshots.")
+        # Fields annotated as bool are stored as 0.0 or 1.0 and converted back
+        annotations = getattr(snapshot_type, '__annotations__', {})
+        self.__bool_fields = [index for index, field in enumerate(snapshot_type._fields) if annotations.get(field) is bool]
+
+    def read(self, timeout: Optional[float] = default_read_timeout) -> tuple:
+        """
+        Reads the latest published snapshot, retrying while the publisher is writing it. Retries yield the CPU, so
+        the publisher is not starved when both run on the same core.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to retry, or None to retry until a consistent
+                                       snapshot is read.
+
+        Returns:
+            tuple: The snapshot, as an instance of the snapshot type.
+
+        Raises:
+            TimeoutError: If no consistent snapshot could be read within the timeout, e.g. because the publisher died
+                          while writing one.
+        """
+        buffer = self.__buffer
+        unpack_sequence = _sequence_struct.unpack_from
+        unpack_fields = self.__fields_struct.unpack_from
+        offset = _header_struct.size
+        deadline = None  # Set on the first retry, so uncontended reads do not read the clock
+        while True:
+            sequence, = unpack_sequence(buffer, 0)
+            if not sequence & 1:
+                values = unpack_fields(buffer, offset)
+                if unpack_sequence(buffer, 0)[0] == sequence:
+                    break
+            if timeout is not None:
+                if deadline is None:
+                    deadline = perf_counter() + timeout
+                elif perf_counter() >= deadline:
+                    raise TimeoutError("No consistent snapshot was published within the timeout, the publisher may have died while writing.")
+            sleep(0)
+        if self.__bool_fields:
+            values = list(values)
+            for index in self.__bool_fields:
+                values[index] = values[index] != 0.0
+        return self.__snapshot_type._make(values)
+
+    def get_sequence(self) -> int:
+        """
+        Returns:
+            int: The current sequence number, which increases by 2 with every published snapshot.
+        """
+        return _sequence_struct.unpack_from(self.__buffer, 0)[0]
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory block.
+        """
+        self.__buffer = None
+        self.__memory.close()
+
+    def __enter__(self) -> 'SharedStateReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
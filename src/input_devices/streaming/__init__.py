@@ -0,0 +1,2 @@
+from .state_streamer import StateStreamer
+from .state_receiver import StateReceiver
@@ -0,0 +1,133 @@
+import select
+import socket
+from struct import Struct
+from typing import Optional, Tuple
+from .stream_format import entry_struct, header_struct, keyframe_flag, magic, sequence_modulus, version
+from ..xbox_controller import XboxControllerGen4
+
+class StateReceiver:
+    """
+    Receives the frames sent by a StateStreamer and applies them to a local controller, so code written against a
+    connected controller, e.g. get_calibrated_* calls, snapshots and button callbacks, works with a remote one.
+    Reordered and duplicate frames are dropped; changes lost with a dropped frame are restored by the next keyframe.
+    """
+
+    max_frame_size = 65535  # Maximum size of a UDP datagram.
+
+    def __init__(self, address: Tuple[str, int], controller: Optional[XboxControllerGen4] = None) -> None:
+        """
+        Binds a UDP socket to receive frames on.
+
+        Args:
+            address (Tuple[str, int]): The host and port to listen on, e.g. ("0.0.0.0", 9000), or port 0 for any free port.
+            controller (Optional[XboxControllerGen4]): The controller to apply the received state to,
+                                                       or None to create one without a gamepad.
+        """
+        self.__controller = controller if controller is not None else XboxControllerGen4()
+        self.__value_count = len(self.__controller.get_state_store())
+        self.__keyframe_struct = Struct(f'<{self.__value_count}d')
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__socket.bind(address)
+        self.__socket.setblocking(False)
+        self.__session: Optional[int] = None  # Session of the streamer, None before the first keyframe.
+        self.__sequence = 0  # Sequence number of the last applied frame.
+        self.__lost_frame_count = 0  # Number of frames skipped in the sequence.
+
+    def get_controller(self) -> XboxControllerGen4:
+        """
+        Returns:
+            XboxControllerGen4: The controller mirroring the remote one.
+        """
+        return self.__controller
+
+    def get_address(self) -> Tuple[str, int]:
+        """
+        Returns:
+            Tuple[str, int]: The host and port the receiver is bound to.
+        """
+        return self.__socket.getsockname()
+
+    def get_lost_frame_count(self) -> int:
+        """
+        Returns:
+            int: The number of frames that never arrived or arrived out of order and were dropped.
+        """
+        return self.__lost_frame_count
+
+    def fileno(self) -> int:
+        """
+        Returns:
+            int: The file descriptor of the socket, e.g. to wait for frames with selectors.
+        """
+        return self.__socket.fileno()
+
+    def receive(self, timeout: Optional[float] = 0.0) -> int:
+        """
+        Applies all frames that have arrived, waiting for the first one up to a timeout.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait for a frame, 0 to not wait,
+                                       or None to wait indefinitely.
+
+        Returns:
+            int: The number of frames that were applied.
+        """
+        if timeout != 0.0 and not select.select([self.__socket], [], [], timeout)[0]:
+            return 0
+        applied_count = 0
+        while True:
+            try:
+                frame = self.__socket.recv(self.max_frame_size)
+            except BlockingIOError:
+                return applied_count
+            if self.__apply(frame):
+                applied_count += 1
+
+    def __apply(self, frame: bytes) -> bool:
+        """
+        Private method to apply a single frame to the controller.
+
+        Args:
+            frame (bytes): The received datagram.
+
+        Returns:
+            bool: True if the frame was applied, False if it was invalid, stale or precedes the first keyframe.
+        """
+        if len(frame) < header_struct.size:
+            return False
+        frame_magic, frame_version, flags, session, sequence, timestamp, count = header_struct.unpack_from(frame)
+        if frame_magic != magic or frame_version != version:
+            return False
+        if flags & keyframe_flag:
+            if count != self.__value_count or len(frame) != header_struct.size + self.__keyframe_struct.size:
+                return False
+            values = enumerate(self.__keyframe_struct.unpack_from(frame, header_struct.size))
+        else:
+            if len(frame) != header_struct.size + count * entry_struct.size:
+                return False
+            values = list(entry_struct.iter_unpack(frame[header_struct.size:]))
+            if any(index >= self.__value_count for index, _ in values):
+                return False
+        if session == self.__session:
+            distance = (sequence - self.__sequence) % sequence_modulus
+            if distance == 0 or distance >= sequence_modulus // 2:
+                return False  # Duplicate or reordered frame older than the applied state
+            self.__lost_frame_count += distance - 1
+        elif not flags & keyframe_flag:
+            return False  # Changes are meaningless without the keyframe of their session
+        self.__session = session
+        self.__sequence = sequence
+        self.__controller._load_state(values)  # The sender clock is unrelated to the local one, buttons debounce on receipt
+        return True
+
+    def close(self) -> None:
+        """
+        Closes the socket of the receiver.
+        """
+        self.__socket.close()
+
+    def __enter__(self) -> 'StateReceiver':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
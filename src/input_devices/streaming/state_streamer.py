@@ -0,0 +1,78 @@
+import random
+import socket
+from array import array
+from struct import Struct
+from time import perf_counter
+from typing import Optional, Tuple
+from .stream_format import entry_struct, header_struct, keyframe_flag, magic, sequence_modulus, version
+
+class StateStreamer:
+    """
+    Streams the state of a controller over UDP. Each frame carries only the controls that changed since the previous
+    frame, and a full keyframe is sent periodically so receivers recover from lost datagrams and late joins.
+    Frames are numbered, so receivers can drop reordered frames and count lost ones.
+    """
+
+    default_keyframe_interval = 1.0  # Time in seconds between full keyframes.
+
+    def __init__(self, controller, address: Tuple[str, int], keyframe_interval: float = default_keyframe_interval) -> None:
+        """
+        Initializes a StateStreamer sending the state of a controller to an address.
+
+        Args:
+            controller: The controller to stream, e.g. an XboxControllerGen4.
+            address (Tuple[str, int]): The host and port of the receiver.
+            keyframe_interval (float): The time in seconds between full keyframes.
+        """
+        self.__store = controller.get_state_store()
+        self.__address = address
+        self.__keyframe_interval = keyframe_interval
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__keyframe_struct = Struct(f'<{len(self.__store)}d')
+        self.__previous: Optional[array] = None  # Values sent in the previous frame, None before the first keyframe.
+        self.__last_keyframe_time = 0.0  # perf_counter time at which the last keyframe was sent.
+        self.__session = random.getrandbits(32)  # Identifies the frames of this streamer.
+        self.__sequence = 0  # Sequence number of the next frame.
+
+    def send(self, force_keyframe: bool = False) -> bool:
+        """
+        Sends the changes since the previous frame, or a keyframe if one is due. Meant to be called after every
+        controller update; nothing is sent if no control changed and no keyframe is due.
+
+        Args:
+            force_keyframe (bool): If True, a keyframe is sent regardless of the keyframe interval.
+
+        Returns:
+            bool: True if a frame was sent, False otherwise.
+        """
+        now = perf_counter()
+        store = self.__store
+        if force_keyframe or self.__previous is None or now - self.__last_keyframe_time >= self.__keyframe_interval:
+            values = store.copy()
+            frame = header_struct.pack(magic, version, keyframe_flag, self.__session, self.__sequence, now, len(values)) \
+                    + self.__keyframe_struct.pack(*values)
+            self.__last_keyframe_time = now
+        else:
+            changed = store.diff(self.__previous)
+            if not changed:
+                return False
+            values = store.copy()
+            frame = bytearray(header_struct.pack(magic, version, 0, self.__session, self.__sequence, now, len(changed)))
+            for index in changed:
+                frame += entry_struct.pack(index, values[index])
+        self.__socket.sendto(frame, self.__address)
+        self.__previous = values
+        self.__sequence = (self.__sequence + 1) % sequence_modulus
+        return True
+
+    def close(self) -> None:
+        """
+        Closes the socket of the streamer.
+        """
+        self.__socket.close()
+
+    def __enter__(self) -> 'StateStreamer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
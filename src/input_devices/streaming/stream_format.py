@@ -0,0 +1,12 @@
+from struct import Struct
+
+# A frame is a single UDP datagram holding a header (magic, format version, flags, streamer session, sequence number, sender
+# time, value count) followed by the values. A keyframe carries every value of the state store in order, a delta frame carries
+# only the values that changed since the previous frame, each preceded by its index in the store. The session is
+# chosen randomly by each streamer, so receivers can tell a restarted streamer from reordered frames.
+magic = b"IDST"
+version = 1
+keyframe_flag = 0x01
+header_struct = Struct('<4sBBIIdH')
+entry_struct = Struct('<Hd')
+sequence_modulus = 1 << 32
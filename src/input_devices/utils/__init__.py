@@ -1,2 +1,3 @@
 from .functions import *
-from .type_hints import *
\ No newline at end of file
+from .type_hints import *
+from .optional_import import *
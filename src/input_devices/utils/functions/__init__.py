@@ -1 +1,2 @@
-from .functions import *
\ No newline at end of file
+from .functions import *
+from .array_functions import *
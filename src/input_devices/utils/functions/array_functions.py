@@ -0,0 +1,92 @@
+from ..type_hints import number_t, range_t
+from ..optional_import import optional_import
+
+__all__ = ['map_array', 'range_adjust_array', 'calibrate_array']
+
+
+def map_array(values, from_low: number_t, from_high: number_t, to_low: number_t, to_high: number_t):
+    """
+    Array version of map, converting a whole array of values from one range to another.
+    The operations are performed in the same order as in map, so the results are identical to mapping each value.
+
+    Args:
+        values (numpy.ndarray): The values to map.
+        from_low (number_t): The lower bound of the source range.
+        from_high (number_t): The upper bound of the source range.
+        to_low (number_t): The lower bound of the target range.
+        to_high (number_t): The upper bound of the target range.
+
+    Returns:
+        numpy.ndarray: The mapped values.
+    """
+    values = _as_array(values)
+    return (values - from_low) * (to_high - to_low) / (from_high - from_low) + to_low
+
+
+def range_adjust_array(values, blindspot_range: range_t, bounds: range_t, zero: number_t = None):
+    """
+    Array version of range_adjust, applying blindspot processing and normalization based on zero to a whole array of values.
+
+    Args:
+        values (numpy.ndarray): The values to adjust.
+        blindspot_range (range_t): The range within which the values are set to 0.
+        bounds (range_t): The full range of the values.
+        zero (number_t): The value that represents zero input, or None for the middle of the bounds.
+
+    Returns:
+        numpy.ndarray: The adjusted values as floats.
+    """
+    values = _as_array(values)
+    np = optional_import('numpy')
+    if zero is None:
+        zero = (bounds[0] + bounds[1]) / 2
+
+    blindspot_start, blindspot_end = blindspot_range
+    bounds_start, bounds_end = bounds
+    with np.errstate(divide='ignore', invalid='ignore'):  # Empty segments are computed but never selected
+        below = map_array(values, bounds_start, blindspot_start, bounds_start, zero - 1)
+        above = map_array(values, blindspot_end, bounds_end, zero + 1, bounds_end)
+    adjusted = np.where(values < blindspot_start, below, above)
+    adjusted[(blindspot_start <= values) & (values <= blindspot_end)] = 0
+    return adjusted.astype(np.float64, copy=False)
+
+
+def calibrate_array(values, value_range: range_t, axis_blindspot_range: range_t, axis_zero: number_t,
+                    new_minimum: number_t, new_maximum: number_t):
+    """
+    Array version of the get_calibrated_x/get_calibrated_y pipeline, first adjusting and then mapping a whole array
+    of raw axis values to a new range.
+
+    Args:
+        values (numpy.ndarray): The raw axis values.
+        value_range (range_t): The full range of raw axis values.
+        axis_blindspot_range (range_t): The range within which the axis input is ignored.
+        axis_zero (number_t): The value that represents zero input.
+        new_minimum (number_t): The lower bound of the new range.
+        new_maximum (number_t): The upper bound of the new range.
+
+    Returns:
+        numpy.ndarray: The calibrated values.
+    """
+    adjusted = range_adjust_array(values, axis_blindspot_range, value_range, axis_zero)
+    return map_array(adjusted, *value_range, new_minimum, new_maximum)
+
+
+def _as_array(values):
+    """
+    Converts the values to a NumPy array, failing with a helpful message if NumPy is not installed.
+    Integer values are widened to 64 bits, so that narrow recorded samples (e.g. int16) cannot overflow.
+
+    Args:
+        values: An array-like of values.
+
+    Returns:
+        numpy.ndarray: The values as an array.
+    """
+    np = optional_import('numpy')  # NumPy is an optional dependency, installed with the 'numpy' extra
+    if np is None:
+        raise ImportError("The array functions require NumPy, install it with 'pip install input_devices[numpy]'.")
+    values = np.asarray(values)
+    if values.dtype.kind in 'iub':
+        values = values.astype(np.int64, copy=False)
+    return values
@@ -0,0 +1 @@
+from .optional_import import *
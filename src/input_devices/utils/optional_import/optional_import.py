@@ -0,0 +1,31 @@
+import importlib
+from types import ModuleType
+from typing import Dict, Optional
+
+__all__ = ['optional_import']
+
+_modules: Dict[str, Optional[ModuleType]] = {}  # Modules imported so far, and None for the ones not installed, by name.
+
+
+def optional_import(name: str) -> Optional[ModuleType]:
+    """
+    Imports an optional dependency, such as NumPy, from the function that needs it, so importing the package does not
+    load it. The module is imported normally, under the import lock, so concurrent first calls are safe, and the result
+    is cached so that later calls, including for missing modules, cost a dictionary lookup.
+
+    Args:
+        name (str): The absolute name of the module.
+
+    Returns:
+        Optional[ModuleType]: The module, or None if it is not installed.
+    """
+    try:
+        return _modules[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    _modules[name] = module
+    return module
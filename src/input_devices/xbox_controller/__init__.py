@@ -1 +1,2 @@
-from .xbox_controller_gen4 import XboxControllerGen4
\ No newline at end of file
+from .xbox_controller_gen4 import XboxControllerGen4
+from .xbox_controller_gen4_snapshot import XboxControllerGen4Snapshot
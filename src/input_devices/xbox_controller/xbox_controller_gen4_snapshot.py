@@ -0,0 +1,30 @@
+from typing import NamedTuple
+from ..utils.type_hints import number_t
+
+class XboxControllerGen4Snapshot(NamedTuple):
+    """
+    Immutable view of every control on an Xbox controller at a single point in time. Axis values are the raw values
+    with axis inversion applied, as returned by the get_x/get_y methods of the respective controls.
+    """
+    timestamp: float  # perf_counter time at which the snapshot was published.
+    A: bool
+    B: bool
+    X: bool
+    Y: bool
+    select_button: bool
+    key_record_button: bool
+    start_button: bool
+    left_bumper: bool
+    right_bumper: bool
+    directional_pad_up: bool
+    directional_pad_down: bool
+    directional_pad_left: bool
+    directional_pad_right: bool
+    left_stick_pressed: bool
+    left_stick_x: number_t
+    left_stick_y: number_t
+    right_stick_pressed: bool
+    right_stick_x: number_t
+    right_stick_y: number_t
+    left_trigger: number_t
+    right_trigger: number_t
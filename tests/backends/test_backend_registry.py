@@ -0,0 +1,27 @@
+from src.backends import register_backend, get_backend, backend_names, find_gamepad
+from src.simulation import VirtualGamepad
+from src.xbox_controller import XboxControllerGen4
+import os
+import subprocess
+import sys
+import src
+import pytest
+
+def test_builtin_backends_are_registered():
+     assert {"inputs", "evdev", "simulated"} <= set(backend_names())
+     assert isinstance(find_gamepad("simulated"), VirtualGamepad)
+     with pytest.raises(KeyError):
+          get_backend("not-a-backend")
+
+def test_controller_connects_through_registered_backend():
+     gamepad = VirtualGamepad("button_mash", event_count=10)
+     register_backend("test", lambda: gamepad)
+     controller = XboxControllerGen4(backend="test")
+     controller.halt_until_connected()
+     assert controller.get_gamepad() is gamepad
+
+def test_import_does_not_load_device_libraries():
+     package_root = os.path.dirname(os.path.dirname(os.path.abspath(src.__file__)))
+     code = "import sys, src; print([name for name in ('inputs', 'numpy', 'asyncio', 'json') if name in sys.modules])"
+     result = subprocess.run([sys.executable, "-c", code], cwd=package_root, capture_output=True, text=True, check=True)
+     assert result.stdout.strip() == "[]"
@@ -0,0 +1,118 @@
+from src.connection import ConnectionManager, DeviceWatcher
+from src.xbox_controller import XboxControllerGen4
+from collections import namedtuple
+from threading import Timer
+from time import sleep, perf_counter
+import asyncio
+
+Event = namedtuple("Event", ["code", "state", "timestamp"])
+
+class FakeGamepad:
+     def __init__(self, path):
+          self.path = path
+          self.events = []
+          self.closed = False
+
+     def read(self):
+          if not self.path.exists():
+               raise OSError(19, "No such device")
+          events, self.events = self.events, []
+          return events
+
+     def close(self):
+          self.closed = True
+
+def device_finder(device_path):
+     return lambda: FakeGamepad(device_path) if device_path.exists() else None
+
+def test_device_watcher_detects_new_nodes(tmp_path):
+     with DeviceWatcher(str(tmp_path)) as watcher:
+          assert watcher.is_watching()
+          assert not watcher.wait(0)
+          (tmp_path / "event0").touch()
+          assert watcher.wait(1)
+          assert not watcher.wait(0)  # Notifications were consumed
+
+def test_wait_connected_wakes_on_device_creation(tmp_path):
+     device_path = tmp_path / "event0"
+     controller = XboxControllerGen4()
+     with ConnectionManager(controller, device_finder(device_path), str(tmp_path)) as manager:
+          manager.max_backoff = 60  # A rescan timer could not explain a fast wake-up
+          assert not manager.wait_connected(timeout=0.1)
+          Timer(0.2, device_path.touch).start()
+          start = perf_counter()
+          assert manager.wait_connected(timeout=10)
+          assert perf_counter() - start < 5
+          assert manager.is_connected()
+
+def test_wait_connected_async_scans_only_on_directory_changes(tmp_path):
+     device_path = tmp_path / "event0"
+     scans = []
+     def find_gamepad():
+          scans.append(perf_counter())
+          return device_finder(device_path)()
+     controller = XboxControllerGen4()
+     async def main():
+          with ConnectionManager(controller, find_gamepad, str(tmp_path)) as manager:
+               touch_times = []
+               def plug_in():
+                    touch_times.append(perf_counter())
+                    device_path.touch()
+               asyncio.get_running_loop().call_later(0.7, plug_in)
+               await asyncio.wait_for(manager.wait_connected_async(), timeout=10)
+               return touch_times[0]
+     plug_in_time = asyncio.run(main())
+     assert controller.get_gamepad() is not None
+     assert all(scan >= plug_in_time for scan in scans[1:])  # no rescans before the directory changed
+     assert scans[-1] - plug_in_time < 5
+
+def test_update_reconnects_and_keeps_callbacks(tmp_path):
+     device_path = tmp_path / "event0"
+     device_path.touch()
+     controller = XboxControllerGen4()
+     events = []
+     controller.A.on_press(lambda: events.append("press")).on_release(lambda: events.append("release"))
+     with ConnectionManager(controller, device_finder(device_path), str(tmp_path)) as manager:
+          manager.on_connect(lambda: events.append("connect")).on_disconnect(lambda: events.append("disconnect"))
+          sleep(XboxControllerGen4.bumper_debounce_time)
+          assert manager.update()
+          first_gamepad = controller.get_gamepad()
+          first_gamepad.events = [Event("BTN_SOUTH", 1, 1.0)]
+          assert manager.update()
+          device_path.unlink()  # Unplugged while A is held
+          assert not manager.update()
+          assert first_gamepad.closed and controller.get_gamepad() is None
+          assert controller.A.released()
+          assert not manager.update()
+          device_path.touch()
+          assert manager.update()
+          controller.get_gamepad().events = [Event("BTN_SOUTH", 1, 2.0)]
+          manager.update()
+     assert events == ["connect", "press", "release", "disconnect", "connect", "press"]
+
+def test_halt_until_connected_uses_backend():
+     controller = XboxControllerGen4(backend="simulated")
+     assert controller.halt_until_connected(timeout=1)
+     assert controller.get_gamepad() is not None
+
+def test_halt_until_connected_reuses_connection_manager(monkeypatch):
+     import src.profiles.profiled_controller as profiled_controller
+     managers = []
+     class CountingConnectionManager(ConnectionManager):
+          def __init__(self, *args, **kwargs):
+               super().__init__(*args, **kwargs)
+               managers.append(self)
+     monkeypatch.setattr(profiled_controller, "ConnectionManager", CountingConnectionManager)
+     controller = XboxControllerGen4(backend="simulated")
+     assert controller.halt_until_connected(timeout=1)
+     controller.set_gamepad(None)
+     assert controller.halt_until_connected(timeout=1)
+     controller.set_gamepad(None)
+     asyncio.run(asyncio.wait_for(controller.halt_until_connected_async(), timeout=5))
+     assert controller.get_gamepad() is not None
+     assert len(managers) == 1
+
+def test_halt_until_connected_async_uses_backend():
+     controller = XboxControllerGen4(backend="simulated")
+     asyncio.run(asyncio.wait_for(controller.halt_until_connected_async(), timeout=5))
+     assert controller.get_gamepad() is not None
@@ -0,0 +1,53 @@
+from src.controller_hub import ControllerHub
+from src.xbox_controller import XboxControllerGen4
+import os
+import struct
+
+def pack(ev_type, code, value):
+     return struct.pack('llHHi', 0, 0, ev_type, code, value)
+
+class Pipe:
+     def __init__(self):
+          self.read_fd, self.write_fd = os.pipe()
+          self.path = f"/proc/self/fd/{self.read_fd}"
+
+     def write(self, ev_type, code, value):
+          os.write(self.write_fd, pack(ev_type, code, value))
+
+     def close(self):
+          os.close(self.read_fd)
+          if self.write_fd is not None:
+               os.close(self.write_fd)
+
+def test_updates_only_ready_controllers():
+     pipes = [Pipe() for _ in range(3)]
+     hub = ControllerHub()
+     try:
+          controllers = [hub.connect(pipe.path) for pipe in pipes]
+          assert hub.poll(timeout=0) == 0
+          pipes[1].write(3, 0x00, 500) # ABS_X
+          assert hub.poll(timeout=1) == 1
+          assert controllers[1].left_stick.get_x() == 500
+          assert controllers[0].left_stick.get_x() == 0
+          assert controllers[2].left_stick.get_x() == 0
+     finally:
+          hub.close()
+          for pipe in pipes:
+               pipe.close()
+
+def test_disconnect_removes_controller():
+     pipes = [Pipe() for _ in range(2)]
+     hub = ControllerHub()
+     disconnected = []
+     hub.on_disconnect(disconnected.append)
+     try:
+          controllers = [hub.connect(pipe.path) for pipe in pipes]
+          os.close(pipes[0].write_fd) # all writers gone, the device reports end of file
+          pipes[0].write_fd = None
+          hub.poll(timeout=1)
+          assert disconnected == [controllers[0]]
+          assert hub.controllers() == [controllers[1]]
+     finally:
+          hub.close()
+          for pipe in pipes:
+               pipe.close()
@@ -0,0 +1,57 @@
+from src.evdev import EvdevDevice, EvdevEvent, EV_KEY, EV_ABS, EV_SYN
+from src.xbox_controller import XboxControllerGen4
+from time import sleep
+import os
+import struct
+import pytest
+
+def pack(ev_type, code, value, seconds=1, microseconds=500000):
+     return struct.pack('llHHi', seconds, microseconds, ev_type, code, value)
+
+def test_read_regular_file(tmp_path):
+     path = tmp_path / "events"
+     path.write_bytes(pack(EV_KEY, 0x130, 1) + pack(EV_ABS, 0x00, -1234) + pack(EV_SYN, 0, 0) + pack(EV_KEY, 0x2ff, 1))
+     with EvdevDevice(str(path)) as device:
+          assert device.read() == [
+               EvdevEvent(1.5, EV_KEY, "BTN_SOUTH", 1),
+               EvdevEvent(1.5, EV_ABS, "ABS_X", -1234),
+               EvdevEvent(1.5, EV_SYN, "SYN_REPORT", 0),
+               EvdevEvent(1.5, EV_KEY, "UNKNOWN", 1),
+          ]
+          with pytest.raises(EOFError):
+               device.read()
+
+def test_read_raw_in_batches(tmp_path):
+     path = tmp_path / "events"
+     path.write_bytes(b"".join(pack(EV_ABS, 0x01, value) for value in range(10)))
+     with EvdevDevice(str(path), batch_size=4) as device:
+          values = []
+          for _ in range(3):
+               values.extend(value for _, _, _, _, value in device.read_raw())
+          assert values == list(range(10))
+
+def test_read_partial_events_from_pipe():
+     read_fd, write_fd = os.pipe()
+     data = pack(EV_ABS, 0x03, 7) + pack(EV_ABS, 0x04, 8)
+     device = EvdevDevice(f"/proc/self/fd/{read_fd}", blocking=False)
+     try:
+          assert list(device.read_raw()) == [] # nothing written yet
+          os.write(write_fd, data[:30])
+          assert [event[4] for event in device.read_raw()] == [7]
+          os.write(write_fd, data[30:])
+          assert [event[4] for event in device.read_raw()] == [8]
+     finally:
+          device.close()
+          os.close(read_fd)
+          os.close(write_fd)
+
+def test_controller_reads_evdev_device(tmp_path):
+     path = tmp_path / "events"
+     path.write_bytes(pack(EV_KEY, 0x131, 1) + pack(EV_ABS, 0x10, 1) + pack(EV_ABS, 0x05, 900) + pack(EV_SYN, 0, 0))
+     with EvdevDevice(str(path)) as device:
+          controller = XboxControllerGen4(device)
+          sleep(XboxControllerGen4.bumper_debounce_time)
+          controller.update()
+          assert controller.B.pressed()
+          assert controller.directional_pad.right.pressed()
+          assert controller.right_trigger.get_y() == 900
@@ -0,0 +1,74 @@
+from src.gestures import ComboEngine
+from src.xbox_controller import XboxControllerGen4
+from collections import namedtuple
+from time import sleep
+import pytest
+
+Event = namedtuple("Event", ["code", "state", "timestamp"])
+
+class FakeGamepad:
+     def __init__(self):
+          self.events = []
+
+     def read(self):
+          events, self.events = self.events, []
+          return events
+
+def make_engine():
+     gamepad = FakeGamepad()
+     controller = XboxControllerGen4(gamepad)
+     return ComboEngine(controller.get_buttons()), controller, gamepad
+
+def feed(controller, gamepad, *events):
+     gamepad.events = [Event(*event) for event in events]
+     controller.update()
+
+def test_chord_fires_once_when_completed():
+     engine, controller, gamepad = make_engine()
+     fired = []
+     engine.on_chord(("left_bumper", "right_bumper", "A"), lambda: fired.append("chord"), window=0.2)
+     feed(controller, gamepad, ("BTN_TL", 1, 10.0), ("BTN_TR", 1, 10.05))
+     assert fired == []
+     feed(controller, gamepad, ("BTN_SOUTH", 1, 10.1), ("BTN_SOUTH", 0, 10.2), ("BTN_SOUTH", 1, 10.3))
+     assert fired == ["chord"]  # The second press of A is outside of the window
+
+def test_sequence_and_breaking_press():
+     engine, controller, gamepad = make_engine()
+     fired = []
+     up, down = ("ABS_HAT0Y", -1), ("ABS_HAT0Y", 1)
+     engine.on_sequence(("directional_pad_up", "directional_pad_up", "directional_pad_down", "directional_pad_down"),
+                        lambda: fired.append("konami"), max_gap=0.5)
+     for index, (code, state) in enumerate([up, up, down, down]):
+          feed(controller, gamepad, (code, state, 1.0 + index), (code, 0, 1.1 + index))
+     assert fired == []  # Gaps of one second are too long
+     for index, (code, state) in enumerate([up, up, down, down]):
+          feed(controller, gamepad, (code, state, 10.0 + index * 0.2), (code, 0, 10.1 + index * 0.2))
+     assert fired == ["konami"]
+     for index, (code, state) in enumerate([up, up, ("BTN_SOUTH", 1), down, down]):
+          feed(controller, gamepad, (code, state, 20.0 + index * 0.2), (code, 0, 20.1 + index * 0.2))
+     assert fired == ["konami"]
+
+def test_shared_prefix_keeps_gaps_per_sequence():
+     engine, controller, gamepad = make_engine()
+     fired = []
+     engine.on_double_tap("A", lambda: fired.append("fast"), max_gap=0.1)
+     engine.on_sequence(("A", "A", "B"), lambda: fired.append("slow"), max_gap=1.0)
+     feed(controller, gamepad, ("BTN_SOUTH", 1, 1.0), ("BTN_SOUTH", 0, 1.05))
+     feed(controller, gamepad, ("BTN_SOUTH", 1, 1.5), ("BTN_SOUTH", 0, 1.55))
+     feed(controller, gamepad, ("BTN_EAST", 1, 2.0))
+     assert fired == ["slow"]
+
+def test_hold_fires_after_duration_unless_released():
+     engine, controller, gamepad = make_engine()
+     fired = []
+     engine.on_hold("B", 0.05, lambda: fired.append("hold"))
+     feed(controller, gamepad, ("BTN_EAST", 1, 1.0))
+     assert engine.poll() == 0
+     sleep(0.06)
+     assert engine.poll() == 1
+     feed(controller, gamepad, ("BTN_EAST", 0, 2.0), ("BTN_EAST", 1, 3.0), ("BTN_EAST", 0, 4.0))
+     sleep(0.06)
+     assert engine.poll() == 0
+     assert fired == ["hold"]
+     with pytest.raises(KeyError):
+          engine.on_hold("not_a_button", 1.0, lambda: None)
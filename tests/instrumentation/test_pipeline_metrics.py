@@ -0,0 +1,94 @@
+from src.instrumentation import LatencyHistogram, PipelineMetrics
+from src.xbox_controller import XboxControllerGen4
+from src.profiles import ProfiledController
+from collections import namedtuple
+from time import sleep
+import json
+import pytest
+
+Event = namedtuple("Event", ["code", "state", "timestamp"], defaults=[None])
+
+class FakeGamepad:
+     def __init__(self):
+          self.events = []
+
+     def read(self):
+          events, self.events = self.events, []
+          return events
+
+def test_histogram_buckets_and_percentiles():
+     histogram = LatencyHistogram((10, 100, 1000))
+     for duration in (5, 10, 50, 60, 70, 500, 5000):
+          histogram.record(duration)
+     assert histogram.get_counts() == [2, 3, 1, 1]  # bounds are inclusive, the last bucket is the overflow
+     assert histogram.get_count() == 7 and histogram.get_sum() == 5695 and histogram.get_max() == 5000
+     assert histogram.get_percentile(50) == 100
+     assert histogram.get_percentile(100) == 5000
+     histogram.reset()
+     assert histogram.get_percentile(50) is None
+     with pytest.raises(ValueError):
+          LatencyHistogram((10, 5))
+
+def test_controller_metrics():
+     gamepad = FakeGamepad()
+     controller = XboxControllerGen4(gamepad)
+     sleep(XboxControllerGen4.bumper_debounce_time)
+     metrics = PipelineMetrics()
+     controller.set_metrics(metrics)
+     presses = []
+     def on_a_pressed():
+          presses.append(True)
+     controller.A.on_press(on_a_pressed)
+     gamepad.events = [Event("BTN_SOUTH", 1, 10.0), Event("BTN_SOUTH", 0, 10.001), Event("ABS_X", 100, 10.0), Event("SYN_REPORT", 0, 10.0)]
+     controller.update()
+     assert presses == [True]
+     assert metrics.get_event_counts() == {"BTN_SOUTH": 2, "ABS_X": 1}
+     assert metrics.get_debounce_rejections() == {"A": 1}
+     assert metrics.get_histogram("read").get_count() == 1
+     assert metrics.get_histogram("decode").get_count() == 1
+     assert metrics.get_histogram("apply").get_count() == 3
+     assert metrics.get_histogram("callback").get_count() == 1
+     callbacks = metrics.get_callback_histograms()
+     assert len(callbacks) == 1 and next(iter(callbacks)).endswith("on_a_pressed")
+
+     controller.set_metrics(None)
+     gamepad.events = [Event("ABS_X", 200, 11.0)]
+     controller.update()
+     assert metrics.get_event_counts()["ABS_X"] == 1  # no longer measured
+
+def test_failing_callbacks_are_measured():
+     gamepad = FakeGamepad()
+     controller = ProfiledController("keyboard", gamepad)
+     metrics = PipelineMetrics()
+     controller.set_metrics(metrics)
+     def failing_callback():
+          raise RuntimeError("callback failed")
+     controller.get_control("key_a").on_press(failing_callback)
+     gamepad.events = [Event("KEY_A", 1, 1.0)]
+     with pytest.raises(RuntimeError):
+          controller.update()
+     assert metrics.get_histogram("callback").get_count() == 1
+     callbacks = metrics.get_callback_histograms()
+     assert len(callbacks) == 1 and next(iter(callbacks)).endswith("failing_callback")
+
+def test_metrics_dumps():
+     gamepad = FakeGamepad()
+     controller = ProfiledController("keyboard", gamepad)
+     metrics = PipelineMetrics()
+     controller.set_metrics(metrics)
+     gamepad.events = [Event("KEY_A", 1, 1.0), Event("KEY_A", 2, 1.1)]
+     controller.update()
+     document = json.loads(metrics.to_json())
+     assert document["events"] == {"KEY_A": 2}
+     assert document["stages"]["apply"]["count"] == 2
+     text = metrics.to_prometheus()
+     assert '# TYPE input_devices_stage_duration_seconds histogram' in text
+     assert 'input_devices_stage_duration_seconds_bucket{stage="apply",le="+Inf"} 2' in text
+     assert 'input_devices_stage_duration_seconds_count{stage="read"} 1' in text
+     assert 'input_devices_events_total{code="KEY_A"} 2' in text
+     metrics.reset()
+     assert metrics.get_event_counts() == {} and metrics.get_histogram("apply").get_count() == 0
+     gamepad.events = [Event("KEY_A", 1, 2.0)]
+     controller.update()  # measuring resumes from a clean state
+     assert metrics.get_event_counts() == {"KEY_A": 1}
+     assert metrics.get_histogram("decode").get_count() == 1 and metrics.get_histogram("apply").get_count() == 1
@@ -0,0 +1,105 @@
+from src.profiles import ProfiledController, parse_profile, load_profile, load_profile_file, register_profile, profile_names
+from src.xbox_controller import XboxControllerGen4Snapshot
+from src.evdev import event_keys
+from collections import namedtuple
+import json
+import os
+import pytest
+
+Event = namedtuple("Event", ["code", "state", "timestamp"], defaults=[None])
+
+class FakeDevice:
+     def __init__(self):
+          self.events = []
+
+     def read(self):
+          events, self.events = self.events, []
+          return events
+
+class FakeRawDevice(FakeDevice):
+     def read_raw(self):
+          return self.read()
+
+def raw(code, value, seconds=0):
+     key = event_keys[code]
+     return (seconds, 0, key >> 16, key & 0xffff, value)
+
+def test_builtin_profiles():
+     assert {"xbox_gen4", "dualshock4", "dualsense", "generic_joystick", "keyboard"} <= set(profile_names())
+     assert load_profile("xbox_gen4") is load_profile("xbox_gen4")  # parsed once
+     assert load_profile("xbox_gen4").field_names() == list(XboxControllerGen4Snapshot._fields[1:])
+     with pytest.raises(KeyError):
+          load_profile("not-a-profile")
+
+def test_invalid_profiles():
+     with pytest.raises(ValueError):
+          parse_profile({"name": "bad", "buttons": {"A": "BTN_NOT_A_CODE"}})
+     with pytest.raises(ValueError):
+          parse_profile({"name": "bad", "buttons": {"A": "BTN_SOUTH", "B": "BTN_SOUTH"}})
+     with pytest.raises(ValueError):
+          parse_profile({"name": "bad", "buttons": {"stick_x": "BTN_SOUTH"}, "sticks": {"stick": {"x": "ABS_X", "y": "ABS_Y", "range": [0, 255]}}})
+     with pytest.raises(ValueError):
+          parse_profile({"name": "bad", "axes": {"throttle": {"code": "ABS_THROTTLE"}}})
+
+def test_dualshock4_decoding():
+     device = FakeDevice()
+     controller = ProfiledController("dualshock4", device)
+     device.events = [Event("BTN_SOUTH", 1, 1.0), Event("ABS_HAT0X", 1, 1.0), Event("ABS_X", 255, 1.0),
+                      Event("ABS_Y", 0, 1.0), Event("ABS_Z", 128, 1.0), Event("BTN_THUMBR", 1, 1.0)]
+     controller.update()
+     snapshot = controller.snapshot()
+     assert type(snapshot).__name__ == "Dualshock4Snapshot"
+     assert snapshot.cross and snapshot.directional_pad_right and snapshot.right_stick_pressed
+     assert not snapshot.circle and not snapshot.directional_pad_left
+     assert (snapshot.left_stick_x, snapshot.left_stick_y, snapshot.l2) == (255, 0, 128)
+     assert set(controller.get_buttons()) == {name for name, kind in type(snapshot).__annotations__.items() if kind is bool}
+     controller.reset_state()
+     assert not controller.get_control("cross").pressed()
+
+def test_prebuilt_calibrations():
+     profile = parse_profile({
+          "name": "calibrated",
+          "sticks": {"stick": {"x": "ABS_X", "y": "ABS_Y", "range": [0, 255], "invert_y": True, "deadzone": 0.2}},
+          "axes": {"throttle": {"code": "ABS_THROTTLE", "range": [0, 255], "blindspot": [0, 10], "zero": 0, "calibrated_range": [0, 1]}},
+     })
+     device = FakeDevice()
+     controller = ProfiledController(profile, device)
+     device.events = [Event("ABS_X", 128), Event("ABS_Y", 0), Event("ABS_THROTTLE", 255)]
+     controller.update()
+     x, y = controller.get_control("stick").get_calibrated()
+     assert x == pytest.approx(0, abs=0.01)
+     assert y == pytest.approx(1, abs=0.001)  # inverted: pushing the stick up reads positive
+     assert controller.get_control("throttle").get_calibrated_y() == pytest.approx(1)
+
+def test_keyboard_autorepeat_keeps_keys_pressed():
+     device = FakeRawDevice()
+     keyboard = ProfiledController("keyboard", device)
+     device.events = [raw("KEY_A", 1), raw("KEY_A", 2), raw("KEY_A", 2), raw("KEY_LEFTSHIFT", 1)]
+     keyboard.update()
+     assert keyboard.snapshot().key_a and keyboard.snapshot().key_leftshift
+     device.events = [raw("KEY_A", 0)]
+     keyboard.update()
+     assert not keyboard.snapshot().key_a
+
+def test_raw_axis_coalescing():
+     device = FakeRawDevice()
+     joystick = ProfiledController("generic_joystick", device, coalesce_axes=True)
+     device.events = [raw("ABS_X", value) for value in range(100)] + [raw("BTN_TRIGGER", 1)]
+     joystick.update()
+     assert joystick.snapshot().stick_x == 99 and joystick.snapshot().trigger
+     assert joystick.get_coalesced_event_count() == 99
+
+def test_profile_files_are_cached_until_changed(tmp_path):
+     path = tmp_path / "pad.json"
+     path.write_text(json.dumps({"name": "pad", "buttons": {"fire": "BTN_TRIGGER"}}))
+     first = load_profile_file(str(path))
+     assert load_profile_file(str(path)) is first
+     path.write_text(json.dumps({"name": "pad", "buttons": {"fire": "BTN_TRIGGER", "jump": "BTN_THUMB"}}))
+     os.utime(path, ns=(0, 10**9))
+     assert load_profile_file(str(path)).field_names() == ["fire", "jump"]
+
+def test_registered_profiles_replace_cached_ones():
+     register_profile("test_pad", {"buttons": {"fire": "BTN_TRIGGER"}})
+     assert load_profile("test_pad").field_names() == ["fire"]
+     register_profile("test_pad", {"buttons": {"jump": "BTN_THUMB"}})
+     assert load_profile("test_pad").field_names() == ["jump"]
@@ -0,0 +1,64 @@
+from src.recording import EventRecorder, EventReplayer
+from src.evdev import EvdevDevice
+from src.xbox_controller import XboxControllerGen4
+from collections import namedtuple
+from time import sleep, perf_counter
+import struct
+import pytest
+
+Event = namedtuple("Event", ["timestamp", "code", "state"])
+
+def pack(seconds, microseconds, ev_type, code, value):
+     return struct.pack('llHHi', seconds, microseconds, ev_type, code, value)
+
+def test_record_and_replay_raw(tmp_path):
+     events = [(10, 0, 1, 0x130, 1), (10, 1000, 3, 0x00, -500), (10, 2000, 0, 0, 0)]
+     with EventRecorder(str(tmp_path / "session.rec")) as recorder:
+          recorder.write_raw(events)
+          assert recorder.count() == 3
+     with EventReplayer(str(tmp_path / "session.rec")) as replayer:
+          assert len(replayer) == 3
+          assert list(replayer.read_raw()) == events
+          with pytest.raises(EOFError):
+               replayer.read_raw()
+
+def test_record_decoded_events(tmp_path):
+     with EventRecorder(str(tmp_path / "session.rec")) as recorder:
+          recorder.write([Event(1.25, "ABS_RZ", 800), Event(1.5, "NOT_A_CODE", 1)])
+     with EventReplayer(str(tmp_path / "session.rec")) as replayer:
+          assert list(replayer.read_raw()) == [(1, 250000, 3, 0x05, 800)]
+
+def test_controller_recording_replays_identically(tmp_path):
+     device_path = tmp_path / "device"
+     device_path.write_bytes(pack(5, 0, 1, 0x131, 1) + pack(5, 100, 3, 0x01, 1234) + pack(5, 200, 3, 0x02, 99))
+     recorder = EventRecorder(str(tmp_path / "session.rec"))
+     with EvdevDevice(str(device_path)) as device:
+          controller = XboxControllerGen4(device)
+          controller.set_recorder(recorder)
+          sleep(XboxControllerGen4.bumper_debounce_time)
+          controller.update()
+     recorder.close()
+
+     with EventReplayer(str(tmp_path / "session.rec")) as replayer:
+          replayed = XboxControllerGen4(replayer)
+          sleep(XboxControllerGen4.bumper_debounce_time)
+          replayed.update()
+          assert replayed.B.pressed()
+          assert replayed.left_stick.get_y() == controller.left_stick.get_y()
+          assert replayed.left_trigger.get_y() == 99
+
+def test_replay_speed(tmp_path):
+     with EventRecorder(str(tmp_path / "session.rec")) as recorder:
+          recorder.write_raw([(0, 0, 3, 0x00, 1), (0, 100000, 3, 0x00, 2), (0, 200000, 3, 0x00, 3)])
+     with EventReplayer(str(tmp_path / "session.rec"), speed=2.0) as replayer:
+          start = perf_counter()
+          values = []
+          while len(values) < 3:
+               values.extend(event[4] for event in replayer.read_raw())
+          assert values == [1, 2, 3]
+          assert 0.09 <= perf_counter() - start < 0.5 # 0.2 seconds of events replayed twice as fast
+
+def test_rejects_other_files(tmp_path):
+     (tmp_path / "other").write_bytes(b"not a recording")
+     with pytest.raises(ValueError):
+          EventReplayer(str(tmp_path / "other"))
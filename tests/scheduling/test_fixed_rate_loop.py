@@ -0,0 +1,50 @@
+from src.scheduling import FixedRateLoop
+from time import perf_counter, sleep
+import pytest
+
+class CountingController:
+     def __init__(self):
+          self.updates = 0
+
+     def update(self):
+          self.updates += 1
+
+def test_runs_frames_at_rate():
+     first, second = CountingController(), CountingController()
+     ticks = []
+     loop = FixedRateLoop(200).add_controller(first).add_controller(second)
+     loop.on_tick(lambda now, delta_time: ticks.append((now, delta_time, first.updates)))
+     start = perf_counter()
+     loop.run(frames=20)
+     elapsed = perf_counter() - start
+     assert first.updates == second.updates == 20
+     assert [updates for _, _, updates in ticks] == list(range(1, 21))  # controllers are updated before the handlers
+     assert elapsed == pytest.approx(19 * loop.get_period(), abs=0.03)  # the first frame starts at once
+     assert ticks[0][1] == loop.get_period()
+     statistics = loop.get_statistics()
+     assert statistics.frames == 20 and statistics.max_lateness < 0.03
+     assert not loop.is_running()
+
+def test_overrun_skips_missed_deadlines():
+     overruns = []
+     loop = FixedRateLoop(100)
+     def slow_frame(now, delta_time):
+          if not overruns and loop.get_statistics().frames == 2:
+               sleep(0.035)
+     loop.on_tick(slow_frame).on_overrun(lambda missed, lateness: overruns.append((missed, lateness)))
+     loop.run(frames=6)
+     assert len(overruns) == 1
+     missed, lateness = overruns[0]
+     assert missed >= 2 and lateness >= 0.02
+     statistics = loop.get_statistics()
+     assert statistics.overruns == 1 and statistics.missed_frames == missed
+     loop.reset_statistics()
+     assert loop.get_statistics().frames == 0
+
+def test_stop_from_handler():
+     loop = FixedRateLoop(1000)
+     loop.on_tick(lambda now, delta_time: loop.get_statistics().frames >= 4 and loop.stop())
+     loop.run()
+     assert loop.get_statistics().frames == 5
+     with pytest.raises(ValueError):
+          FixedRateLoop(0)
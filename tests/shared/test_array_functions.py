@@ -0,0 +1,26 @@
+from src.utils.functions import map, range_adjust, map_array, range_adjust_array, calibrate_array
+from src.shared import Calibration
+import pytest
+
+np = pytest.importorskip("numpy")
+
+stick_value_range = (-32768, 32767)
+
+def test_map_array_matches_map():
+     values = np.arange(-32768, 32768, 7)
+     expected = [map(int(value), *stick_value_range, -1, 1) for value in values]
+     assert map_array(values, *stick_value_range, -1, 1).tolist() == expected
+
+@pytest.mark.parametrize("blindspot_range, zero", [((-3000, 3000), 0), ((-3000, 3000), None), ((-32768, 0), 1000)])
+def test_range_adjust_array_matches_range_adjust(blindspot_range, zero):
+     values = np.arange(-32768, 32768, 7, dtype=np.int16)
+     expected = [range_adjust(int(value), blindspot_range, stick_value_range, zero) for value in values]
+     assert range_adjust_array(values, blindspot_range, stick_value_range, zero).tolist() == expected
+
+def test_calibrate_array_matches_scalar_pipeline():
+     values = np.linspace(-32768, 32767, 5001)
+     expected = [map(range_adjust(float(value), (-3000, 3000), stick_value_range, 0), *stick_value_range, 0, 100)
+                 for value in values]
+     assert calibrate_array(values, stick_value_range, (-3000, 3000), 0, 0, 100).tolist() == expected
+     calibration = Calibration(stick_value_range, (-3000, 3000), 0, 0, 100)
+     assert calibration.calibrate_array(values).tolist() == expected
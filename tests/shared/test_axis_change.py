@@ -0,0 +1,67 @@
+from src.shared import HorizontalAxisInput, VerticalAxisInput, CartesianAxisInput, Calibration, StickCalibration
+from time import perf_counter
+import pytest
+
+stick_value_range = (-1000, 1000)
+
+def test_on_change_reports_changes_above_threshold():
+     axis = HorizontalAxisInput(stick_value_range)
+     changes = []
+     axis.on_change_x(changes.append, threshold=100)
+     axis._set_x(50)
+     axis._set_x(150)
+     axis._set_x(200)
+     axis._set_x(260)
+     axis._set_x(260)
+     assert changes == [150, 260]
+
+def test_on_change_reports_blindspot_crossings_below_threshold():
+     axis = VerticalAxisInput(stick_value_range, axis_inverted=True)
+     axis.set_calibration_y(Calibration(stick_value_range, (-100, 100), 0, -1, 1))
+     changes = []
+     axis.on_change_y(changes.append, threshold=0.5)
+     axis._set_y(-50)  # Inside the blindspot, the calibrated value does not change
+     axis._set_y(-150)  # Leaves the blindspot
+     axis._set_y(-180)
+     axis._set_y(0)  # Returns to rest
+     assert len(changes) == 2
+     assert changes[0] > 0 and changes[1] == 0
+
+def test_on_change_rate_limit():
+     axis = HorizontalAxisInput(stick_value_range)
+     changes = []
+     axis.on_change_x(changes.append, min_interval=0.1)
+     axis._set_x(10, 1.0)
+     axis._set_x(20, 1.05)
+     axis._set_x(30, 1.2)
+     assert changes == [10, 30]
+
+def test_rate_limited_change_is_flushed_after_interval():
+     axis = HorizontalAxisInput(stick_value_range)
+     held = []
+     axis._set_held_change_hook(held.append)
+     changes = []
+     axis.on_change_x(changes.append, min_interval=0.1)
+     axis._set_x(10, 1.0)
+     axis._set_x(20, 1.05)  # held back, and no further event arrives
+     axis._set_x(0, 1.06)  # back to centre within the interval
+     assert changes == [10] and len(held) == 1
+     assert held[0].flush(perf_counter())  # the interval is not over yet
+     assert not held[0].flush(perf_counter() + 1)
+     assert changes == [10, 0]  # the final value is reported, not the stale one
+     assert not held[0].flush(perf_counter() + 2)
+     assert changes == [10, 0]
+
+def test_cartesian_on_change_reports_position():
+     stick = CartesianAxisInput(stick_value_range, stick_value_range)
+     stick.set_calibration(StickCalibration(stick_value_range, stick_value_range, deadzone=0.2))
+     positions = []
+     stick.on_change(lambda x, y: positions.append((x, y)), threshold=0.05)
+     stick._set_x(100)
+     stick._set_y(100)  # Still inside the round deadzone
+     stick._set_x(500)
+     stick._set_x(510)  # Below the threshold
+     stick._set_x(0)
+     stick._set_y(0)
+     assert len(positions) == 2
+     assert positions[0][0] > 0 and positions[1] == (0.0, 0.0)
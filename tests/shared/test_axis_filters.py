@@ -0,0 +1,75 @@
+from src.shared import (ExponentialMovingAverage, OneEuroFilter, SlewRateLimiter, MedianFilter, FilterChain,
+                        CartesianAxisInput)
+import numpy as np
+import pytest
+
+stick_value_range = (-32768, 32767)
+
+def test_exponential_moving_average():
+     average = ExponentialMovingAverage(0.5)
+     assert average.get_value() is None
+     assert average.update(100) == 100
+     assert average.update(0) == 50
+     assert average.update(0) == 25
+     with pytest.raises(ValueError):
+          ExponentialMovingAverage(0)
+
+def test_slew_rate_limiter():
+     limiter = SlewRateLimiter(max_rate=1000)
+     assert limiter.update(0, 1.0) == 0
+     assert limiter.update(5000, 1.5) == 500
+     assert limiter.update(-5000, 2.0) == 0
+     assert limiter.update(20, 3.0) == 20
+
+def test_median_filter_removes_spikes():
+     median = MedianFilter(3)
+     outputs = [median.update(value) for value in (10, 10, 30000, 10, 12)]
+     assert outputs == [10, 10, 10, 10, 12]
+
+def test_one_euro_filter_smooths_at_rest_and_follows_motion():
+     slow = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+     fast = OneEuroFilter(min_cutoff=1.0, beta=0.1)
+     for index in range(1, 11):
+          slow.update(index * 1000, index * 0.01)
+          fast.update(index * 1000, index * 0.01)
+     assert slow.get_value() < fast.get_value() < 10000
+     assert fast.update(fast.get_value() + 1, 0.1) == fast.get_value()  # Same timestamp, no new rate information
+
+@pytest.mark.parametrize("make_filter", [
+     lambda: ExponentialMovingAverage(0.3),
+     lambda: ExponentialMovingAverage(0.01),
+     lambda: MedianFilter(4),
+     lambda: FilterChain(MedianFilter(5), ExponentialMovingAverage(0.2)),
+     lambda: SlewRateLimiter(1e6),
+])
+def test_filter_array_matches_incremental_updates(make_filter):
+     values = np.random.default_rng(0).integers(*stick_value_range, size=5000)
+     timestamps = np.arange(values.size) * 0.001
+     incremental = make_filter()
+     expected = [incremental.update(value, timestamp) for value, timestamp in zip(values[:3000], timestamps[:3000])]
+     bulk = make_filter()
+     result = bulk.filter_array(values[:3000], timestamps[:3000])
+     assert result == pytest.approx(expected, rel=1e-9, abs=1e-6)
+     # The bulk path continues from the state left by the samples filtered so far
+     expected = [incremental.update(value, timestamp) for value, timestamp in zip(values[3000:], timestamps[3000:])]
+     assert bulk.filter_array(values[3000:], timestamps[3000:]) == pytest.approx(expected, rel=1e-9, abs=1e-6)
+
+def test_axis_filter_is_updated_on_set_and_respects_inversion():
+     axis = CartesianAxisInput(stick_value_range, stick_value_range, vertical_axis_inverted=True)
+     with pytest.raises(ValueError):
+          axis.get_filtered_x()
+     axis.set_filter_x(ExponentialMovingAverage(0.5))
+     axis.set_filter_y(ExponentialMovingAverage(0.5))
+     assert axis.get_filtered_x() == 0
+     axis._set_x(1000, 1.0)
+     axis._set_x(0, 1.1)
+     axis._set_y(400)
+     assert axis.get_filtered_x() == 500
+     assert axis.get_filtered_y() == -400
+     assert axis.get_x() == 0
+
+def test_filter_array_without_numpy_explains_how_to_install_it(monkeypatch):
+     import src.shared.axis_filters as axis_filters
+     monkeypatch.setattr(axis_filters, "optional_import", lambda name: None)
+     with pytest.raises(ImportError, match=r"input_devices\[numpy\]"):
+          MedianFilter(3).filter_array([1.0, 2.0])
@@ -1,5 +1,6 @@
 from src.shared import Button
-from time import sleep
+from time import sleep, perf_counter
+import pytest
 
 sleep_time = Button.default_debounce_time
 
@@ -127,4 +128,44 @@ def test_quick_press_release():
      sleep(sleep_time // 2)
      button._set_state(True) # press
      button._set_state(False) # release
-     assert counter == 0
\ No newline at end of file
+     assert counter == 0
+
+def test_event_timestamp_debounce():
+     button = Button()
+     counter = 0
+     def increase_counter():
+          nonlocal counter 
+          counter += 1
+
+     button.on_press(increase_counter)
+     button.on_release(increase_counter)
+     # a burst of events processed at once is debounced on the event timestamps, not on the processing time
+     start = perf_counter() + sleep_time # past the debounce window that starts when the button is created
+     button._set_state(True, start)
+     button._set_state(False, start + sleep_time * 1.25)
+     button._set_state(True, start + sleep_time * 1.5) # bounce
+     assert counter == 2
+     assert button.released()
+
+def test_backward_timestamp_debounce():
+     button = Button()
+     start = perf_counter() + sleep_time
+     button._set_state(True, start)
+     button._set_state(False, start - sleep_time / 2)  # reordered event just before the accepted press
+     assert button.pressed() and button.get_press_time() == start
+     button._set_state(False, start - 1000.0)  # a different clock source, far from the last change
+     assert button.released() and button.get_release_time() == start - 1000.0
+     button._set_state(True, start - 1000.0 + sleep_time / 2)  # debounced on the new clock
+     assert button.released()
+
+def test_press_time_and_hold_duration():
+     button = Button()
+     assert button.get_press_time() is None
+     assert button.get_hold_duration() == 0
+     start = perf_counter() + sleep_time
+     button._set_state(True, start)
+     assert button.get_press_time() == start
+     assert button.get_hold_duration(now=start + 0.25) == pytest.approx(0.25)
+     button._set_state(False, start + 1.0)
+     assert button.get_release_time() == start + 1.0
+     assert button.get_hold_duration() == pytest.approx(1.0)
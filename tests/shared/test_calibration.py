@@ -0,0 +1,52 @@
+from src.shared import Calibration, CartesianAxisInput, VerticalAxisInput
+from src.utils.functions import map, range_adjust
+import pytest
+
+stick_value_range = (-32768, 32767)
+trigger_value_range = (0, 1023)
+
+def reference(value, value_range, blindspot_range, zero, new_minimum, new_maximum):
+     return map(range_adjust(value, blindspot_range, value_range, zero), *value_range, new_minimum, new_maximum)
+
+@pytest.mark.parametrize("value_range, blindspot_range, zero, new_range", [
+     (stick_value_range, (-3000, 3000), 0, (-1, 1)),
+     (stick_value_range, (-3000, 3000), 1000, (0, 100)),
+     (trigger_value_range, (0, 0), None, (0, 1)),
+     (trigger_value_range, (10, 30), None, (-5, 5)),
+])
+def test_compiled_matches_reference(value_range, blindspot_range, zero, new_range):
+     calibration = Calibration(value_range, blindspot_range, zero, *new_range)
+     for value in range(value_range[0], value_range[1] + 1, 13):
+          expected = reference(value, value_range, blindspot_range, zero, *new_range)
+          assert calibration.calibrate(value) == pytest.approx(expected, abs=1e-9)
+
+@pytest.mark.parametrize("value_range, blindspot_range, zero, new_range", [
+     (stick_value_range, (-3000, 3000), 0, (-1, 1)),
+     (trigger_value_range, (10, 30), None, (-5, 5)),
+])
+def test_lookup_table_matches_reference(value_range, blindspot_range, zero, new_range):
+     calibration = Calibration(value_range, blindspot_range, zero, *new_range, lookup_table=True)
+     for value in range(value_range[0], value_range[1] + 1, 13):
+          assert calibration.calibrate(value) == reference(value, value_range, blindspot_range, zero, *new_range)
+     assert calibration.calibrate(value_range[1] + 1) == pytest.approx(
+          reference(value_range[1] + 1, value_range, blindspot_range, zero, *new_range)) # outside of the table
+
+def test_attached_calibration():
+     input = CartesianAxisInput(stick_value_range, stick_value_range, vertical_axis_inverted=True)
+     input.set_calibration_x(Calibration(stick_value_range, (-3000, 3000), 0, -1, 1, lookup_table=True))
+     input.set_calibration_y(Calibration(stick_value_range, (-3000, 3000), 0, -1, 1))
+     input._set_x(10000)
+     input._set_y(10000)
+     assert input.get_calibrated_x() == input.get_calibrated_x((-3000, 3000), 0, -1, 1)
+     assert input.get_calibrated_y() == pytest.approx(input.get_calibrated_y((-3000, 3000), 0, -1, 1))
+     input.set_calibration_x(None)
+     with pytest.raises(ValueError):
+          input.get_calibrated_x()
+
+def test_inverted_axis_calibration_uses_negated_range():
+     trigger = VerticalAxisInput((0, 1023), axis_inverted=True)
+     trigger.set_calibration_y(Calibration((-1023, 0), (-10, 0), 0, -1, 0))  # ranges in the negated values of get_y
+     trigger._set_y(1023)
+     assert trigger.get_calibrated_y() == pytest.approx(-1)
+     trigger._set_y(5)  # inside the blindspot
+     assert trigger.get_calibrated_y() == pytest.approx(0)
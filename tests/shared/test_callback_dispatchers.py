@@ -0,0 +1,101 @@
+from src.shared import Button, Backpressure, InlineDispatcher, QueueDispatcher, ThreadPoolDispatcher, AsyncioDispatcher
+from threading import Event, current_thread
+from time import sleep, perf_counter
+import asyncio
+import logging
+
+def press(button):
+     button._set_state(True)
+     button._set_state(False)
+
+def make_button(dispatcher):
+     button = Button(debounce_time=0)
+     button.set_callback_dispatcher(dispatcher)
+     return button
+
+def test_inline_dispatcher_stats():
+     dispatcher = InlineDispatcher()
+     calls = []
+     callback = lambda: calls.append(1)
+     button = make_button(dispatcher).on_press(callback)
+     press(button)
+     press(button)
+     assert calls == [1, 1]
+     stats = dispatcher.get_stats()[callback]
+     assert stats.calls == 2
+     assert stats.total_time >= stats.max_time > 0
+
+def test_queue_dispatcher_drop_oldest():
+     dispatcher = QueueDispatcher(max_pending=2, backpressure=Backpressure.DROP_OLDEST)
+     calls = []
+     for index in range(4):
+          dispatcher.dispatch(lambda index=index: calls.append(index))
+     assert dispatcher.get_dropped_count() == 2
+     assert dispatcher.process() == 2
+     assert calls == [2, 3]
+
+def test_queue_dispatcher_coalesce():
+     dispatcher = QueueDispatcher(backpressure=Backpressure.COALESCE)
+     calls = []
+     callback = lambda: calls.append(1)
+     for _ in range(5):
+          dispatcher.dispatch(callback)
+     assert dispatcher.get_pending_count() == 1
+     assert dispatcher.process() == 1
+     assert dispatcher.get_dropped_count() == 4
+     dispatcher.dispatch(callback)  # no longer pending once run
+     assert dispatcher.get_pending_count() == 1
+
+def test_thread_pool_keeps_input_processing_fast():
+     dispatcher = ThreadPoolDispatcher(max_workers=2)
+     release = Event()
+     threads = []
+     def slow():
+          threads.append(current_thread())
+          release.wait(1)
+     button = make_button(dispatcher).on_press(slow)
+     start = perf_counter()
+     press(button)
+     assert perf_counter() - start < 0.1
+     release.set()
+     dispatcher.shutdown()
+     assert threads and threads[0] is not current_thread()
+     assert dispatcher.get_stats()[slow].calls == 1
+
+def test_thread_pool_block_backpressure():
+     dispatcher = ThreadPoolDispatcher(max_workers=1, max_pending=1, backpressure=Backpressure.BLOCK)
+     calls = []
+     for index in range(5):
+          dispatcher.dispatch(lambda index=index: (sleep(0.005), calls.append(index)))
+     dispatcher.shutdown()
+     assert calls == [0, 1, 2, 3, 4]
+     assert dispatcher.get_dropped_count() == 0
+
+def test_thread_pool_reports_callback_errors(caplog):
+     errors = []
+     def fail():
+          raise ValueError("callback failed")
+     dispatcher = ThreadPoolDispatcher(max_workers=1, on_error=lambda callback, error: errors.append((callback, error)))
+     dispatcher.dispatch(fail)
+     dispatcher.dispatch(lambda: None)
+     dispatcher.shutdown()
+     assert len(errors) == 1 and errors[0][0] is fail and isinstance(errors[0][1], ValueError)
+     assert dispatcher.get_error_count() == 1
+     assert dispatcher.get_stats()[fail].calls == 1
+
+     logged = ThreadPoolDispatcher(max_workers=1)
+     with caplog.at_level(logging.ERROR):
+          logged.dispatch(fail)
+          logged.shutdown()
+     assert "callback failed" in caplog.text
+     assert logged.get_error_count() == 1
+
+def test_asyncio_dispatcher():
+     async def main():
+          dispatcher = AsyncioDispatcher()
+          called = asyncio.Event()
+          button = make_button(dispatcher).on_press(called.set)
+          press(button)
+          assert not called.is_set() # scheduled on the loop, not called inline
+          await asyncio.wait_for(called.wait(), timeout=1)
+     asyncio.run(main())
@@ -0,0 +1,90 @@
+from src.shared import ControlHistory, Button, HorizontalAxisInput
+import pytest
+
+def make_history(values, capacity=8):
+     history = ControlHistory(capacity)
+     for index, value in enumerate(values):
+          history.append(value, float(index))
+     return history
+
+def test_window_aggregates():
+     history = make_history([1, 5, 3, 7, 2])
+     assert len(history) == 5
+     assert history.count(duration=2) == 3  # samples at 2, 3 and 4
+     assert history.min(duration=2) == 2
+     assert history.max(duration=2) == 7
+     assert history.mean(duration=2) == pytest.approx(4)
+     assert history.mean() == pytest.approx(18 / 5)
+     assert history.max(duration=1, now=2) == 5
+
+def test_wraparound_keeps_newest_samples():
+     history = make_history(range(20), capacity=8)
+     assert len(history) == 8
+     segments = history.get_segments()
+     assert len(segments) == 2  # the window wraps around the end of the buffer
+     assert [value for values, _ in segments for value in values] == list(range(12, 20))
+     assert list(history.get_values(duration=2)) == [17, 18, 19]
+     assert history.mean() == pytest.approx(sum(range(12, 20)) / 8)
+     assert history.min() == 12 and history.max() == 19
+     assert history.get_latest() == (19, 19.0)
+
+def test_mean_stays_exact_after_large_values_are_overwritten():
+     history = ControlHistory(4)
+     for index in range(4):
+          history.append(1e17, float(index))
+     for index, value in enumerate([1, 2, 3, 4, 5, 6]):
+          history.append(value, 4.0 + index)
+     assert history.mean() == 4.5  # the running sum no longer carries the old values
+     assert history.mean(duration=1) == 5.5
+
+def test_backward_timestamp_clears_history():
+     history = make_history([1, 2, 3])
+     history.append(10, 0.5)  # e.g. a replay restarted
+     assert len(history) == 1
+     assert history.get_latest() == (10, 0.5)
+     assert history.mean() == 10
+
+def test_history_rejects_samples_of_another_clock():
+     history = ControlHistory(8)
+     assert history.append(1, 1.7e9)  # e.g. a kernel timestamp
+     assert not history.append(2)  # perf_counter time, not comparable with the event timestamps
+     assert history.append(3, 1.7e9 + 1)
+     assert len(history) == 2 and history.get_latest() == (3, 1.7e9 + 1)
+     history.clear()
+     assert history.append(4)  # an empty history takes the clock of its next sample
+     assert not history.append(5, 1.7e9)
+     assert history.append(6)
+     assert list(history.get_values()) == [4, 6]
+
+def test_segments_are_views():
+     history = make_history([1, 2, 3], capacity=4)
+     (values, timestamps), = history.get_segments()
+     history.append(4, 3.0)
+     history.append(5, 4.0)  # overwrites the oldest sample in place
+     assert list(values) == [5, 2, 3]  # the view shares the buffer instead of copying it
+
+def test_empty_window():
+     history = make_history([1, 2])
+     assert history.mean(duration=1, now=-5) is None
+     assert history.max(duration=1, now=-5) is None
+     assert len(history.get_values(duration=1, now=-5)) == 0
+     history.clear()
+     assert history.get_latest() is None and history.min() is None
+
+def test_invalid_capacity():
+     with pytest.raises(ValueError):
+          ControlHistory(0)
+
+def test_controls_record_history():
+     axis = HorizontalAxisInput((-100, 100), axis_inverted=True)
+     axis.set_history_x(ControlHistory(4))
+     axis._set_x(50, 1.0)
+     axis._set_x(-20, 2.0)
+     assert list(axis.get_history_x().get_values()) == [50, -20]  # raw values, not inverted
+
+     button = Button(debounce_time=0.01).set_history(ControlHistory(4))
+     button._set_state(True, 100.0)
+     button._set_state(False, 100.001)  # bounces, not recorded
+     button._set_state(False, 100.5)
+     assert list(button.get_history().get_values()) == [1.0, 0.0]
+     assert button.get_history().get_latest() == (0.0, 100.5)
@@ -0,0 +1,32 @@
+from src.shared import StateStore, Button, AxisTrigger
+from src.xbox_controller import XboxControllerGen4
+import pytest
+
+def test_controls_share_one_buffer():
+     store = StateStore()
+     button = Button(debounce_time=0, state_store=store)
+     stick = AxisTrigger((-100, 100), (-100, 100), vertical_axis_inverted=True, state_store=store)
+     assert len(store) == 4 # button, stick x, stick y and stick button
+     button._set_state(True)
+     stick._set_x(25)
+     stick._set_y(-50)
+     assert store.values().tolist() == [1.0, 25.0, -50.0, 0.0]
+     assert stick.get_y() == 50
+
+def test_copy_diff_and_serialize():
+     controller = XboxControllerGen4()
+     store = controller.get_state_store()
+     previous = store.copy()
+     data = store.to_bytes()
+     controller.left_stick._set_x(1000)
+     controller.right_trigger._set_y(512)
+     assert len(store.diff(previous)) == 2
+     store.load_bytes(data)
+     assert controller.left_stick.get_x() == 0
+     assert controller.right_trigger.get_y() == 0
+     assert store.diff(previous) == []
+     with pytest.raises(ValueError):
+          store.load_bytes(b"\0")
+
+def test_buttons_have_no_instance_dict():
+     assert not hasattr(Button(), "__dict__")
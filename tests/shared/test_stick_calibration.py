@@ -0,0 +1,46 @@
+from src.shared import StickCalibration, DeadzoneMode, AxisTrigger
+import math
+import pytest
+
+value_range = (-1000, 1000)
+
+def test_scaled_radial_deadzone_is_round():
+     calibration = StickCalibration(value_range, value_range, deadzone=0.2)
+     assert calibration.calibrate(150, 0) == (0.0, 0.0)
+     assert calibration.calibrate(120, 120) == (0.0, 0.0)  # Inside the circle, although outside a square deadzone
+     x, y = calibration.calibrate(600, 0)
+     assert x == pytest.approx(0.5) and y == 0
+     x, y = calibration.calibrate(300, 300)  # Diagonal direction is preserved
+     assert x == pytest.approx(y)
+     assert math.hypot(x, y) == pytest.approx((math.hypot(0.3, 0.3) - 0.2) / 0.8)
+     assert calibration.calibrate(1000, 1000)[0] == pytest.approx(math.sqrt(0.5))  # Corners are clamped to the circle
+
+def test_radial_deadzone_keeps_magnitude():
+     calibration = StickCalibration(value_range, value_range, deadzone=0.2, deadzone_mode=DeadzoneMode.RADIAL)
+     assert calibration.calibrate(150, 0) == (0.0, 0.0)
+     assert calibration.calibrate(600, 0)[0] == pytest.approx(0.6)
+
+def test_cross_deadzone_and_anti_deadzone():
+     calibration = StickCalibration(value_range, value_range, deadzone=0.2, deadzone_mode=DeadzoneMode.CROSS, anti_deadzone=0.1)
+     x, y = calibration.calibrate(1000, 150)
+     assert x == pytest.approx(1.0) and y == 0.0
+     assert calibration.calibrate(-210, 0)[0] == pytest.approx(-(0.1 + 0.9 * 0.01 / 0.8))
+
+def test_new_range_and_polar():
+     calibration = StickCalibration(value_range, value_range, deadzone=0.0, new_minimum=0, new_maximum=100)
+     assert calibration.calibrate(0, 0) == (50, 50)
+     assert calibration.calibrate(1000, -1000)[0] == pytest.approx(50 + 50 * math.sqrt(0.5))
+     magnitude, angle = calibration.calibrate_polar(0, 500)
+     assert magnitude == pytest.approx(0.5) and angle == pytest.approx(math.pi / 2)
+     assert calibration.calibrate_polar(0, 0) == (0.0, 0.0)
+
+def test_axis_trigger_joint_calibration():
+     stick = AxisTrigger(value_range, value_range, vertical_axis_inverted=True)
+     with pytest.raises(ValueError):
+          stick.get_calibrated()
+     stick.set_calibration(StickCalibration(value_range, value_range, deadzone=0.1))
+     stick._set_x(0)
+     stick._set_y(1000)
+     x, y = stick.get_calibrated()
+     assert x == 0 and y == pytest.approx(-1)
+     assert stick.get_calibrated_polar()[1] == pytest.approx(-math.pi / 2)
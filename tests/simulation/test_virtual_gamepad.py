@@ -0,0 +1,27 @@
+from src.simulation import VirtualGamepad, scenarios
+from src.xbox_controller import XboxControllerGen4
+import pytest
+
+@pytest.mark.parametrize("scenario", sorted(scenarios))
+def test_scenarios_drive_controller(scenario):
+     gamepad = VirtualGamepad(scenario, event_count=1000)
+     assert len(gamepad.events()) == 1000
+     controller = XboxControllerGen4(gamepad)
+     for _ in range(20):
+          controller.update()
+
+def test_reproducible_and_timestamped():
+     first = VirtualGamepad("mixed", rate=500, event_count=100, seed=3).events()
+     assert first == VirtualGamepad("mixed", rate=500, event_count=100, seed=3).events()
+     assert first[1][:2] == (0, 2000) # 500 events per second
+     assert first != VirtualGamepad("mixed", event_count=100, seed=4).events()
+
+def test_reads_wrap_around():
+     gamepad = VirtualGamepad("stick_sweep", event_count=10, batch_size=4)
+     batches = [list(gamepad.read_raw()) for _ in range(4)]
+     assert [len(batch) for batch in batches] == [4, 4, 2, 4]
+     assert batches[3] == batches[0]
+
+def test_unknown_scenario():
+     with pytest.raises(ValueError):
+          VirtualGamepad("juggling")
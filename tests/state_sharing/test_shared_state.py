@@ -0,0 +1,58 @@
+from src.state_sharing import SharedStatePublisher, SharedStateReader
+from src.state_sharing.shared_state import _attach
+from src.xbox_controller import XboxControllerGen4, XboxControllerGen4Snapshot
+from collections import namedtuple
+from multiprocessing import get_context
+import pytest
+
+class FakeGamepad:
+     def read(self):
+          return []
+
+def read_in_process(name, results):
+     with SharedStateReader(name) as reader:
+          results.put(reader.read())
+
+def test_reader_receives_published_snapshot():
+     controller = XboxControllerGen4(FakeGamepad())
+     with SharedStatePublisher() as publisher:
+          with SharedStateReader(publisher.get_name()) as reader:
+               assert reader.get_sequence() == 0
+               snapshot = controller.snapshot()._replace(A=True, left_stick_x=-1200.0, right_trigger=512.0)
+               publisher.publish(snapshot)
+               assert reader.get_sequence() == 2
+               received = reader.read()
+               assert isinstance(received, XboxControllerGen4Snapshot)
+               assert received == snapshot
+               assert received.A is True and received.B is False
+
+def test_reader_in_another_process():
+     snapshot = XboxControllerGen4(FakeGamepad()).snapshot()._replace(Y=True, right_stick_y=77.0)
+     context = get_context("spawn")
+     results = context.Queue()
+     with SharedStatePublisher() as publisher:
+          publisher.publish(snapshot)
+          process = context.Process(target=read_in_process, args=(publisher.get_name(), results))
+          process.start()
+          received = results.get(timeout=30)
+          process.join()
+     assert received == snapshot
+
+def test_reader_rejects_mismatched_snapshot_type():
+     Small = namedtuple("Small", ["timestamp", "value"])
+     with SharedStatePublisher(snapshot_type=Small) as publisher:
+          with pytest.raises(ValueError):
+               SharedStateReader(publisher.get_name())
+
+def test_read_times_out_when_publisher_died_while_writing():
+     snapshot = XboxControllerGen4(FakeGamepad()).snapshot()._replace(X=True)
+     with SharedStatePublisher() as publisher:
+          publisher.publish(snapshot)
+          with SharedStateReader(publisher.get_name()) as reader:
+               memory = _attach(publisher.get_name())
+               memory.buf[0] = 3  # odd sequence, as left by a publisher killed in the middle of publish
+               with pytest.raises(TimeoutError):
+                    reader.read(timeout=0.01)
+               memory.buf[0] = 4
+               assert reader.read() == snapshot
+               memory.close()
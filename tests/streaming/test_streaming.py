@@ -0,0 +1,128 @@
+from src.streaming import StateStreamer, StateReceiver
+from src.streaming.stream_format import header_struct, entry_struct, keyframe_flag, magic, version
+from src.xbox_controller import XboxControllerGen4
+from src.shared import Calibration
+from collections import namedtuple
+from time import perf_counter, sleep
+import struct
+import socket
+
+Event = namedtuple("Event", ["code", "state", "timestamp"])
+
+class FakeGamepad:
+     def __init__(self):
+          self.events = []
+
+     def read(self):
+          events, self.events = self.events, []
+          return events
+
+def make_link():
+     gamepad = FakeGamepad()
+     controller = XboxControllerGen4(gamepad)
+     receiver = StateReceiver(("127.0.0.1", 0))
+     streamer = StateStreamer(controller, receiver.get_address())
+     sleep(XboxControllerGen4.bumper_debounce_time)
+     return gamepad, controller, streamer, receiver
+
+def test_remote_controller_mirrors_state():
+     gamepad, controller, streamer, receiver = make_link()
+     with streamer, receiver:
+          assert streamer.send()  # Initial keyframe
+          assert receiver.receive(timeout=5) == 1
+          gamepad.events = [Event("BTN_SOUTH", 1, 10.0), Event("ABS_X", 16000, 10.0), Event("ABS_HAT0Y", -1, 10.0)]
+          controller.update()
+          assert streamer.send()
+          assert receiver.receive(timeout=5) == 1
+          remote = receiver.get_controller()
+          assert remote.A.pressed()
+          assert remote.directional_pad.up.pressed()
+          assert remote.left_stick.get_x() == 16000
+          assert remote.snapshot()[1:] == controller.snapshot()[1:]
+          remote.left_stick.set_calibration_x(Calibration(XboxControllerGen4.stick_value_range, (-1000, 1000), 0, -1, 1))
+          assert 0 < remote.left_stick.get_calibrated_x() < 1
+
+def test_delta_frames_only_carry_changes_and_skip_idle_updates():
+     gamepad, controller, streamer, receiver = make_link()
+     with streamer, receiver:
+          streamer.send()
+          receiver.receive(timeout=5)
+          assert not streamer.send()  # Nothing changed
+          gamepad.events = [Event("ABS_RZ", 700, 1.0)]
+          controller.update()
+          sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+          sink.bind(("127.0.0.1", 0))
+          with StateStreamer(controller, sink.getsockname()) as probe:
+               probe.send()  # Keyframe
+               sink.recv(65535)
+               gamepad.events = [Event("ABS_Z", 3, 1.0)]
+               controller.update()
+               probe.send()
+               frame = sink.recv(65535)
+          sink.close()
+          assert len(frame) == header_struct.size + entry_struct.size
+          assert header_struct.unpack_from(frame)[:3] == (magic, version, 0)
+
+def test_remote_button_callbacks_and_lost_frames():
+     gamepad, controller, streamer, receiver = make_link()
+     presses = []
+     receiver.get_controller().B.on_press(lambda: presses.append(True))
+     with streamer, receiver:
+          streamer.send()
+          receiver.receive(timeout=5)
+          gamepad.events = [Event("BTN_EAST", 1, 1.0)]
+          controller.update()
+          streamer.send()
+          receiver.receive(timeout=5)
+          assert presses == [True]
+
+def test_lost_frames_are_counted_and_restored_by_keyframe():
+     gamepad = FakeGamepad()
+     controller = XboxControllerGen4(gamepad)
+     receiver = StateReceiver(("127.0.0.1", 0))
+     relay = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+     relay.bind(("127.0.0.1", 0))
+     with StateStreamer(controller, relay.getsockname()) as streamer, receiver, relay:
+          frames = []
+          for code, value in (("ABS_X", 100), ("ABS_Y", 200), ("ABS_RX", 300)):
+               gamepad.events = [Event(code, value, 1.0)]
+               controller.update()
+               streamer.send()
+               frames.append(relay.recv(65535))
+          for frame in (frames[0], frames[2], frames[0]):  # Loses the second frame, then replays the first
+               relay.sendto(frame, receiver.get_address())
+          assert receiver.receive(timeout=5) + receiver.receive(timeout=0.2) == 2
+          remote = receiver.get_controller()
+          assert receiver.get_lost_frame_count() == 1
+          assert remote.right_stick.get_x() == 300 and remote.left_stick.get_y() == 0
+          streamer.send(force_keyframe=True)
+          relay.sendto(relay.recv(65535), receiver.get_address())
+          receiver.receive(timeout=5)
+          assert remote.left_stick.get_y() == -200
+
+def test_receiver_drops_delta_frames_before_keyframe_and_invalid_frames():
+     receiver = StateReceiver(("127.0.0.1", 0))
+     with receiver, socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+          sender.sendto(header_struct.pack(magic, version, 0, 7, 0, 1.0, 1) + entry_struct.pack(0, 1.0), receiver.get_address())
+          sender.sendto(b"garbage", receiver.get_address())
+          assert receiver.receive(timeout=5) == 0
+          assert receiver.get_controller().A.released()
+
+def test_remote_timestamps_do_not_debounce_local_buttons():
+     source_gamepad = FakeGamepad()
+     source = XboxControllerGen4(source_gamepad)
+     sleep(XboxControllerGen4.bumper_debounce_time)
+     source_gamepad.events = [Event("BTN_TR", 1, 1.0)]
+     source.update()
+     values = source.get_state_store().copy()
+     start = perf_counter()
+     receiver = StateReceiver(("127.0.0.1", 0))
+     sleep(XboxControllerGen4.bumper_debounce_time)
+     remote_time = start + 0.01  # the sender clock happens to be just past the creation of the remote bumpers
+     frame = header_struct.pack(magic, version, keyframe_flag, 7, 0, remote_time, len(values)) + struct.pack(f"<{len(values)}d", *values)
+     with receiver, socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+          sender.sendto(frame, receiver.get_address())
+          assert receiver.receive(timeout=5) == 1
+          remote = receiver.get_controller()
+          assert remote.right_bumper.pressed()
+          assert remote.right_bumper.get_press_time() >= start + XboxControllerGen4.bumper_debounce_time
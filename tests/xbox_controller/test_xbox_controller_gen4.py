@@ -0,0 +1,282 @@
+from src.xbox_controller import XboxControllerGen4, XboxControllerGen4Snapshot
+from src.profiles import ProfiledController, register_profile, xbox_gen4_profile
+from src.shared import SlewRateLimiter
+from src.simulation import VirtualGamepad
+from inputs import EVENT_FORMAT
+from collections import namedtuple
+from queue import Queue
+from threading import current_thread
+from time import sleep, perf_counter
+import asyncio
+import os
+import struct
+import pytest
+
+Event = namedtuple("Event", ["code", "state", "timestamp"], defaults=[None])
+sleep_time = XboxControllerGen4.bumper_debounce_time
+
+class FakeGamepad:
+     def __init__(self):
+          self.events = []
+
+     def read(self):
+          events, self.events = self.events, []
+          return events
+
+def make_controller():
+     gamepad = FakeGamepad()
+     controller = XboxControllerGen4(gamepad)
+     sleep(sleep_time)
+     return controller, gamepad
+
+def test_button_press_release():
+     controller, gamepad = make_controller()
+     gamepad.events = [Event("BTN_SOUTH", 1)]
+     controller.update()
+     assert controller.A.pressed()
+     sleep(sleep_time)
+     gamepad.events = [Event("BTN_SOUTH", 0)]
+     controller.update()
+     assert controller.A.released()
+
+def test_unrelated_events_do_not_release_buttons():
+     controller, gamepad = make_controller()
+     gamepad.events = [Event("BTN_SOUTH", 1)]
+     controller.update()
+     sleep(sleep_time)
+     gamepad.events = [Event("ABS_X", 1000), Event("BTN_EAST", 1), Event("SYN_REPORT", 0)]
+     controller.update()
+     assert controller.A.pressed()
+     assert controller.B.pressed()
+
+def test_hat_axes():
+     controller, gamepad = make_controller()
+     pad = controller.directional_pad
+     gamepad.events = [Event("ABS_HAT0Y", -1), Event("ABS_HAT0X", 1)]
+     controller.update()
+     assert pad.up.pressed() and pad.down.released()
+     assert pad.right.pressed() and pad.left.released()
+     sleep(sleep_time)
+     gamepad.events = [Event("ABS_HAT0Y", 1), Event("ABS_HAT0X", 0)]
+     controller.update()
+     assert pad.up.released() and pad.down.pressed()
+     assert pad.right.released() and pad.left.released()
+
+def test_axes():
+     controller, gamepad = make_controller()
+     gamepad.events = [Event("ABS_X", 100), Event("ABS_Y", 200), Event("ABS_RX", -300),
+                       Event("ABS_RY", -400), Event("ABS_Z", 500), Event("ABS_RZ", 600)]
+     controller.update()
+     assert controller.left_stick.get_x() == 100
+     assert controller.left_stick.get_y() == -200 # vertical stick axes are inverted
+     assert controller.right_stick.get_x() == -300
+     assert controller.right_stick.get_y() == 400
+     assert controller.left_trigger.get_y() == 500
+     assert controller.right_trigger.get_y() == 600
+
+class BlockingGamepad:
+     def __init__(self):
+          self.batches = Queue()
+
+     def read(self):
+          return self.batches.get()
+
+def wait_for(condition, timeout=1.0):
+     deadline = perf_counter() + timeout
+     while not condition() and perf_counter() < deadline:
+          sleep(0.001)
+     return condition()
+
+def test_snapshot_without_reader():
+     controller, gamepad = make_controller()
+     gamepad.events = [Event("BTN_SOUTH", 1), Event("ABS_X", 100)]
+     controller.update()
+     snapshot = controller.snapshot()
+     assert snapshot.A and not snapshot.B
+     assert snapshot.left_stick_x == 100
+
+def test_reader_publishes_snapshots():
+     gamepad = BlockingGamepad()
+     controller = XboxControllerGen4(gamepad)
+     sleep(sleep_time)
+     controller.start_reader()
+     gamepad.batches.put([Event("BTN_SOUTH", 1), Event("ABS_RZ", 700)])
+     assert wait_for(lambda: controller.snapshot().A)
+     assert controller.snapshot().right_trigger == 700
+     controller.stop_reader(timeout=0)
+
+def test_reader_queued_callbacks():
+     gamepad = BlockingGamepad()
+     controller = XboxControllerGen4(gamepad)
+     threads = []
+     controller.A.on_press(lambda: threads.append(current_thread()))
+     sleep(sleep_time)
+     controller.start_reader(queue_callbacks=True)
+     gamepad.batches.put([Event("BTN_SOUTH", 1)])
+     assert wait_for(lambda: controller.snapshot().A)
+     assert threads == []
+     assert controller.process_callbacks() == 1
+     assert threads == [current_thread()]
+     controller.stop_reader(timeout=0)
+
+def test_reader_error_is_raised():
+     class FailingGamepad:
+          def read(self):
+               raise OSError("unplugged")
+     controller = XboxControllerGen4(FailingGamepad())
+     controller.start_reader()
+     with pytest.raises(OSError):
+          wait_for(lambda: controller.snapshot() is None)
+
+class FifoGamepad:
+     """Mimics an evdev gamepad from the 'inputs' library on top of a named pipe."""
+     _evdev = True
+     codes = {0x00: "ABS_X", 0x130: "BTN_SOUTH"}
+
+     def __init__(self, path):
+          self.path = str(path)
+          os.mkfifo(self.path)
+          self.writer = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+
+     def get_char_device_path(self):
+          return self.path
+
+     def _make_event(self, tv_sec, tv_usec, ev_type, code, value):
+          return Event(self.codes[code], value)
+
+     def write(self, code, value):
+          os.write(self.writer, struct.pack(EVENT_FORMAT, 0, 0, 1, code, value))
+
+def test_async_events(tmp_path):
+     gamepad = FifoGamepad(tmp_path / "gamepad")
+     controller = XboxControllerGen4(gamepad)
+
+     async def main():
+          events = controller.events()
+          gamepad.write(0x00, 1234)
+          event = await events.__anext__()
+          assert event == Event("ABS_X", 1234)
+          assert controller.left_stick.get_x() == 1234
+          await events.aclose()
+
+     asyncio.run(main())
+
+def test_async_wait_pressed(tmp_path):
+     gamepad = FifoGamepad(tmp_path / "gamepad")
+     controller = XboxControllerGen4(gamepad)
+     sleep(sleep_time)
+
+     async def main():
+          runner = asyncio.create_task(controller.run())
+          waiter = asyncio.create_task(controller.A.wait_pressed())
+          await asyncio.sleep(0)
+          assert not waiter.done()
+          gamepad.write(0x130, 1)
+          await asyncio.wait_for(waiter, timeout=1)
+          assert controller.A.pressed()
+          runner.cancel()
+
+     asyncio.run(main())
+
+def test_axis_coalescing():
+     controller, gamepad = make_controller()
+     controller.set_axis_coalescing(True)
+     presses = []
+     controller.A.on_press(lambda: presses.append("A"))
+     controller.A.on_release(lambda: presses.append("a"))
+     gamepad.events = [Event("ABS_X", 1), Event("ABS_X", 2), Event("BTN_SOUTH", 1), Event("ABS_X", 3),
+                       Event("ABS_Y", 4), Event("ABS_Y", 5), Event("ABS_RZ", 6)]
+     controller.update()
+     assert controller.left_stick.get_x() == 3
+     assert controller.left_stick.get_y() == -5
+     assert controller.right_trigger.get_y() == 6
+     assert presses == ["A"]
+     assert controller.get_coalesced_event_count() == 3
+
+def test_stick_position_reported_once_per_batch():
+     controller, gamepad = make_controller()
+     positions = []
+     controller.left_stick.on_change(lambda x, y: positions.append((x, y)))
+     gamepad.events = [Event("ABS_X", 1000), Event("ABS_Y", 2000)]
+     controller.update()
+     gamepad.events = [Event("ABS_Y", 3000)]
+     controller.update()
+     assert positions == [(1000, -2000), (1000, -3000)]  # no half-updated (1000, 0) position
+     controller._load_state([(controller.left_stick._get_x_index(), 0.0), (controller.left_stick._get_y_index(), 0.0)])
+     assert positions[-1] == (0, 0) and len(positions) == 3
+
+def test_rate_limited_axis_reports_last_value_on_update():
+     controller, gamepad = make_controller()
+     changes = []
+     controller.right_trigger.on_change_y(changes.append, min_interval=0.05)
+     start = perf_counter()
+     gamepad.events = [Event("ABS_RZ", 800, start), Event("ABS_RZ", 0, start + 0.01)]  # released within the interval
+     controller.update()
+     assert changes == [800]
+     sleep(0.06)
+     controller.update()  # no events, the held release is reported once the interval is over
+     assert changes == [800, 0]
+
+def test_axis_coalescing_raw_events():
+     gamepad = VirtualGamepad("stick_sweep", event_count=500, batch_size=500)
+     expected = XboxControllerGen4(gamepad)
+     expected.update()
+     coalesced = XboxControllerGen4(VirtualGamepad("stick_sweep", event_count=500, batch_size=500), coalesce_axes=True)
+     coalesced.update()
+     assert coalesced.snapshot()[1:] == expected.snapshot()[1:] # same state apart from the timestamp
+     assert coalesced.get_coalesced_event_count() == 400 - 4 # 100 reports of 4 axis events, 4 final values applied
+
+def test_buttons_use_event_timestamps():
+     controller, gamepad = make_controller()
+     gamepad.events = [Event("BTN_SOUTH", 1, 10.0), Event("BTN_SOUTH", 0, 10.5), Event("BTN_SOUTH", 1, 10.51)]
+     controller.update()
+     assert controller.A.released() # the last press bounced
+     assert controller.A.get_press_time() == 10.0
+     assert controller.A.get_hold_duration() == 0.5
+
+def test_axis_filters_use_event_timestamps():
+     controller, gamepad = make_controller()
+     controller.left_trigger.set_filter_y(SlewRateLimiter(max_rate=100))
+     gamepad.events = [Event("ABS_Z", 0, 5.0), Event("ABS_Z", 1000, 6.0), Event("ABS_Z", 1000, 7.0)]
+     controller.update()
+     assert controller.left_trigger.get_y() == 1000
+     assert controller.left_trigger.get_filtered_y() == 200
+
+def test_history_records_event_timestamps():
+     controller, gamepad = make_controller()
+     histories = controller.enable_history(capacity=16)
+     gamepad.events = [Event("ABS_Z", 100, 5.0), Event("ABS_Z", 900, 5.1), Event("ABS_Z", 300, 5.2), Event("BTN_SOUTH", 1, 5.2)]
+     controller.update()
+     assert histories["left_trigger"].max(duration=0.15) == 900
+     assert histories["left_trigger"].mean() == pytest.approx(1300 / 3)
+     assert histories["A"].get_latest() == (1.0, 5.2)
+     assert len(histories["right_trigger"]) == 0
+
+def test_coalesced_axes_keep_event_timestamps():
+     controller, gamepad = make_controller()
+     controller.set_axis_coalescing(True)
+     controller.left_trigger.set_filter_y(SlewRateLimiter(max_rate=100))
+     histories = controller.enable_history(capacity=16)
+     gamepad.events = [Event("ABS_Z", 0, 5.0), Event("BTN_SOUTH", 1, 5.0)]
+     controller.update()
+     gamepad.events = [Event("ABS_Z", 500, 5.5), Event("ABS_Z", 1000, 6.0)]
+     controller.update()
+     assert controller.left_trigger.get_filtered_y() == 100  # one second after the first batch, not a restart
+     assert histories["left_trigger"].get_latest() == (1000, 6.0)
+     assert histories["left_trigger"].count(duration=1.0) == 2
+
+def test_controls_come_from_the_xbox_profile():
+     controller = XboxControllerGen4(FakeGamepad())
+     assert isinstance(controller, ProfiledController)
+     assert controller.get_control("left_bumper") is controller.left_bumper
+     assert list(controller.get_buttons()) == [field for field, kind in XboxControllerGen4Snapshot.__annotations__.items() if kind is bool]
+     buttons = dict(xbox_gen4_profile["buttons"], left_bumper={"code": "BTN_TL", "debounce_time": 0})
+     register_profile("xbox_gen4", dict(xbox_gen4_profile, buttons=buttons))
+     try:
+          undebounced = XboxControllerGen4(FakeGamepad())
+     finally:
+          register_profile("xbox_gen4", xbox_gen4_profile)
+     undebounced.get_gamepad().events = [Event("BTN_TL", 1, None), Event("BTN_TR", 1, None)]
+     undebounced.update()
+     assert undebounced.left_bumper.pressed()
+     assert not undebounced.right_bumper.pressed()  # still debounced by the profile right after creation